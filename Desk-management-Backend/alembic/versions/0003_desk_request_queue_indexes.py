@@ -0,0 +1,42 @@
+"""desk request queue indexes
+
+Revision ID: 0003_desk_request_queue_indexes
+Revises: 0002_add_missing_columns
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_desk_request_queue_indexes'
+down_revision = '0002_add_missing_columns'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_desk_requests_status_created_at', ['status', 'created_at']),
+    ('ix_desk_requests_employee_created_at', ['employee_id', 'created_at']),
+]
+
+
+def _existing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    return {ix['name'] for ix in inspector.get_indexes('desk_requests')}
+
+
+def upgrade():
+    # Fresh databases already get these from create_all() in 0001_initial
+    existing = _existing_indexes()
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'desk_requests', columns)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for name, _ in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='desk_requests')
@@ -0,0 +1,40 @@
+"""desk status history timeline index
+
+Revision ID: 0004_desk_history_index
+Revises: 0003_desk_request_queue_indexes
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_desk_history_index'
+down_revision = '0003_desk_request_queue_indexes'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_desk_status_history_desk_changed_at'
+
+
+def _has_index():
+    inspector = sa.inspect(op.get_bind())
+    return any(
+        ix['name'] == INDEX_NAME
+        for ix in inspector.get_indexes('desk_status_history')
+    )
+
+
+def upgrade():
+    # Fresh databases already get this from create_all() in 0001_initial
+    if not _has_index():
+        op.create_index(
+            INDEX_NAME, 'desk_status_history', ['desk_id', 'changed_at']
+        )
+
+
+def downgrade():
+    if _has_index():
+        op.drop_index(INDEX_NAME, table_name='desk_status_history')
@@ -0,0 +1,67 @@
+"""employee department foreign key
+
+Revision ID: 0005_employee_department_fk
+Revises: 0004_desk_history_index
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_employee_department_fk'
+down_revision = '0004_desk_history_index'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 1000
+INDEX_NAME = 'ix_employees_department_id'
+FK_NAME = 'fk_employees_department_id_departments'
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # Fresh databases already get the column from create_all() in 0001_initial
+    columns = {c['name'] for c in inspector.get_columns('employees')}
+    if 'department_id' not in columns:
+        with op.batch_alter_table('employees') as batch_op:
+            batch_op.add_column(sa.Column('department_id', sa.String(36), nullable=True))
+            batch_op.create_foreign_key(FK_NAME, 'departments', ['department_id'], ['id'])
+            batch_op.create_index(INDEX_NAME, ['department_id'])
+
+    # Backfill from the free-text department name, one department at a time
+    # and in bounded id batches so large tables are not locked in one go.
+    departments = bind.execute(sa.text('SELECT id, name FROM departments')).fetchall()
+    for dept_id, dept_name in departments:
+        while True:
+            ids = [
+                row[0]
+                for row in bind.execute(
+                    sa.text(
+                        'SELECT id FROM employees '
+                        'WHERE department = :name AND department_id IS NULL '
+                        'LIMIT :limit'
+                    ),
+                    {'name': dept_name, 'limit': BATCH_SIZE},
+                )
+            ]
+            if not ids:
+                break
+            bind.execute(
+                sa.text(
+                    'UPDATE employees SET department_id = :dept_id '
+                    'WHERE id IN :ids'
+                ).bindparams(sa.bindparam('ids', expanding=True)),
+                {'dept_id': dept_id, 'ids': ids},
+            )
+
+
+def downgrade():
+    with op.batch_alter_table('employees') as batch_op:
+        batch_op.drop_index(INDEX_NAME)
+        batch_op.drop_constraint(FK_NAME, type_='foreignkey')
+        batch_op.drop_column('department_id')
@@ -0,0 +1,64 @@
+"""numeric desk number key
+
+Revision ID: 0006_desk_number_key
+Revises: 0005_employee_department_fk
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_desk_number_key'
+down_revision = '0005_employee_department_fk'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 1000
+INDEX_NAME = 'ix_desks_desk_key'
+
+
+def upgrade():
+    from app.utils.desk_utils import desk_number_fields
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # Fresh databases already get the columns from create_all() in 0001_initial
+    columns = {c['name'] for c in inspector.get_columns('desks')}
+    if 'desk_key' not in columns:
+        with op.batch_alter_table('desks') as batch_op:
+            batch_op.add_column(sa.Column('desk_key', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('desk_index', sa.Integer(), nullable=True))
+            batch_op.create_index(INDEX_NAME, ['desk_key'])
+
+    # Backfill in id order, one batch of desks per UPDATE round-trip
+    update = sa.text(
+        'UPDATE desks SET desk_key = :desk_key, desk_index = :desk_index '
+        'WHERE id = :id'
+    )
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.text(
+                'SELECT id, desk_number FROM desks '
+                'WHERE id > :last_id ORDER BY id LIMIT :limit'
+            ),
+            {'last_id': last_id, 'limit': BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            update,
+            [{'id': desk_id, **desk_number_fields(number)} for desk_id, number in rows],
+        )
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    with op.batch_alter_table('desks') as batch_op:
+        batch_op.drop_index(INDEX_NAME)
+        batch_op.drop_column('desk_index')
+        batch_op.drop_column('desk_key')
@@ -0,0 +1,34 @@
+"""archive tables for closed assignments and old status history
+
+Revision ID: 0007_archive_tables
+Revises: 0006_desk_number_key
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_archive_tables'
+down_revision = '0006_desk_number_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.models.desk_assignments_archive import DeskAssignmentArchive
+    from app.models.desk_status_history_archive import DeskStatusHistoryArchive
+
+    # checkfirst: fresh databases already have them from 0001_initial
+    bind = op.get_bind()
+    DeskAssignmentArchive.__table__.create(bind=bind, checkfirst=True)
+    DeskStatusHistoryArchive.__table__.create(bind=bind, checkfirst=True)
+
+
+def downgrade():
+    from app.models.desk_assignments_archive import DeskAssignmentArchive
+    from app.models.desk_status_history_archive import DeskStatusHistoryArchive
+
+    bind = op.get_bind()
+    DeskStatusHistoryArchive.__table__.drop(bind=bind, checkfirst=True)
+    DeskAssignmentArchive.__table__.drop(bind=bind, checkfirst=True)
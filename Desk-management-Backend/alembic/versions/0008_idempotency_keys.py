@@ -0,0 +1,28 @@
+"""idempotency keys table
+
+Revision ID: 0008_idempotency_keys
+Revises: 0007_archive_tables
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_idempotency_keys'
+down_revision = '0007_archive_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.models.idempotency_keys import IdempotencyKey
+
+    # checkfirst: fresh databases already have it from 0001_initial
+    IdempotencyKey.__table__.create(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade():
+    from app.models.idempotency_keys import IdempotencyKey
+
+    IdempotencyKey.__table__.drop(bind=op.get_bind(), checkfirst=True)
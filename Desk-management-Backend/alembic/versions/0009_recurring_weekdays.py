@@ -0,0 +1,43 @@
+"""weekday mask for recurring bookings, conflict-check index
+
+Revision ID: 0009_recurring_weekdays
+Revises: 0008_idempotency_keys
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_recurring_weekdays'
+down_revision = '0008_idempotency_keys'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('desk_assignments', 'desk_assignments_archive')
+INDEX_NAME = 'ix_desk_assignments_desk_shift_start'
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Fresh databases already get the column and index from create_all() in 0001_initial.
+    # Existing rows stay NULL, i.e. every day of their range.
+    for table in TABLES:
+        columns = {c['name'] for c in inspector.get_columns(table)}
+        if 'weekdays' not in columns:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(sa.Column('weekdays', sa.SmallInteger(), nullable=True))
+
+    indexes = {i['name'] for i in inspector.get_indexes('desk_assignments')}
+    if INDEX_NAME not in indexes:
+        op.create_index(INDEX_NAME, 'desk_assignments', ['desk_id', 'shift', 'start_date'])
+
+
+def downgrade():
+    op.drop_index(INDEX_NAME, table_name='desk_assignments')
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('weekdays')
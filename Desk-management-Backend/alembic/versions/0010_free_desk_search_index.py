@@ -0,0 +1,32 @@
+"""index for the free-desk search
+
+Revision ID: 0010_free_desk_search_index
+Revises: 0009_recurring_weekdays
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_free_desk_search_index'
+down_revision = '0009_recurring_weekdays'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_desk_assignments_shift_end'
+
+
+def upgrade():
+    # Fresh databases already get the index from create_all() in 0001_initial
+    indexes = {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('desk_assignments')}
+    if INDEX_NAME not in indexes:
+        op.create_index(
+            INDEX_NAME, 'desk_assignments', ['shift', 'end_date', 'start_date', 'desk_id']
+        )
+
+
+def downgrade():
+    op.drop_index(INDEX_NAME, table_name='desk_assignments')
@@ -0,0 +1,37 @@
+"""scheduler leases table, expired-booking index
+
+Revision ID: 0011_scheduler_leases
+Revises: 0010_free_desk_search_index
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_scheduler_leases'
+down_revision = '0010_free_desk_search_index'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_desk_assignments_released_end'
+
+
+def upgrade():
+    from app.models.scheduler_leases import SchedulerLease
+
+    # Fresh databases already get both from create_all() in 0001_initial
+    SchedulerLease.__table__.create(bind=op.get_bind(), checkfirst=True)
+
+    indexes = {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('desk_assignments')}
+    if INDEX_NAME not in indexes:
+        op.create_index(INDEX_NAME, 'desk_assignments', ['released_date', 'end_date'])
+
+
+def downgrade():
+    from app.models.scheduler_leases import SchedulerLease
+
+    op.drop_index(INDEX_NAME, table_name='desk_assignments')
+    SchedulerLease.__table__.drop(bind=op.get_bind(), checkfirst=True)
@@ -0,0 +1,30 @@
+"""in-progress lock expiry for idempotency keys
+
+Revision ID: 0012_idempotency_lock
+Revises: 0011_scheduler_leases
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_idempotency_lock'
+down_revision = '0011_scheduler_leases'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fresh databases already get the column from create_all() in 0001_initial.
+    # Existing in-progress rows stay NULL, i.e. free to take over.
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('idempotency_keys')}
+    if 'locked_until' not in columns:
+        with op.batch_alter_table('idempotency_keys') as batch_op:
+            batch_op.add_column(sa.Column('locked_until', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('idempotency_keys') as batch_op:
+        batch_op.drop_column('locked_until')
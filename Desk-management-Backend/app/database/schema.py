@@ -0,0 +1,73 @@
+import os
+import re
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+# What the app does with the schema when a worker starts:
+#   create_all - create missing tables from the models (dev default)
+#   check      - only compare the database's Alembic revision with the
+#                newest migration and refuse to start on a mismatch; for
+#                deployments that run `alembic upgrade head` beforehand
+#   off        - nothing
+STARTUP_SCHEMA_MODE = os.getenv("STARTUP_SCHEMA_MODE", "create_all").lower()
+
+VERSIONS_DIR = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+_REVISION = re.compile(r"^(down_revision|revision)\s*=\s*(?:'([^']*)'|\"([^\"]*)\"|None)", re.M)
+
+
+def migration_heads(versions_dir: Path = VERSIONS_DIR) -> set[str]:
+    """
+    Newest revision(s) of the migration scripts: revisions no other
+    script names as its down_revision. Reads the `revision` /
+    `down_revision` lines directly instead of importing Alembic, which
+    would cost more than the rest of the check.
+    """
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        for name, single, double in _REVISION.findall(path.read_text()):
+            value = single or double
+            if not value:
+                continue
+            (revisions if name == "revision" else parents).add(value)
+    return revisions - parents
+
+
+def database_revisions(engine: Engine) -> set[str]:
+    """
+    Revision(s) stamped in alembic_version; empty when the table is missing.
+    """
+    try:
+        with engine.connect() as conn:
+            return {row[0] for row in conn.execute(text("SELECT version_num FROM alembic_version"))}
+    except DBAPIError:
+        return set()
+
+
+def check_schema_version(engine: Engine):
+    """
+    Raise RuntimeError unless the database is at the newest migration.
+    """
+    expected = migration_heads()
+    found = database_revisions(engine)
+    if found != expected:
+        raise RuntimeError(
+            f"Database schema is at {', '.join(sorted(found)) or 'no revision'}, "
+            f"expected {', '.join(sorted(expected))}; run `alembic upgrade head`"
+        )
+
+
+def prepare_schema(engine: Engine, mode: str | None = None):
+    mode = mode or STARTUP_SCHEMA_MODE
+    if mode == "create_all":
+        from app.database.database import Base
+        from app import models  # Ensure all models are registered
+
+        Base.metadata.create_all(bind=engine)
+    elif mode == "check":
+        check_schema_version(engine)
+    elif mode != "off":
+        raise RuntimeError(f"Unknown STARTUP_SCHEMA_MODE {mode!r}; use create_all, check or off")
@@ -0,0 +1,49 @@
+import os
+import uuid
+
+from sqlalchemy import BINARY, String
+from sqlalchemy.types import TypeDecorator
+
+# Physical layout for UUID primary/foreign keys:
+#   "string" (default) -> String(36), the original layout
+#   "binary"           -> BINARY(16), 20 bytes smaller per index entry
+# Switching an existing database requires scripts/convert_ids_to_binary.py.
+UUID_STORAGE = os.getenv("UUID_STORAGE", "string").lower()
+
+
+class UUIDBinary(TypeDecorator):
+    """
+    UUID stored as 16 raw bytes, exposed to Python as the canonical
+    36-char string so routers and JWT payloads are unaffected.
+    """
+
+    impl = BINARY(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        if isinstance(value, bytes):
+            return value
+        try:
+            return uuid.UUID(str(value)).bytes
+        except ValueError:
+            # Not a UUID (e.g. a bad path parameter): pass something that
+            # simply matches no row instead of failing the statement.
+            return str(value).encode()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
+def IdType():
+    """
+    Column type for UUID keys, selected by UUID_STORAGE.
+    """
+    if UUID_STORAGE == "binary":
+        return UUIDBinary()
+    return String(36)
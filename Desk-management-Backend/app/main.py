@@ -2,7 +2,12 @@ from fastapi import FastAPI, Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from urllib.parse import urlparse
 from app.database.database import engine
+from app.database.schema import prepare_schema
 from app.models import User, Employee, Desk, DeskAssignment, DeskStatusHistory
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.idempotency import REPLAY_HEADER
+from app.utils.auto_assign import AUTO_ASSIGN_MODE, auto_assign_worker
+from app.utils.scheduler import SCHEDULER_ENABLED, desk_scheduler
 from app.routers import (
     desks,
     assignments,
@@ -11,6 +16,8 @@ from app.routers import (
     desk_requests,
     settings,
     admin_config,
+    analytics,
+    health,
 )
 
 app = FastAPI()
@@ -23,6 +30,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, REPLAY_HEADER],
 )
 
 class RelativeRedirectMiddleware(BaseHTTPMiddleware):
@@ -43,8 +51,26 @@ app.add_middleware(RelativeRedirectMiddleware)
 
 @app.on_event("startup")
 def on_startup():
-    engine.connect()
-    User.metadata.create_all(bind=engine)
+    # STARTUP_SCHEMA_MODE=check skips create_all's per-table reflection
+    prepare_schema(engine)
+
+@app.on_event("startup")
+async def start_auto_assign_worker():
+    if AUTO_ASSIGN_MODE == "background":
+        auto_assign_worker.start()
+
+@app.on_event("shutdown")
+async def stop_auto_assign_worker():
+    await auto_assign_worker.stop()
+
+@app.on_event("startup")
+async def start_desk_scheduler():
+    if SCHEDULER_ENABLED:
+        desk_scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_desk_scheduler():
+    await desk_scheduler.stop()
 
 @app.get("/")
 def read_root():
@@ -57,4 +83,6 @@ app.include_router(employees.router)
 app.include_router(desk_requests.router)
 app.include_router(settings.router)
 app.include_router(admin_config.router)
+app.include_router(analytics.router)
+app.include_router(health.router)
 
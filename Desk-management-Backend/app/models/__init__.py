@@ -7,3 +7,7 @@ from app.models.floors import Floor
 from app.models.departments import Department
 from app.models.desk_requests import DeskRequest
 from app.models.system_settings import SystemSettings
+from app.models.desk_assignments_archive import DeskAssignmentArchive
+from app.models.desk_status_history_archive import DeskStatusHistoryArchive
+from app.models.idempotency_keys import IdempotencyKey
+from app.models.scheduler_leases import SchedulerLease
@@ -2,13 +2,14 @@ from sqlalchemy import Column, String, DateTime, ForeignKey
 from datetime import datetime
 
 from app.database.database import Base
+from app.database.types import IdType
 
 
 class Department(Base):
     __tablename__ = "departments"
 
-    id = Column(String(36), primary_key=True, index=True)
+    id = Column(IdType(), primary_key=True, index=True)
     name = Column(String(255), nullable=False, unique=True)
-    floor_id = Column(String(36), ForeignKey("floors.id"), nullable=False)
+    floor_id = Column(IdType(), ForeignKey("floors.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -1,37 +1,48 @@
 from sqlalchemy import (
     Column,
-    String,
     Date,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
+    SmallInteger,
     Text,
     Boolean,
 )
 from datetime import datetime
 
 from app.database.database import Base
+from app.database.types import IdType
 
 
 class DeskAssignment(Base):
     __tablename__ = "desk_assignments"
+    __table_args__ = (
+        # Conflict checks: one desk and shift, bookings around a date range
+        Index("ix_desk_assignments_desk_shift_start", "desk_id", "shift", "start_date"),
+        # Free-desk search: desks booked on a shift around a date range.
+        # Leading on end_date skips the past, which is most of the table.
+        Index("ix_desk_assignments_shift_end", "shift", "end_date", "start_date", "desk_id"),
+        # Scheduler: open bookings whose end_date has passed
+        Index("ix_desk_assignments_released_end", "released_date", "end_date"),
+    )
 
-    id = Column(String(36), primary_key=True, index=True)
+    id = Column(IdType(), primary_key=True, index=True)
 
     desk_id = Column(
-        String(36),
+        IdType(),
         ForeignKey("desks.id"),
         nullable=False
     )
 
     employee_id = Column(
-        String(36),
+        IdType(),
         ForeignKey("employees.id"),
         nullable=False
     )
 
     assigned_by = Column(
-        String(36),
+        IdType(),
         ForeignKey("users.id"),
         nullable=False
     )
@@ -55,6 +66,10 @@ class DeskAssignment(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
 
+    # Recurring bookings: bitmask of the weekdays booked inside the date
+    # range (bit 0 = Monday, see app.utils.recurrence). NULL = every day.
+    weekdays = Column(SmallInteger, nullable=True)
+
     # Flag to indicate if this assignment was created by auto‑assignment
     is_auto_assigned = Column(Boolean, default=False, nullable=False)
 
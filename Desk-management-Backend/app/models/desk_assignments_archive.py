@@ -0,0 +1,52 @@
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    Index,
+    SmallInteger,
+    Text,
+    Boolean,
+)
+from datetime import datetime
+
+from app.database.database import Base
+from app.database.types import IdType
+
+
+class DeskAssignmentArchive(Base):
+    """
+    Cold copy of released / expired desk_assignments rows.
+    Same columns as DeskAssignment, without foreign keys so archived
+    rows never block changes to desks or employees.
+    """
+    __tablename__ = "desk_assignments_archive"
+    __table_args__ = (
+        Index("ix_desk_assignments_archive_desk_start", "desk_id", "start_date"),
+        Index("ix_desk_assignments_archive_employee", "employee_id"),
+    )
+
+    id = Column(IdType(), primary_key=True)
+    desk_id = Column(IdType(), nullable=False)
+    employee_id = Column(IdType(), nullable=False)
+    assigned_by = Column(IdType(), nullable=False)
+
+    assigned_date = Column(Date, nullable=False)
+    released_date = Column(Date, nullable=True)
+
+    assignment_type = Column(
+        Enum("PERMANENT", "TEMPORARY", name="archive_assignment_type_enum"),
+        nullable=False
+    )
+    shift = Column(
+        Enum("MORNING", "NIGHT", name="archive_assignment_shift_enum"),
+        nullable=False,
+    )
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    weekdays = Column(SmallInteger, nullable=True)
+    is_auto_assigned = Column(Boolean, default=False, nullable=False)
+    notes = Column(Text, nullable=True)
+    created_at = Column(DateTime)
+
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
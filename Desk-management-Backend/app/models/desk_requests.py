@@ -1,30 +1,37 @@
 from sqlalchemy import (
     Column,
-    String,
     Date,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Text,
 )
 from datetime import datetime
 
 from app.database.database import Base
+from app.database.types import IdType
 
 
 class DeskRequest(Base):
     __tablename__ = "desk_requests"
+    __table_args__ = (
+        # Admin queue: filter by status, newest first
+        Index("ix_desk_requests_status_created_at", "status", "created_at"),
+        # Employee view: own requests, newest first
+        Index("ix_desk_requests_employee_created_at", "employee_id", "created_at"),
+    )
 
-    id = Column(String(36), primary_key=True, index=True)
+    id = Column(IdType(), primary_key=True, index=True)
 
     employee_id = Column(
-        String(36),
+        IdType(),
         ForeignKey("employees.id"),
         nullable=False,
     )
 
     department_id = Column(
-        String(36),
+        IdType(),
         ForeignKey("departments.id"),
         nullable=False,
     )
@@ -51,10 +58,9 @@ class DeskRequest(Base):
     )
 
     assigned_desk_id = Column(
-        String(36),
+        IdType(),
         ForeignKey("desks.id"),
         nullable=True,
     )
 
     created_at = Column(DateTime, default=datetime.utcnow)
-
@@ -5,20 +5,26 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Text
 )
 from datetime import datetime
 
 from app.database.database import Base
+from app.database.types import IdType
 
 
 class DeskStatusHistory(Base):
     __tablename__ = "desk_status_history"
+    __table_args__ = (
+        # Per-desk history timeline, newest first
+        Index("ix_desk_status_history_desk_changed_at", "desk_id", "changed_at"),
+    )
 
-    id = Column(String(36), primary_key=True, index=True)
+    id = Column(IdType(), primary_key=True, index=True)
 
     desk_id = Column(
-        String(36),
+        IdType(),
         ForeignKey("desks.id"),
         nullable=False
     )
@@ -46,7 +52,7 @@ class DeskStatusHistory(Base):
     )
 
     changed_by = Column(
-        String(36),
+        IdType(),
         ForeignKey("users.id"),
         nullable=False
     )
@@ -0,0 +1,46 @@
+from sqlalchemy import (
+    Column,
+    String,
+    Date,
+    DateTime,
+    Enum,
+    Index,
+    Text
+)
+from datetime import datetime
+
+from app.database.database import Base
+from app.database.types import IdType
+
+DESK_STATUSES = ("AVAILABLE", "ASSIGNED", "MAINTENANCE", "INACTIVE")
+
+
+class DeskStatusHistoryArchive(Base):
+    """
+    Cold copy of desk_status_history rows older than the retention window.
+    Same columns as DeskStatusHistory, without foreign keys.
+    """
+    __tablename__ = "desk_status_history_archive"
+    __table_args__ = (
+        Index("ix_desk_status_history_archive_desk_changed_at", "desk_id", "changed_at"),
+    )
+
+    id = Column(IdType(), primary_key=True)
+    desk_id = Column(IdType(), nullable=False)
+
+    old_status = Column(
+        Enum(*DESK_STATUSES, name="archive_desk_status_history_old_enum"),
+        nullable=False
+    )
+    new_status = Column(
+        Enum(*DESK_STATUSES, name="archive_desk_status_history_new_enum"),
+        nullable=False
+    )
+
+    changed_by = Column(IdType(), nullable=False)
+    reason = Column(String(255), nullable=False)
+    notes = Column(Text, nullable=True)
+    expected_resolution_date = Column(Date, nullable=True)
+    changed_at = Column(DateTime)
+
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
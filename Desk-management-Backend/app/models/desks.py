@@ -1,23 +1,29 @@
 from sqlalchemy import Column, String, DateTime, Enum, Integer, ForeignKey
+from sqlalchemy.orm import validates
 from datetime import datetime
 
 from app.database.database import Base
+from app.database.types import IdType
 
 
 class Desk(Base):
     __tablename__ = "desks"
 
-    id = Column(String(36), primary_key=True, index=True)
+    id = Column(IdType(), primary_key=True, index=True)
     desk_number = Column(String(50), unique=True, nullable=False)
+    # Integer form of desk_number and its index within the floor,
+    # precomputed so by-number lookups can use an integer index.
+    desk_key = Column(Integer, nullable=True, index=True)
+    desk_index = Column(Integer, nullable=True)
     floor = Column(Integer, nullable=False)
     location = Column(String(255), nullable=True)
     floor_id = Column(
-        String(36),
+        IdType(),
         ForeignKey("floors.id"),
         nullable=True
     )
     department_id = Column(
-        String(36),
+        IdType(),
         ForeignKey("departments.id"),
         nullable=True
     )
@@ -39,6 +45,16 @@ class Desk(Base):
         onupdate=datetime.utcnow
     )
 
+    @validates("desk_number")
+    def _sync_desk_key(self, key, value):
+        """Keep desk_key/desk_index in step with desk_number"""
+        from app.utils.desk_utils import desk_number_fields
+
+        fields = desk_number_fields(value)
+        self.desk_key = fields["desk_key"]
+        self.desk_index = fields["desk_index"]
+        return str(value)
+
     @property
     def display_location(self):
         """Always return location in 'Floor X' format"""
@@ -2,16 +2,25 @@ from sqlalchemy import Column, String, DateTime, ForeignKey, Enum
 from datetime import datetime
 
 from app.database.database import Base
+from app.database.types import IdType
 
 
 class Employee(Base):
     __tablename__ = "employees"
 
-    id = Column(String(36), primary_key=True, index=True)
+    id = Column(IdType(), primary_key=True, index=True)
     employee_code = Column(String(50), unique=True, nullable=False)
     name = Column(String(255), nullable=False)
     department = Column(String(100), nullable=False)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
+    # Normalized link to the departments table; `department` keeps the
+    # display name for older clients.
+    department_id = Column(
+        IdType(),
+        ForeignKey("departments.id"),
+        nullable=True,
+        index=True
+    )
+    user_id = Column(IdType(), ForeignKey("users.id"), nullable=False)
     shift = Column(
         Enum("MORNING", "NIGHT", name="employee_shift_enum"),
         nullable=True
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text
+from datetime import datetime
+
+from app.database.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    # sha256 of scope + user + client-supplied Idempotency-Key
+    key_hash = Column(String(64), primary_key=True)
+    # sha256 of the request body, to reject a key reused for another payload
+    request_hash = Column(String(64), nullable=False)
+    # NULL while the original request is still running
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    # While status_code is NULL: until when the running request holds the
+    # key; a retry after this takes it over (the first worker died)
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+
+from app.database.database import Base
+
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    # One row per lease (scheduled jobs, startup recovery); whoever holds
+    # an unexpired lease does the work
+    name = Column(String(64), primary_key=True)
+    owner = Column(String(128), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
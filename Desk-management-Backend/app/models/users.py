@@ -2,12 +2,13 @@ from sqlalchemy import Column, String, Boolean, DateTime, Enum
 from datetime import datetime
 
 from app.database.database import Base
+from app.database.types import IdType
 
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(String(36), primary_key=True, index=True)
+    id = Column(IdType(), primary_key=True, index=True)
     email = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     full_name = Column(String(255), nullable=False)
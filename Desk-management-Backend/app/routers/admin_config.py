@@ -9,6 +9,7 @@ from app.models.floors import Floor
 from app.models.departments import Department
 from app.models.desks import Desk
 from app.utils.auth import require_role
+from app.utils.desk_utils import get_desk_by_number
 
 
 router = APIRouter(prefix="/admin-config", tags=["Admin Config"])
@@ -210,11 +211,8 @@ def create_desk(
                 detail="Department not found",
             )
 
-    existing = (
-        db.query(Desk)
-        .filter(Desk.desk_number == payload.desk_number)
-        .first()
-    )
+    # By desk_key, so "0101" is refused when "101" exists: both are desk 101
+    existing = get_desk_by_number(db, payload.desk_number)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
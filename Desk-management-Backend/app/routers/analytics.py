@@ -0,0 +1,108 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.utils.analytics import (
+    ANALYTICS_MAX_DAYS,
+    BUCKETS,
+    CAPACITY_MAX_DAYS,
+    DIMENSIONS,
+    cached_capacity_plan,
+    cached_desk_utilization,
+    report_cache,
+)
+from app.utils.auth import require_role
+
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# -------------------------------------------------
+# GET /analytics/utilization -> Booked vs available desk-shift-days
+# -------------------------------------------------
+@router.get("/utilization")
+def get_utilization(
+    from_date: date = Query(..., description="First day (YYYY-MM-DD)"),
+    to_date: date = Query(..., description="Last day, inclusive"),
+    group_by: list[str] = Query([], description="floor, department, shift and/or weekday"),
+    refresh: bool = Query(False, description="Recompute instead of using the cache"),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_role("ADMIN")),
+):
+    """
+    Desk utilization over a period, overall and per combination of the
+    group_by dimensions. Reports are cached per parameters for a few
+    minutes; `cached` says whether this one came from the cache.
+    """
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="to_date must be on or after from_date")
+    if (to_date - from_date).days + 1 > ANALYTICS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Period is limited to {ANALYTICS_MAX_DAYS} days")
+    unknown = set(group_by) - set(DIMENSIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown group_by {', '.join(sorted(unknown))}; use {', '.join(DIMENSIONS)}",
+        )
+
+    report, cached = cached_desk_utilization(db, from_date, to_date, tuple(group_by), refresh=refresh)
+    return {**report, "cached": cached}
+
+
+# -------------------------------------------------
+# GET /analytics/capacity -> Peak concurrent demand vs desks
+# -------------------------------------------------
+@router.get("/capacity")
+def get_capacity_plan(
+    from_date: date = Query(..., description="First day (YYYY-MM-DD)"),
+    to_date: date = Query(..., description="Last day, inclusive"),
+    request_status: list[str] = Query(["PENDING"], description="Desk requests counted as demand: PENDING and/or REJECTED"),
+    bucket: str = Query("month", description="Peaks per week or month"),
+    refresh: bool = Query(False, description="Recompute instead of using the cache"),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_role("ADMIN")),
+):
+    """
+    Peak number of overlapping assignments and open desk requests per
+    department and shift (and per floor), against the desks on the floor.
+    Approved requests are counted through their assignment.
+    """
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="to_date must be on or after from_date")
+    if (to_date - from_date).days + 1 > CAPACITY_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Period is limited to {CAPACITY_MAX_DAYS} days")
+    statuses = {s.upper() for s in request_status}
+    if not statuses <= {"PENDING", "REJECTED"}:
+        raise HTTPException(status_code=400, detail="request_status must be PENDING or REJECTED")
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail="bucket must be week or month")
+
+    report, cached = cached_capacity_plan(db, from_date, to_date, tuple(statuses), bucket, refresh=refresh)
+    return {**report, "cached": cached}
+
+
+# -------------------------------------------------
+# GET / DELETE /analytics/cache
+# -------------------------------------------------
+@router.get("/cache")
+def get_cache_stats(current_user=Depends(require_role("ADMIN"))):
+    """
+    Size and hit/miss counters of the analytics report cache.
+    """
+    return report_cache.stats()
+
+
+@router.delete("/cache")
+def clear_cache(current_user=Depends(require_role("ADMIN"))):
+    report_cache.clear()
+    return report_cache.stats()
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import false, func
 from sqlalchemy.orm import Session
 
 from app.database.database import SessionLocal
+from app.models.departments import Department
 from app.models.desk_assignments import DeskAssignment
+from app.models.desk_assignments_archive import DeskAssignmentArchive
 from app.models.desks import Desk
 from app.models.employees import Employee
 from app.models.users import User
+from app.utils.archival import assignment_cutoff
+from app.utils.auth import require_role
+from app.utils.desk_utils import get_desk_by_number
+from app.utils.integrity import CHECKS, MAX_REPORTED_CONFLICTS, find_double_bookings
+from app.utils.recurrence import weekday_names
 
 router = APIRouter(
     prefix="/assignments",
@@ -21,6 +31,15 @@ def get_db():
         db.close()
 
 
+def _reaches_archive(from_date: str | None) -> bool:
+    if not from_date:
+        return False
+    try:
+        return date.fromisoformat(from_date) < assignment_cutoff()
+    except ValueError:
+        return False
+
+
 @router.get("/")
 def get_assignments(
     employee_code: str | None = Query(None, description="Filter by employee code"),
@@ -28,51 +47,73 @@ def get_assignments(
     assigned_by: str | None = Query(None, description="Filter by admin name"),
     from_date: str | None = Query(None, description="Start date YYYY-MM-DD"),
     to_date: str | None = Query(None, description="End date YYYY-MM-DD"),
+    department_id: str | None = Query(None, description="Filter by department"),
+    include_archived: bool = Query(False, description="Also search archived assignments"),
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
-    query = (
-        db.query(
-            DeskAssignment.id,
-            Desk.id.label("desk_id"),
-            Desk.desk_number,
-            Desk.floor,
-            Employee.id.label("employee_id"),
-            Employee.employee_code,
-            Employee.name.label("employee_name"),
-            Employee.department,
-            User.full_name.label("assigned_by"),
-            DeskAssignment.assigned_date,
-            DeskAssignment.start_date,
-            DeskAssignment.end_date,
-            DeskAssignment.shift,
-            DeskAssignment.is_auto_assigned,
-            DeskAssignment.assignment_type,
-            DeskAssignment.released_date,
-            Desk.current_status,
+    # Resolve the desk once through the desk_key index, then filter both
+    # tables on the indexed desk_id
+    desk = get_desk_by_number(db, desk_number) if desk_number else None
+
+    def build_query(model):
+        query = (
+            db.query(
+                model.id,
+                Desk.id.label("desk_id"),
+                Desk.desk_number,
+                Desk.floor,
+                Employee.id.label("employee_id"),
+                Employee.employee_code,
+                Employee.name.label("employee_name"),
+                Employee.department_id,
+                func.coalesce(Department.name, Employee.department).label("department"),
+                User.full_name.label("assigned_by"),
+                model.assigned_date,
+                model.start_date,
+                model.end_date,
+                model.shift,
+                model.weekdays,
+                model.is_auto_assigned,
+                model.assignment_type,
+                model.released_date,
+                Desk.current_status,
+            )
+            .join(Desk, model.desk_id == Desk.id)
+            .join(Employee, model.employee_id == Employee.id)
+            .join(User, model.assigned_by == User.id)
+            .outerjoin(Department, Employee.department_id == Department.id)
         )
-        .join(Desk, DeskAssignment.desk_id == Desk.id)
-        .join(Employee, DeskAssignment.employee_id == Employee.id)
-        .join(User, DeskAssignment.assigned_by == User.id)
-    )
 
-    # ---------------- FILTERS ----------------
+        # ---------------- FILTERS ----------------
+
+        if employee_code:
+            query = query.filter(Employee.employee_code == employee_code)
 
-    if employee_code:
-        query = query.filter(Employee.employee_code == employee_code)
+        if desk_number:
+            query = query.filter(model.desk_id == desk.id if desk else false())
 
-    if desk_number:
-        query = query.filter(Desk.desk_number == desk_number)
+        if department_id:
+            query = query.filter(Employee.department_id == department_id)
 
-    if assigned_by:
-        query = query.filter(User.full_name.ilike(f"%{assigned_by}%"))
+        if assigned_by:
+            query = query.filter(User.full_name.ilike(f"%{assigned_by}%"))
 
-    if from_date:
-        query = query.filter(DeskAssignment.assigned_date >= from_date)
+        if from_date:
+            query = query.filter(model.assigned_date >= from_date)
 
-    if to_date:
-        query = query.filter(DeskAssignment.assigned_date <= to_date)
+        if to_date:
+            query = query.filter(model.assigned_date <= to_date)
+
+        return query
+
+    query = build_query(DeskAssignment)
+
+    # Closed assignments older than the retention window live in the
+    # archive table; read it too when the caller asks for old dates.
+    if include_archived or _reaches_archive(from_date):
+        query = query.union_all(build_query(DeskAssignmentArchive))
 
     # ---------------- PAGINATION ----------------
 
@@ -103,11 +144,13 @@ def get_assignments(
             "employee_code": row.employee_code,
             "employee_name": row.employee_name,
             "department": row.department,
+            "department_id": row.department_id,
             "assigned_by": assigned_by_display,
             "assigned_date": str(row.assigned_date) if row.assigned_date else None,
             "start_date": str(row.start_date) if row.start_date else None,
             "end_date": str(row.end_date) if row.end_date else None,
             "shift": row.shift,
+            "weekdays": weekday_names(row.weekdays),
             "is_auto_assigned": bool(row.is_auto_assigned) if row.is_auto_assigned is not None else None,
             "assignment_type": row.assignment_type,
             "released_date": str(row.released_date) if row.released_date else None,
@@ -121,3 +164,26 @@ def get_assignments(
         "data": data
     }
 
+
+# ---------------- INTEGRITY ----------------
+
+@router.get("/integrity")
+def check_integrity(
+    kind: str = Query("all", description="desk, employee or all"),
+    limit: int = Query(100, ge=0, le=MAX_REPORTED_CONFLICTS, description="Conflicts to list"),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_role("ADMIN")),
+):
+    """
+    Find active assignments that overlap another active assignment of the
+    same desk or employee on the same shift. Read-only; use
+    scripts/repair_data.py to release the stale bookings.
+    """
+    if kind == "all":
+        kinds = tuple(CHECKS)
+    elif kind in CHECKS:
+        kinds = (kind,)
+    else:
+        raise HTTPException(status_code=400, detail="kind must be desk, employee or all")
+
+    return find_double_bookings(db, kinds=kinds, max_reported=limit)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 import uuid
@@ -11,6 +11,8 @@ from app.utils.jwt import (
     decode_password_reset_token,
 )
 from app.models.employees import Employee
+from app.models.departments import Department
+from app.utils.rate_limit import check_auth_rate_limit, rate_limit_stats
 from datetime import datetime
 
 # -------------------------------------------------
@@ -34,15 +36,15 @@ def get_db():
 # -------------------------------------------------
 # Password hashing setup
 # -------------------------------------------------
-from app.utils.auth import pwd_context
+from app.utils.auth import get_pwd_context, require_role
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 # -------------------------------------------------
@@ -70,7 +72,13 @@ class ResetPasswordRequest(BaseModel):
 
 
 @router.post("/register")
-def register(request: RegisterRequest, db: Session = Depends(get_db)):
+def register(
+    request: RegisterRequest,
+    http_request: Request,
+    db: Session = Depends(get_db)
+):
+    check_auth_rate_limit(http_request, "register", request.email)
+
     existing_user = db.query(User).filter(User.email == request.email).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
@@ -92,11 +100,17 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     if request.role == "EMPLOYEE":
         # generate a simple employee code (EMP-<last 4 of uuid>) and default dept
         emp_code = f"EMP-{str(uuid.uuid4())[:8]}"
+        default_dept = (
+            db.query(Department)
+            .filter(Department.name == "General")
+            .first()
+        )
         emp = Employee(
             id=str(uuid.uuid4()),
             employee_code=emp_code,
             name=request.full_name,
             department="General",
+            department_id=default_dept.id if default_dept else None,
             user_id=new_user.id,
         )
         db.add(emp)
@@ -111,8 +125,12 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
 @router.post("/login")
 def login(
     request: LoginRequest,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
+    # 0️⃣ Shed abusive callers before any DB lookup or bcrypt work
+    check_auth_rate_limit(http_request, "login", request.email)
+
     # 1️⃣ Fetch user by email
     user = (
         db.query(User)
@@ -154,13 +172,19 @@ def login(
 # POST /auth/forgot-password
 # -------------------------------------------------
 @router.post("/forgot-password")
-def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db)):
+def forgot_password(
+    request: ForgotPasswordRequest,
+    http_request: Request,
+    db: Session = Depends(get_db)
+):
     """
     Generate a short‑lived JWT reset token for the given user.
 
     No email is sent – the token is returned in the response
     so the frontend can use it directly in the reset flow.
     """
+    check_auth_rate_limit(http_request, "forgot-password", request.email)
+
     user = db.query(User).filter(User.email == request.email).first()
     if not user:
         # Explicit 404 so caller can handle "user not found"
@@ -239,3 +263,13 @@ def logout():
         "message": "Logged out successfully"
     }
 
+
+# -------------------------------------------------
+# GET /auth/rate-limits
+# -------------------------------------------------
+@router.get("/rate-limits")
+def get_rate_limits(current_user=Depends(require_role("ADMIN"))):
+    """
+    Counters for the /auth token-bucket limiters.
+    """
+    return rate_limit_stats()
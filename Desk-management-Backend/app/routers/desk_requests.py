@@ -1,23 +1,40 @@
-from datetime import date
-import uuid
+from datetime import date, datetime, time, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.database.database import SessionLocal
 from app.models.desk_requests import DeskRequest
-from app.models.desk_assignments import DeskAssignment
 from app.models.desks import Desk
 from app.models.employees import Employee
 from app.models.departments import Department
-from app.models.system_settings import SystemSettings
 from app.utils.auth import require_role
+from app.utils.auto_assign import (
+    AUTO_ASSIGN_MODE,
+    auto_assign_worker,
+    auto_assignment_enabled,
+    candidate_desks,
+    create_auto_assignment,
+)
 from app.utils.desk_utils import find_available_desk_for_range
+from app.utils.ids import new_id
+from app.utils.idempotency import run_idempotent
+from app.utils.waitlist import waitlist
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_datetime_cursor,
+    encode_cursor,
+    keyset_after,
+    paginate_keyset,
+)
 
 
 router = APIRouter(prefix="/desk-requests", tags=["Desk Requests"])
 
+# Page size when a cursor is passed without a limit
+DEFAULT_PAGE_SIZE = 100
+
 
 def get_db():
     db = SessionLocal()
@@ -34,14 +51,70 @@ class DeskRequestCreate(BaseModel):
     note: str | None = None
 
 
+def _apply_request_page(query, cursor, created_from, created_to):
+    """
+    Shared created_at range + keyset filters for the request listings.
+    Rows are ordered newest first with id as a tie-breaker, matching
+    the (…, created_at) composite indexes on desk_requests.
+    """
+    if created_from:
+        query = query.filter(
+            DeskRequest.created_at >= datetime.combine(created_from, time.min)
+        )
+
+    if created_to:
+        query = query.filter(
+            DeskRequest.created_at
+            < datetime.combine(created_to + timedelta(days=1), time.min)
+        )
+
+    if cursor:
+        last_created_at, last_id = decode_datetime_cursor(cursor)
+        query = query.filter(
+            keyset_after(
+                DeskRequest.created_at, DeskRequest.id, last_created_at, last_id
+            )
+        )
+
+    return query.order_by(DeskRequest.created_at.desc(), DeskRequest.id.desc())
+
+
+def _fetch_page(query, cursor: str | None, limit: int | None):
+    """
+    One keyset page when the caller pages (limit or cursor given), else
+    every row as before pagination existed: the frontend reads these
+    listings as complete lists. Returns (rows, has_more).
+    """
+    if limit is None and cursor is None:
+        return query.all(), False
+    return paginate_keyset(query, limit or DEFAULT_PAGE_SIZE)
+
+
+def _set_next_cursor(response: Response, last_request: DeskRequest, has_more: bool):
+    if has_more and last_request.created_at:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            last_request.created_at, last_request.id
+        )
+
+
 @router.get("/")
 def list_desk_requests(
+    response: Response,
     status: str | None = None,
+    department_id: str | None = Query(None, description="Filter by department"),
+    created_from: date | None = Query(None, description="Created on or after YYYY-MM-DD"),
+    created_to: date | None = Query(None, description="Created on or before YYYY-MM-DD"),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: int | None = Query(None, ge=1, le=500, description="Page size; omit with cursor for the full list"),
     db: Session = Depends(get_db),
     current_user=Depends(require_role("ADMIN")),
 ):
     """
-    List all desk requests for admins, optionally filtered by status.
+    List desk requests for admins, newest first, optionally filtered by
+    status, department and creation date.
+    Without limit or cursor every matching request is returned. With a
+    limit, the cursor for the next page (when more rows exist) is returned
+    in the X-Next-Cursor response header.
     """
     query = db.query(DeskRequest, Employee, Department, Desk)
     query = (
@@ -53,7 +126,11 @@ def list_desk_requests(
     if status:
         query = query.filter(DeskRequest.status == status)
 
-    rows = query.order_by(DeskRequest.created_at.desc()).all()
+    if department_id:
+        query = query.filter(DeskRequest.department_id == department_id)
+
+    query = _apply_request_page(query, cursor, created_from, created_to)
+    rows, has_more = _fetch_page(query, cursor, limit)
 
     results = []
     for req, emp, dept, desk in rows:
@@ -75,16 +152,26 @@ def list_desk_requests(
             }
         )
 
+    if rows:
+        _set_next_cursor(response, rows[-1][0], has_more)
+
     return results
 
 
 @router.get("/me")
 def list_my_desk_requests(
+    response: Response,
+    request_status: str | None = Query(None, alias="status"),
+    created_from: date | None = Query(None, description="Created on or after YYYY-MM-DD"),
+    created_to: date | None = Query(None, description="Created on or before YYYY-MM-DD"),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: int | None = Query(None, ge=1, le=500, description="Page size; omit with cursor for the full list"),
     db: Session = Depends(get_db),
     current_user=Depends(require_role("EMPLOYEE")),
 ):
     """
-    List desk requests for the currently logged-in employee.
+    List desk requests for the currently logged-in employee, newest first.
+    Paginated the same way as the admin listing.
     """
     employee = (
         db.query(Employee)
@@ -102,11 +189,16 @@ def list_my_desk_requests(
         .join(Department, DeskRequest.department_id == Department.id)
         .outerjoin(Desk, DeskRequest.assigned_desk_id == Desk.id)
         .filter(DeskRequest.employee_id == employee.id)
-        .order_by(DeskRequest.created_at.desc())
     )
 
+    if request_status:
+        query = query.filter(DeskRequest.status == request_status)
+
+    query = _apply_request_page(query, cursor, created_from, created_to)
+    rows, has_more = _fetch_page(query, cursor, limit)
+
     results = []
-    for req, dept, desk in query.all():
+    for req, dept, desk in rows:
         results.append(
             {
                 "id": req.id,
@@ -121,21 +213,57 @@ def list_my_desk_requests(
             }
         )
 
+    if rows:
+        _set_next_cursor(response, rows[-1][0], has_more)
+
     return results
 
 
+@router.get("/queue")
+def get_auto_assign_queue(current_user=Depends(require_role("ADMIN"))):
+    """
+    Queue depth, waiting time and outcome counters of the background
+    auto-assignment worker.
+    """
+    return auto_assign_worker.stats()
+
+
+@router.get("/waitlist")
+def get_waitlist(current_user=Depends(require_role("ADMIN"))):
+    """
+    Size of the waitlist of PENDING requests and how many freed desks
+    it has matched.
+    """
+    return waitlist.stats()
+
+
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def create_desk_request(
     payload: DeskRequestCreate,
     db: Session = Depends(get_db),
     current_user=Depends(require_role("EMPLOYEE")),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
 ):
     """
     Create a new desk request for the logged‑in employee.
     Department is derived from the employee profile.
     If auto‑assignment is enabled, this will also create a
-    DeskAssignment when a suitable desk is found.
+    DeskAssignment when a suitable desk is found. With
+    AUTO_ASSIGN_MODE=background the request is returned as PENDING and
+    the background worker assigns it shortly after.
+    Retries carrying the same Idempotency-Key replay the first response.
     """
+    return run_idempotent(
+        idempotency_key,
+        scope="desk-request",
+        user_id=current_user.id,
+        payload=payload,
+        handler=lambda: _create_desk_request(payload, db, current_user),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+def _create_desk_request(payload: DeskRequestCreate, db: Session, current_user):
     if payload.from_date > payload.to_date:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -148,24 +276,31 @@ def create_desk_request(
             detail="Invalid shift. Use MORNING or NIGHT.",
         )
 
-    # Find employee profile for this user
-    employee = (
-        db.query(Employee)
+    # Find employee profile and its department in one indexed join
+    row = (
+        db.query(Employee, Department)
+        .outerjoin(Department, Employee.department_id == Department.id)
         .filter(Employee.user_id == current_user.id)
         .first()
     )
-    if not employee:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee profile not found for user",
         )
+    employee, department = row
+
+    if not department:
+        # Profiles created before department_id existed: resolve the
+        # department name once and store the link for next time.
+        department = (
+            db.query(Department)
+            .filter(Department.name == employee.department)
+            .first()
+        )
+        if department:
+            employee.department_id = department.id
 
-    # Map employee.department string to Department row
-    department = (
-        db.query(Department)
-        .filter(Department.name == employee.department)
-        .first()
-    )
     if not department:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -174,7 +309,7 @@ def create_desk_request(
 
     # Create the desk request record
     desk_request = DeskRequest(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         employee_id=employee.id,
         department_id=department.id,
         shift=payload.shift,
@@ -186,68 +321,39 @@ def create_desk_request(
     db.add(desk_request)
     db.flush()
 
-    # Check global auto‑assignment setting
-    settings = (
-        db.query(SystemSettings)
-        .filter(SystemSettings.id == "GLOBAL")
-        .first()
-    )
-    auto_enabled = bool(settings and settings.auto_assignment_enabled)
+    auto_enabled = auto_assignment_enabled(db)
 
     assigned_desk: Desk | None = None
-    created_assignment: DeskAssignment | None = None
-
-    if auto_enabled:
-        # Candidate desks: same department and its configured floor,
-        # and not INACTIVE (MAINTENANCE is allowed but usually avoided)
-        candidate_desks = (
-            db.query(Desk)
-            .filter(Desk.department_id == department.id)
-            .filter(Desk.floor_id == department.floor_id)
-            .filter(Desk.current_status != "INACTIVE")
-            .all()
-        )
+    queued = False
+
+    if auto_enabled and AUTO_ASSIGN_MODE == "background":
+        # Commit the PENDING request and let the worker find a desk
+        db.commit()
+        queued = auto_assign_worker.enqueue(desk_request.id)
 
-        if candidate_desks:
+    if auto_enabled and not queued:
+        candidates = candidate_desks(db, department)
+
+        if candidates:
             assigned_desk = find_available_desk_for_range(
                 db=db,
-                candidate_desks=candidate_desks,
+                candidate_desks=candidates,
                 shift=payload.shift,
                 start=payload.from_date,
                 end=payload.to_date,
+                lock=True,
             )
 
         if assigned_desk:
-            # Create a time‑bound, shift‑aware assignment
-            created_assignment = DeskAssignment(
-                id=str(uuid.uuid4()),
-                desk_id=assigned_desk.id,
-                employee_id=employee.id,
-                assigned_by=current_user.id,
-                assigned_date=payload.from_date,
-                # Keep released_date open so dashboards treat this as active;
-                # the booking window is enforced via start_date/end_date + shift.
-                released_date=None,
-                assignment_type="TEMPORARY",
-                shift=payload.shift,
-                start_date=payload.from_date,
-                end_date=payload.to_date,
-                is_auto_assigned=True,
-                notes=payload.note,
-            )
-            db.add(created_assignment)
-
-            # Link request to desk and mark approved
-            desk_request.assigned_desk_id = assigned_desk.id
-            desk_request.status = "APPROVED"
-
-            # Mark desk as ASSIGNED at a high level
-            if assigned_desk.current_status != "ASSIGNED":
-                assigned_desk.current_status = "ASSIGNED"
+            create_auto_assignment(db, desk_request, assigned_desk, current_user.id)
 
     db.commit()
     db.refresh(desk_request)
 
+    if desk_request.status == "PENDING":
+        # Waits for a desk of its department to be released
+        waitlist.add(desk_request)
+
     response = {
         "id": desk_request.id,
         "status": desk_request.status,
@@ -257,6 +363,8 @@ def create_desk_request(
         "note": desk_request.note,
         "auto_assignment_enabled": auto_enabled,
     }
+    if queued:
+        response["auto_assignment"] = "queued"
 
     if assigned_desk:
         response["assigned_desk"] = {
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Query, HTTPException, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from datetime import date, datetime
-import uuid
+from calendar import monthrange
+from datetime import date, datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,10 +14,36 @@ from app.models.desk_assignments import DeskAssignment
 from app.models.employees import Employee
 from app.models.users import User
 from app.utils.auth import require_role
-from app.utils.desk_utils import extract_floor_and_index
+from app.utils.desk_utils import (
+    extract_floor_and_index,
+    get_desk_by_number,
+    lock_desk,
+    overlaps_range,
+)
+from app.utils.ids import new_id
+from app.utils.occupancy import SHIFTS, encode_bitsets, encode_runs, occupancy_grid
+from app.utils.archival import history_cutoff
+from app.utils.recurrence import (
+    bookings_overlap,
+    first_shared_date,
+    parse_weekdays,
+    weekday_names,
+    window_mask,
+)
+from app.utils.idempotency import run_idempotent
+from app.utils.waitlist import handle_desks_freed, waitlist
 from app.models.desk_status_history import DeskStatusHistory
+from app.models.desk_status_history_archive import DeskStatusHistoryArchive
 from app.models.departments import Department
 from app.models.desk_requests import DeskRequest
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    decode_datetime_cursor,
+    encode_cursor,
+    keyset_after,
+    paginate_keyset,
+)
 
 # -------------------------------------------------
 # Router setup
@@ -49,6 +76,8 @@ class AssignDeskRequest(BaseModel):
     desk_request_id: str | None = None
     shift: str | None = "MORNING"
     is_reassignment: bool | None = False
+    # Recurring booking, e.g. ["TUE", "THU"] between date and end_date
+    weekdays: list[str] | None = None
 
 class UpdateDeskStatusRequest(BaseModel):
     current_status: str
@@ -112,6 +141,209 @@ def list_desks(
         "data": data,
     }
 
+# -------------------------------------------------
+# GET /desks/available -> Free desks for a shift and date range
+# -------------------------------------------------
+BOOKABLE_STATUSES = ["AVAILABLE", "ASSIGNED"]
+DESK_STATUSES = {"AVAILABLE", "ASSIGNED", "MAINTENANCE", "INACTIVE"}
+
+
+def _free_desk_page(db, query, shift, start, end, weekdays, every_day_in_sql, cursor, limit):
+    """
+    One keyset page of desks from query (which already drops desks with a
+    clash SQL can decide) with no clashing booking, in desk_number order.
+
+    Recurring bookings, or a recurring search, also need the weekday mask
+    test: the bookings overlapping each batch of candidates are fetched
+    in one query and checked in Python. Returns (desks, has_more).
+    """
+    if cursor:
+        last_number, last_id = decode_cursor(cursor)
+        query = query.filter(keyset_after(Desk.desk_number, Desk.id, last_number, last_id, descending=False))
+    query = query.order_by(Desk.desk_number, Desk.id)
+
+    page = []
+    while len(page) <= limit:
+        batch = query.limit(limit + 1).all()
+        if not batch:
+            break
+
+        maybe_booked = (
+            db.query(
+                DeskAssignment.desk_id,
+                DeskAssignment.start_date,
+                DeskAssignment.end_date,
+                DeskAssignment.weekdays,
+            )
+            .filter(DeskAssignment.desk_id.in_([desk.id for desk, _ in batch]))
+            .filter(DeskAssignment.shift == shift)
+            .filter(DeskAssignment.released_date == None)
+            .filter(overlaps_range(start, end))
+        )
+        if every_day_in_sql:
+            maybe_booked = maybe_booked.filter(DeskAssignment.weekdays != None)
+        booked = {
+            row.desk_id for row in maybe_booked
+            if bookings_overlap(start, end, weekdays, row.start_date, row.end_date, row.weekdays)
+        }
+        page += [(desk, dept_name) for desk, dept_name in batch if desk.id not in booked]
+
+        if len(batch) <= limit:
+            break
+        last = batch[-1][0]
+        query = query.filter(keyset_after(Desk.desk_number, Desk.id, last.desk_number, last.id, descending=False))
+
+    return page[:limit], len(page) > limit
+
+
+@router.get("/available")
+def search_available_desks(
+    response: Response,
+    shift: str = Query(..., description="MORNING or NIGHT"),
+    from_date: date = Query(..., description="First day YYYY-MM-DD"),
+    to_date: date | None = Query(None, description="Last day YYYY-MM-DD (default: from_date)"),
+    weekdays: list[str] | None = Query(None, description="Only these days, e.g. weekdays=TUE&weekdays=THU"),
+    floor: int | None = Query(None, description="Filter by floor number"),
+    department_id: str | None = Query(None, description="Filter by department"),
+    status: list[str] | None = Query(None, description="Desk statuses (default: AVAILABLE and ASSIGNED)"),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_role(["ADMIN", "IT_SUPPORT", "EMPLOYEE"])),
+):
+    """
+    Desks with no unreleased booking on the given shift that overlaps the
+    date range (overlaps_range, plus a shared weekday for recurring
+    bookings), in desk number order. Released bookings never block a
+    desk here; desk_has_conflict skips them too.
+    When more desks exist, the cursor for the next page is returned in
+    the X-Next-Cursor response header.
+    """
+    shift = shift.upper()
+    if shift not in ("MORNING", "NIGHT"):
+        raise HTTPException(status_code=400, detail="shift must be MORNING or NIGHT")
+    end_date = to_date or from_date
+    if end_date < from_date:
+        raise HTTPException(status_code=400, detail="End date cannot be before start date")
+    try:
+        mask = parse_weekdays(weekdays)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if mask is not None and not mask & window_mask(from_date, end_date):
+        raise HTTPException(status_code=400, detail="None of the weekdays fall between the start and end date")
+    statuses = [s.upper() for s in status] if status else BOOKABLE_STATUSES
+    if not set(statuses) <= DESK_STATUSES:
+        raise HTTPException(status_code=400, detail=f"status must be one of {', '.join(sorted(DESK_STATUSES))}")
+
+    # Every-day bookings settle it in SQL: one uncorrelated set of desks
+    # booked on any day of the range (or, for a recurring search, on all
+    # of it), served by the (shift, end_date, ...) index.
+    booked = (
+        select(DeskAssignment.desk_id)
+        .where(DeskAssignment.shift == shift)
+        .where(DeskAssignment.released_date == None)
+        .where(DeskAssignment.weekdays == None)
+    )
+    if mask is None:
+        booked = booked.where(overlaps_range(from_date, end_date))
+    else:
+        booked = booked.where(
+            DeskAssignment.start_date <= from_date,
+            DeskAssignment.end_date >= end_date,
+        )
+
+    query = (
+        db.query(Desk, Department.name.label("department_name"))
+        .outerjoin(Department, Desk.department_id == Department.id)
+        .filter(Desk.current_status.in_(statuses))
+        .filter(Desk.id.not_in(booked))
+    )
+    if floor:
+        query = query.filter(Desk.floor == floor)
+    if department_id:
+        query = query.filter(Desk.department_id == department_id)
+
+    rows, has_more = _free_desk_page(
+        db, query, shift, from_date, end_date, mask,
+        every_day_in_sql=mask is None, cursor=cursor, limit=limit,
+    )
+    if has_more:
+        last_desk = rows[-1][0]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_desk.desk_number, last_desk.id)
+
+    return [
+        {
+            "id": desk.id,
+            "desk_number": desk.desk_number,
+            "floor": desk.floor,
+            "location": desk.location,
+            "floor_id": desk.floor_id,
+            "department_id": desk.department_id,
+            "department_name": dept_name,
+            "current_status": desk.current_status,
+        }
+        for desk, dept_name in rows
+    ]
+
+# -------------------------------------------------
+# GET /desks/calendar -> Desk x day occupancy for a floor and month
+# -------------------------------------------------
+@router.get("/calendar")
+def get_floor_calendar(
+    floor: int = Query(..., description="Floor number"),
+    month: str = Query(..., description="Month YYYY-MM"),
+    shift: str | None = Query(None, description="MORNING or NIGHT (default: both)"),
+    department_id: str | None = Query(None, description="Filter by department"),
+    encoding: str = Query("runs", description="runs: [[day, length], ...]; bitset: bit d = day d booked"),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_role(["ADMIN", "IT_SUPPORT", "EMPLOYEE"])),
+):
+    """
+    Booked days of every desk on a floor for one month, per shift, in a
+    single response. Day indexes are 0-based from the first of the month.
+    """
+    try:
+        first_day = datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
+    last_day = date(first_day.year, first_day.month, monthrange(first_day.year, first_day.month)[1])
+
+    if shift is None:
+        shifts = SHIFTS
+    elif shift.upper() in SHIFTS:
+        shifts = (shift.upper(),)
+    else:
+        raise HTTPException(status_code=400, detail="shift must be MORNING or NIGHT")
+    if encoding not in ("runs", "bitset"):
+        raise HTTPException(status_code=400, detail="encoding must be runs or bitset")
+
+    query = db.query(Desk).filter(Desk.floor == floor)
+    if department_id:
+        query = query.filter(Desk.department_id == department_id)
+    desks = query.order_by(Desk.desk_number).all()
+
+    grids = occupancy_grid(db, [desk.id for desk in desks], shifts, first_day, last_day)
+    encode = encode_runs if encoding == "runs" else encode_bitsets
+    booked = {shift_name: encode(grid) for shift_name, grid in grids.items()}
+
+    return {
+        "floor": floor,
+        "month": month,
+        "first_day": str(first_day),
+        "days": (last_day - first_day).days + 1,
+        "encoding": encoding,
+        "desks": [
+            {
+                "id": desk.id,
+                "desk_number": desk.desk_number,
+                "department_id": desk.department_id,
+                "current_status": desk.current_status,
+                "booked": {shift_name: booked[shift_name][i] for shift_name in shifts},
+            }
+            for i, desk in enumerate(desks)
+        ],
+    }
+
 # -------------------------------------------------
 # GET /desks/{desk_id} -> Desk details by UUID
 # -------------------------------------------------
@@ -138,19 +370,36 @@ def get_desk_by_id(
 @router.post("/assign-desk")
 def assign_desk(
     request: AssignDeskRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user=Depends(require_role(["ADMIN", "IT_SUPPORT"]))
+    current_user=Depends(require_role(["ADMIN", "IT_SUPPORT"])),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
 ):
-    print(f"DEBUG: Assigning desk {request.desk_id} to employee {request.employee_id}. is_reassignment={request.is_reassignment}")
-    # Check desk exists
-    desk = db.query(Desk).filter(Desk.id == request.desk_id).first()
+    # Retries carrying the same Idempotency-Key replay the first response
+    return run_idempotent(
+        idempotency_key,
+        scope="assign-desk",
+        user_id=current_user.id,
+        payload=request,
+        handler=lambda: _assign_desk(request, db, current_user, background_tasks),
+    )
+
+
+def _assign_desk(request: AssignDeskRequest, db: Session, current_user, background_tasks: BackgroundTasks):
+    logger.debug(
+        "Assigning desk %s to employee %s. is_reassignment=%s",
+        request.desk_id, request.employee_id, request.is_reassignment,
+    )
+    # Check desk exists, locking its row so concurrent bookings of this
+    # desk serialize on the overlap check below
+    desk = lock_desk(db, request.desk_id)
     if not desk:
-        print(f"DEBUG: Desk {request.desk_id} not found")
+        logger.debug("Desk %s not found", request.desk_id)
         raise HTTPException(status_code=404, detail="Desk not found")
 
     # Desk must not be in MAINTENANCE or INACTIVE
     if desk.current_status in ["MAINTENANCE", "INACTIVE"]:
-        print(f"DEBUG: Desk {desk.desk_number} is in {desk.current_status} status")
+        logger.debug("Desk %s is in %s status", desk.desk_number, desk.current_status)
         raise HTTPException(status_code=400, detail=f"Desk is in {desk.current_status} status and cannot be assigned")
 
     # Check employee exists
@@ -182,16 +431,38 @@ def assign_desk(
     if end_date_obj < start_date_obj:
          raise HTTPException(status_code=400, detail="End date cannot be before start date")
 
-    # Check for ALL overlapping active assignments for the same desk and shift
-    overlapping_assignments = (
-        db.query(DeskAssignment)
-        .filter(DeskAssignment.desk_id == desk.id)
-        .filter(DeskAssignment.released_date == None)
-        .filter(DeskAssignment.start_date <= end_date_obj)
-        .filter(DeskAssignment.end_date >= start_date_obj)
-        .filter(DeskAssignment.shift == (request.shift.upper() if request.shift else "MORNING"))
-        .all()
-    )
+    try:
+        weekdays = parse_weekdays(request.weekdays)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if weekdays is not None and not weekdays & window_mask(start_date_obj, end_date_obj):
+        raise HTTPException(status_code=400, detail="None of the weekdays fall between the start and end date")
+
+    shift = request.shift.upper() if request.shift else "MORNING"
+    # (desk_id, shift, start, end) released below, for waitlist matching
+    freed = []
+
+    def clashes(oa):
+        return bookings_overlap(
+            start_date_obj, end_date_obj, weekdays,
+            oa.start_date, oa.end_date, oa.weekdays,
+        )
+
+    # Check for ALL overlapping active assignments for the same desk and shift.
+    # The date filter runs in SQL; weekday masks are compared on the rows left.
+    overlapping_assignments = [
+        oa for oa in (
+            db.query(DeskAssignment)
+            .filter(DeskAssignment.desk_id == desk.id)
+            .filter(DeskAssignment.released_date == None)
+            .filter(DeskAssignment.start_date <= end_date_obj)
+            .filter(DeskAssignment.end_date >= start_date_obj)
+            .filter(DeskAssignment.shift == shift)
+            .with_for_update()
+            .all()
+        )
+        if clashes(oa)
+    ]
 
     if overlapping_assignments:
         if not request.is_reassignment:
@@ -199,30 +470,47 @@ def assign_desk(
             for oa in overlapping_assignments:
                 emp = db.query(Employee).filter(Employee.id == oa.employee_id).first()
                 if emp:
-                    clashing_names.append(f"{emp.name} ({oa.shift} shift, {oa.start_date} to {oa.end_date})")
+                    clash = f"{emp.name} ({oa.shift} shift, {oa.start_date} to {oa.end_date}"
+                    if weekdays is not None or oa.weekdays is not None:
+                        days = ", ".join(weekday_names(oa.weekdays) or ["every day"])
+                        first_day = first_shared_date(
+                            start_date_obj, end_date_obj, weekdays,
+                            oa.start_date, oa.end_date, oa.weekdays,
+                        )
+                        clash += f" on {days}, first clash {first_day}"
+                    clashing_names.append(clash + ")")
             
             detail_msg = "Desk is already assigned to: " + ", ".join(clashing_names)
-            print(f"DEBUG: Clash detected. {detail_msg}")
+            logger.debug("Clash detected. %s", detail_msg)
             raise HTTPException(status_code=400, detail=detail_msg)
         else:
             # Release ALL overlapping assignments
             for oa in overlapping_assignments:
-                print(f"DEBUG: Releasing overlapping assignment {oa.id} for seamless reassignment")
+                logger.debug("Releasing overlapping assignment %s for seamless reassignment", oa.id)
                 oa.released_date = date.today()
+                freed.append((desk.id, oa.shift, max(oa.start_date, date.today()), oa.end_date))
             # If the reassignment is for a future date, we should probably ensure 
             # the person's end_date is adjusted, but for now, releasing it (ending it today)
             # satisfies the clash-free check for create.
 
-    # Check if this employee already has any active assignments elsewhere and release them
+    # Check if this employee already has any active assignments elsewhere and release them.
+    # A recurring booking only replaces the ones it clashes with, so hybrid
+    # staff can hold e.g. Tue/Thu on one desk and Mon/Wed on another.
     existing_assignments = (
         db.query(DeskAssignment)
         .filter(DeskAssignment.employee_id == request.employee_id)
         .filter(DeskAssignment.released_date == None)
         .all()
     )
+    if weekdays is not None:
+        existing_assignments = [
+            ea for ea in existing_assignments
+            if ea.shift == shift and clashes(ea)
+        ]
     for ea in existing_assignments:
         # Release the old assignment
         ea.released_date = date.today()
+        freed.append((ea.desk_id, ea.shift, max(ea.start_date, date.today()), ea.end_date))
         # Set the old desk to AVAILABLE if it's currently ASSIGNED
         old_desk = db.query(Desk).filter(Desk.id == ea.desk_id).first()
         if old_desk and old_desk.current_status == "ASSIGNED":
@@ -230,26 +518,37 @@ def assign_desk(
 
     # Create assignment
     assignment = DeskAssignment(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         desk_id=desk.id,
         employee_id=employee.id,
         assigned_by=current_user.id,
         assigned_date=date.today(),
         assignment_type=request.assignment_type,
-        shift=request.shift.upper() if request.shift else "MORNING",
+        shift=shift,
         start_date=start_date_obj,
         end_date=end_date_obj,
+        weekdays=weekdays,
         is_auto_assigned=False,
         notes=request.notes
     )
 
     # If this assignment is linked to a request, update that request
+    linked_request = None
     if request.desk_request_id:
+        # Locked after the desk, like the auto-assign worker and the
+        # waitlist, which may be booking the same request right now
         linked_request = (
             db.query(DeskRequest)
             .filter(DeskRequest.id == request.desk_request_id)
+            .with_for_update()
+            .populate_existing()
             .first()
         )
+        if linked_request and linked_request.status != "PENDING":
+            raise HTTPException(
+                status_code=409,
+                detail=f"Desk request is already {linked_request.status}",
+            )
         if linked_request:
             linked_request.status = "APPROVED"
             linked_request.assigned_desk_id = desk.id
@@ -260,7 +559,7 @@ def assign_desk(
 
     # Insert desk status history
     history = DeskStatusHistory(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         desk_id=desk.id,
         old_status=old_status,
         new_status="ASSIGNED",
@@ -276,10 +575,17 @@ def assign_desk(
     db.commit()
     db.refresh(assignment)
 
+    if linked_request:
+        waitlist.discard(linked_request.department_id, linked_request.shift, [linked_request.id])
+    # Offer the released dates to waiting requests once this has committed
+    if freed:
+        background_tasks.add_task(handle_desks_freed, freed)
+
     return {
         "message": "Desk assigned successfully",
         "desk_number": desk.desk_number,
         "employee_id": employee.id,
+        "weekdays": weekday_names(weekdays),
         "assigned_by": current_user.full_name
     }
 
@@ -291,6 +597,7 @@ def assign_desk(
 def update_desk_status_by_number(
     desk_number: int,
     request: UpdateDeskStatusRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user=Depends(require_role(["ADMIN", "IT_SUPPORT"]))
 ):
@@ -300,11 +607,7 @@ def update_desk_status_by_number(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    desk = (
-        db.query(Desk)
-        .filter(Desk.desk_number == desk_number)
-        .first()
-    )
+    desk = get_desk_by_number(db, desk_number)
 
     if not desk:
         raise HTTPException(status_code=404, detail="Desk not found")
@@ -327,7 +630,7 @@ def update_desk_status_by_number(
 
     # Insert desk status history
     history = DeskStatusHistory(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         desk_id=desk.id,
         old_status=old_status,
         new_status=request.current_status,
@@ -342,6 +645,10 @@ def update_desk_status_by_number(
     db.commit()
     db.refresh(desk)
 
+    # A desk back in service can take waiting requests, both shifts, from today
+    if desk.current_status == "AVAILABLE" and old_status != "AVAILABLE":
+        background_tasks.add_task(handle_desks_freed, [(desk.id, None, date.today(), None)])
+
     return {
         "message": "Desk status updated successfully",
         "desk_number": desk.desk_number,
@@ -349,31 +656,99 @@ def update_desk_status_by_number(
         "new_status": desk.current_status
     }
 
+def _naive_utc(value: datetime | None) -> datetime | None:
+    """
+    changed_at is stored as naive UTC; convert timestamps sent with an
+    offset (e.g. ...Z) to match, so they can be compared with it.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _history_page(db, model, desk_id, since, until, cursor, limit):
+    """
+    One keyset page of a desk's history from the hot or archive table.
+    A limit of 0 only reports whether any rows remain.
+    """
+    query = (
+        db.query(
+            model,
+            User.full_name.label("user_name")
+        )
+        .join(User, model.changed_by == User.id)
+        .filter(model.desk_id == desk_id)
+    )
+
+    if since:
+        query = query.filter(model.changed_at >= since)
+
+    if until:
+        query = query.filter(model.changed_at < until)
+
+    if cursor:
+        last_changed_at, last_id = decode_datetime_cursor(cursor)
+        query = query.filter(
+            keyset_after(model.changed_at, model.id, last_changed_at, last_id)
+        )
+
+    query = query.order_by(model.changed_at.desc(), model.id.desc())
+    return paginate_keyset(query, limit)
+
 # -------------------------------------------------
 # GET /desks/by-number/{desk_number}/history
 # -------------------------------------------------
 @router.get("/by-number/{desk_number}/history")
 def get_desk_history_by_number(
     desk_number: str,
+    response: Response,
+    since: datetime | None = Query(None, description="Changed at or after (ISO date/datetime)"),
+    until: datetime | None = Query(None, description="Changed before (ISO date/datetime)"),
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    compact: bool = Query(False, description="Return raw ISO timestamps instead of display strings"),
     db: Session = Depends(get_db),
     current_user=Depends(require_role(["ADMIN", "IT_SUPPORT", "EMPLOYEE"]))
 ):
-    desk = db.query(Desk).filter(Desk.desk_number == desk_number).first()
+    desk = get_desk_by_number(db, desk_number)
     if not desk:
         raise HTTPException(status_code=404, detail="Desk not found")
+    since, until = _naive_utc(since), _naive_utc(until)
 
-    # Fetch status history joined with User for the admin/specialist name
-    history_entries = (
-        db.query(
-            DeskStatusHistory,
-            User.full_name.label("user_name")
-        )
-        .join(User, DeskStatusHistory.changed_by == User.id)
-        .filter(DeskStatusHistory.desk_id == desk.id)
-        .order_by(DeskStatusHistory.changed_at.desc())
-        .all()
+    # Fetch status history joined with User for the admin/specialist name.
+    # Served by the (desk_id, changed_at) index, newest first.
+    history_entries, has_more = _history_page(
+        db, DeskStatusHistory, desk.id, since, until, cursor, limit
     )
 
+    # Everything in the archive is older than the hot table, so only
+    # continue there when the hot rows ran out and the requested range
+    # reaches back past the retention window.
+    if not has_more and (since is None or since < history_cutoff()):
+        archived_entries, has_more = _history_page(
+            db, DeskStatusHistoryArchive, desk.id, since, until, cursor,
+            limit - len(history_entries),
+        )
+        history_entries += archived_entries
+
+    if has_more and history_entries[-1][0].changed_at:
+        last_entry = history_entries[-1][0]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            last_entry.changed_at, last_entry.id
+        )
+
+    if compact:
+        return [
+            {
+                "changed_at": entry.changed_at.isoformat() if entry.changed_at else None,
+                "text": entry.reason,
+                "status": entry.new_status,
+                "user": user_name,
+                "notes": entry.notes,
+            }
+            for entry, user_name in history_entries
+        ]
+
     # Format history for frontend
     formatted_history = []
     for entry, user_name in history_entries:
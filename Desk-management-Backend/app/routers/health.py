@@ -0,0 +1,88 @@
+import asyncio
+import os
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.database.database import engine, pool_status
+
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+# Readiness fails when SELECT 1 takes longer than this
+HEALTH_DB_TIMEOUT_SECONDS = float(os.getenv("HEALTH_DB_TIMEOUT_SECONDS", "2"))
+# Liveness fails once the pool has stayed fully checked out this long,
+# i.e. the worker is likely stuck on leaked or hung connections
+HEALTH_POOL_STUCK_SECONDS = int(os.getenv("HEALTH_POOL_STUCK_SECONDS", "60"))
+
+_state = {"exhausted_since": None}
+
+
+def _pool_exhausted(pool: dict) -> bool:
+    return pool["capacity"] is not None and pool["checked_out"] >= pool["capacity"]
+
+
+def _ping():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+# Both probes are async and never wait on the request thread pool, so
+# they still answer while every thread is busy.
+
+# -------------------------------------------------
+# GET /health/live -> Is this worker process healthy?
+# -------------------------------------------------
+@router.get("/live")
+async def liveness():
+    """
+    Does not touch the database (a database outage is not fixed by
+    restarting workers), only checks the pool has not been wedged for
+    HEALTH_POOL_STUCK_SECONDS.
+    """
+    pool = pool_status()
+    now = time.monotonic()
+    if not _pool_exhausted(pool):
+        _state["exhausted_since"] = None
+    elif _state["exhausted_since"] is None:
+        _state["exhausted_since"] = now
+
+    body = {"status": "ok", "pid": os.getpid(), "pool": pool}
+    since = _state["exhausted_since"]
+    if since is not None and now - since > HEALTH_POOL_STUCK_SECONDS:
+        body["status"] = f"pool exhausted for {round(now - since)}s"
+        return JSONResponse(body, status_code=503)
+    return body
+
+
+# -------------------------------------------------
+# GET /health/ready -> Should this worker get traffic?
+# -------------------------------------------------
+@router.get("/ready")
+async def readiness():
+    """
+    Ready when a pool connection is free and the database answers
+    SELECT 1 within HEALTH_DB_TIMEOUT_SECONDS.
+
+    There is no draining state: on SIGTERM uvicorn stops accepting
+    connections before anything in the app runs, so probes get refused
+    from then on.
+    """
+    pool = pool_status()
+    body = {"status": "ok", "pid": os.getpid(), "pool": pool}
+
+    if _pool_exhausted(pool):
+        body["status"] = "connection pool exhausted"
+    else:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(_ping), HEALTH_DB_TIMEOUT_SECONDS)
+            body["db_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return body
+        except asyncio.TimeoutError:
+            body["status"] = "database timeout"
+        except Exception as e:
+            body["status"] = f"database error: {type(e).__name__}"
+    return JSONResponse(body, status_code=503)
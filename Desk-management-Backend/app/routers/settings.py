@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.database.database import SessionLocal
 from app.models.system_settings import SystemSettings
 from app.utils.auth import require_role
+from app.utils.scheduler import desk_scheduler
 
 
 router = APIRouter(prefix="/settings", tags=["Settings"])
@@ -71,3 +72,11 @@ def update_auto_assignment(
 
     db.commit()
 
+
+@router.get("/scheduler")
+def get_scheduler_status(current_user=Depends(require_role("ADMIN"))):
+    """
+    Last run and counters of this worker's desk state scheduler. Only
+    the worker holding the lease runs jobs; others count skipped runs.
+    """
+    return desk_scheduler.stats()
@@ -0,0 +1,621 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from sqlalchemy import String, case, func, or_, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.models.departments import Department
+from app.models.desk_assignments import DeskAssignment
+from app.models.desk_requests import DeskRequest
+from app.models.desk_status_history import DeskStatusHistory
+from app.models.desks import Desk
+from app.models.employees import Employee
+from app.models.floors import Floor
+from app.utils.desk_utils import overlaps_range
+from app.utils.occupancy import SHIFTS, paint_bookings, paint_ranges
+from app.utils.recurrence import WEEKDAY_NAMES, iter_booked_dates
+
+# Functions import numpy themselves, as in occupancy.py
+if TYPE_CHECKING:
+    import numpy as np
+
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "64"))
+ANALYTICS_CACHE_TTL = timedelta(seconds=int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "300")))
+# Longest period one query may cover (bounds the desk x day matrices)
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "731"))
+# Capacity planning only sorts events, so it can look further
+CAPACITY_MAX_DAYS = int(os.getenv("CAPACITY_MAX_DAYS", "3660"))
+# Rows fetched per round trip while streaming assignments and history
+STREAM_BATCH = 20000
+
+DIMENSIONS = ("floor", "department", "shift", "weekday")
+BUCKETS = ("week", "month")
+DOWN_STATUSES = ("MAINTENANCE", "INACTIVE")
+
+
+class ReportCache:
+    """
+    LRU of computed reports keyed by report name and query parameters,
+    with per-entry expiry so new bookings show up after ANALYTICS_CACHE_TTL.
+    """
+
+    def __init__(self, max_entries: int = ANALYTICS_CACHE_SIZE, ttl: timedelta = ANALYTICS_CACHE_TTL):
+        self._entries: OrderedDict[tuple, tuple[datetime, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> dict | None:
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, report: dict):
+        with self._lock:
+            self._entries[key] = (datetime.utcnow() + self.ttl, report)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": int(self.ttl.total_seconds()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+report_cache = ReportCache()
+
+
+def _stream_columns(db: Session, stmt) -> list[list]:
+    """
+    Run stmt and return its result as one list per column, reading the
+    rows in batches straight off the connection.
+    """
+    result = db.connection().execute(
+        stmt.execution_options(stream_results=True, yield_per=STREAM_BATCH)
+    )
+    columns = [[] for _ in result.keys()]
+    for batch in result.partitions():
+        for values, column in zip(zip(*batch), columns):
+            column.extend(values)
+    return columns
+
+
+def _day_offsets(values: list, start: date, unit: str = "D") -> np.ndarray:
+    """
+    Days from start for a column of dates (or datetimes with unit="us").
+    Values are parsed by NumPy in bulk, whether the driver returns
+    date objects or ISO strings; NULLs become NaT.
+    """
+    import numpy as np
+
+    values = np.array(values, dtype=object)
+    present = np.not_equal(values, None)
+    days = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[D]")
+    days[present] = values[present].astype(f"datetime64[{unit}]").astype("datetime64[D]")
+    return days - np.datetime64(start, "D")
+
+
+def _raw(column):
+    # Skip SQLAlchemy's per-row date conversion; NumPy parses the column
+    return type_coerce(column, String)
+
+
+def _load_matrices(db: Session, start: date, end: date, desks: list):
+    """
+    Desk x day matrices for the period: whether the desk existed, whether
+    it was down (MAINTENANCE / INACTIVE per status history), and per shift
+    whether it was booked.
+    """
+    import numpy as np
+
+    n_desks, n_days = len(desks), (end - start).days + 1
+    row_of = {desk.id: i for i, desk in enumerate(desks)}
+
+    # Bookings overlapping the period, one query per shift so the
+    # (shift, end_date, ...) index serves it. A release before the end date
+    # cuts the booking short; the release day itself still counts.
+    booked, first_booking = [], np.full(n_desks, n_days, dtype=np.int64)
+    for shift in SHIFTS:
+        ids, starts, ends, released, masks = _stream_columns(db, (
+            select(
+                DeskAssignment.desk_id,
+                _raw(DeskAssignment.start_date),
+                _raw(DeskAssignment.end_date),
+                _raw(case(
+                    (DeskAssignment.released_date < DeskAssignment.end_date, DeskAssignment.released_date),
+                )),
+                DeskAssignment.weekdays,
+            )
+            .where(DeskAssignment.shift == shift)
+            .where(overlaps_range(start, end))
+        ))
+        rows = np.array([row_of.get(desk_id, -1) for desk_id in ids], dtype=np.int64)
+        starts = _day_offsets(starts, start).astype(np.int64)
+        released = _day_offsets(released, start)
+        ends = np.where(np.isnat(released), _day_offsets(ends, start), released).astype(np.int64)
+        masks = np.array([-1 if mask is None else mask for mask in masks], dtype=np.int64)
+        known = rows >= 0
+        rows, starts, ends, masks = rows[known], starts[known], ends[known], masks[known]
+
+        booked.append(paint_bookings((n_desks, n_days), start, rows, starts, ends + 1, masks) > 0)
+        np.minimum.at(first_booking, rows, starts)
+    booked = np.stack(booked)
+
+    # A desk exists from its creation, or its first booking if that is
+    # earlier (rows created before created_at was tracked)
+    since = np.array([
+        (desk.created_at.date() - start).days if desk.created_at else 0 for desk in desks
+    ], dtype=np.int64)
+    since = np.minimum(since, first_booking)
+    exists = np.arange(n_days) >= since[:, None]
+
+    # Changes into or out of downtime from the period start on, per desk in
+    # time order. The first one's old_status is the state at the start;
+    # desks without any have kept their current status throughout.
+    ids, changed_at, old_status, new_status = _stream_columns(db, (
+        select(
+            DeskStatusHistory.desk_id,
+            _raw(DeskStatusHistory.changed_at),
+            _raw(DeskStatusHistory.old_status),
+            _raw(DeskStatusHistory.new_status),
+        )
+        .where(DeskStatusHistory.changed_at >= datetime.combine(start, datetime.min.time()))
+        .where(or_(
+            DeskStatusHistory.old_status.in_(DOWN_STATUSES),
+            DeskStatusHistory.new_status.in_(DOWN_STATUSES),
+        ))
+        .order_by(DeskStatusHistory.desk_id, DeskStatusHistory.changed_at)
+    ))
+    h_rows = np.array([row_of.get(desk_id, -1) for desk_id in ids], dtype=np.int64)
+    h_days = _day_offsets(changed_at, start, unit="us").astype(np.int64)
+    went_down = np.isin(np.array(new_status, dtype=object), DOWN_STATUSES)
+    was_down = np.isin(np.array(old_status, dtype=object), DOWN_STATUSES)
+    desk_change = h_rows[1:] != h_rows[:-1]
+    first = np.r_[True, desk_change][: len(h_rows)]
+    last = np.r_[desk_change, True][: len(h_rows)]
+    # Each change holds until the desk's next change (or the period end)
+    held_until = np.where(last, n_days, np.r_[h_days[1:], n_days][: len(h_rows)])
+
+    untouched = np.ones(n_desks, dtype=bool)
+    untouched[h_rows[h_rows >= 0]] = False
+    untouched &= np.array([desk.current_status in DOWN_STATUSES for desk in desks], dtype=bool)
+    untouched = np.nonzero(untouched)[0]
+    initially_down = first & was_down
+
+    down_rows = np.concatenate([h_rows[went_down], h_rows[initially_down], untouched])
+    down_starts = np.concatenate([
+        h_days[went_down], np.zeros(initially_down.sum(), np.int64), np.zeros(len(untouched), np.int64),
+    ])
+    down_stops = np.concatenate([
+        held_until[went_down], h_days[initially_down], np.full(len(untouched), n_days),
+    ])
+    keep = down_rows >= 0
+    down = paint_ranges((n_desks, n_days), down_rows[keep], down_starts[keep], down_stops[keep]) > 0
+
+    return exists, booked, down
+
+
+def desk_utilization(
+    db: Session,
+    start: date,
+    end: date,
+    group_by: tuple[str, ...] = (),
+) -> dict:
+    """
+    Booked vs available desk-shift-days over start..end, overall and per
+    combination of the group_by dimensions (floor, department, shift,
+    weekday).
+
+    Every desk, shift and day is one cell. Cells before the desk was
+    created do not count; cells where it was down are downtime. The rest
+    are available, and utilization is booked / available.
+    """
+    import numpy as np
+
+    started = time.perf_counter()
+    desks = db.execute(
+        select(Desk.id, Desk.floor, Desk.department_id, Desk.current_status, Desk.created_at)
+    ).all()
+    n_days = (end - start).days + 1
+
+    exists, booked, down = _load_matrices(db, start, end, desks)
+    available = exists & ~down
+    booked &= available
+
+    # Fold days into weekdays with a one-hot matmul: (desk, day) @ (day, weekday)
+    weekdays = np.eye(7, dtype=np.float32)[(np.arange(n_days) + start.weekday()) % 7]
+    booked_w = booked.astype(np.float32) @ weekdays             # shift, desk, weekday
+    exists_w = exists.astype(np.float32) @ weekdays             # desk, weekday
+    available_w = available.astype(np.float32) @ weekdays
+
+    # Fold desks into groups of the requested desk dimensions
+    desk_dims = [d for d in group_by if d in ("floor", "department")]
+    codes, labels = [], []
+    for dim in desk_dims:
+        values = [desk.floor if dim == "floor" else desk.department_id for desk in desks]
+        uniques = sorted(set(values), key=lambda v: (v is None, v))
+        code_of = {value: i for i, value in enumerate(uniques)}
+        codes.append(np.array([code_of[v] for v in values], dtype=np.int64))
+        labels.append(uniques)
+    shape = tuple(len(l) for l in labels)
+    group = np.ravel_multi_index(codes, shape) if codes else np.zeros(len(desks), dtype=np.int64)
+    n_groups = int(np.prod(shape)) if codes else 1
+
+    per_group = {}
+    for name, values in (("booked", booked_w.transpose(1, 0, 2)), ("capacity", exists_w), ("available", available_w)):
+        totals = np.zeros((n_groups,) + values.shape[1:], dtype=np.float64)
+        np.add.at(totals, group, values)
+        per_group[name] = totals
+    # Capacity and availability are per desk; every shift has the same
+    for name in ("capacity", "available"):
+        per_group[name] = np.repeat(per_group[name][:, None, :], len(SHIFTS), axis=1)
+
+    # Sum out the dimensions not asked for: axes are group, shift, weekday
+    axes = tuple(axis for axis, dim in ((1, "shift"), (2, "weekday")) if dim not in group_by)
+    reduced = {name: values.sum(axis=axes, keepdims=True) for name, values in per_group.items()}
+    overall = {name: float(values.sum()) for name, values in per_group.items()}
+
+    departments = dict(db.execute(select(Department.id, Department.name)).all())
+    groups = []
+    for index in np.ndindex(reduced["capacity"].shape):
+        capacity = reduced["capacity"][index]
+        if not capacity:
+            continue
+        key = {}
+        if desk_dims:
+            for dim, code, dim_labels in zip(desk_dims, np.unravel_index(index[0], shape), labels):
+                value = dim_labels[code]
+                if dim == "floor":
+                    key["floor"] = value
+                else:
+                    key["department_id"] = value
+                    key["department"] = departments.get(value)
+        if "shift" in group_by:
+            key["shift"] = SHIFTS[index[1]]
+        if "weekday" in group_by:
+            key["weekday"] = WEEKDAY_NAMES[index[2]]
+        groups.append({**key, **_rates(*(reduced[n][index] for n in ("capacity", "available", "booked")))})
+
+    return {
+        "from_date": str(start),
+        "to_date": str(end),
+        "group_by": list(group_by),
+        "desks": len(desks),
+        "totals": _rates(overall["capacity"], overall["available"], overall["booked"]),
+        "groups": groups,
+        "computed_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _rates(capacity, available, booked) -> dict:
+    return {
+        "desk_shift_days": int(capacity),
+        "downtime": int(capacity - available),
+        "available": int(available),
+        "booked": int(booked),
+        "utilization": round(float(booked / available), 4) if available else None,
+    }
+
+
+def cached_desk_utilization(
+    db: Session,
+    start: date,
+    end: date,
+    group_by: tuple[str, ...] = (),
+    refresh: bool = False,
+) -> tuple[dict, bool]:
+    """
+    desk_utilization through the LRU. Returns (report, served_from_cache).
+    """
+    dims = tuple(d for d in DIMENSIONS if d in group_by)
+    key = ("utilization", start, end, dims)
+    if not refresh:
+        report = report_cache.get(key)
+        if report is not None:
+            return report, True
+    report = desk_utilization(db, start, end, dims)
+    report_cache.put(key, report)
+    return report, False
+
+
+def peak_concurrency(
+    group: np.ndarray,
+    starts: np.ndarray,
+    stops: np.ndarray,
+    n_groups: int,
+    n_days: int,
+    capacity: np.ndarray,
+    bucket_starts: np.ndarray,
+) -> dict:
+    """
+    Sort-and-sweep over [start, stop) day ranges per group.
+
+    Every range adds a +1 event at its start and a -1 at its stop; each
+    group also gets a 0 event at every bucket start so levels carried into
+    a bucket are seen in it. Events sorted by (group, day) and summed give
+    the number of overlapping ranges after each event, which holds until
+    the group's next event day. Per group this yields the peak, the first
+    day it is reached, the days above `capacity` and the peak per bucket.
+    """
+    import numpy as np
+
+    starts = np.clip(starts, 0, n_days)
+    stops = np.clip(stops, 0, n_days)
+    real = starts < stops
+    group, starts, stops = group[real], starts[real], stops[real]
+
+    ev_group = np.concatenate([group, group, np.repeat(np.arange(n_groups), len(bucket_starts))])
+    ev_day = np.concatenate([starts, stops, np.tile(bucket_starts, n_groups)])
+    ev_delta = np.concatenate([
+        np.ones(len(group), np.int64), -np.ones(len(group), np.int64),
+        np.zeros(n_groups * len(bucket_starts), np.int64),
+    ])
+    order = np.lexsort((ev_day, ev_group))
+    ev_group, ev_day = ev_group[order], ev_day[order]
+    # Every group's events net to zero, so one running sum serves all groups
+    level = np.cumsum(ev_delta[order])
+
+    # The level a day ends with is the one after its last event
+    last = np.r_[(ev_group[1:] != ev_group[:-1]) | (ev_day[1:] != ev_day[:-1]), True]
+    ev_group, ev_day, level = ev_group[last], ev_day[last], level[last]
+    group_ends = np.r_[ev_group[1:] != ev_group[:-1], True]
+    held = np.where(group_ends, n_days, np.r_[ev_day[1:], n_days]) - ev_day
+    inside = ev_day < n_days
+    ev_group, ev_day, level, held = ev_group[inside], ev_day[inside], level[inside], held[inside]
+
+    peak = np.zeros(n_groups, np.int64)
+    np.maximum.at(peak, ev_group, level)
+    peak_day = np.full(n_groups, -1, np.int64)
+    at_peak = (level == peak[ev_group]) & (level > 0)
+    # Events are in day order within a group, so the first hit is the earliest
+    groups_at_peak, first_hit = np.unique(ev_group[at_peak], return_index=True)
+    peak_day[groups_at_peak] = ev_day[at_peak][first_hit]
+
+    days_over = np.zeros(n_groups, np.int64)
+    np.add.at(days_over, ev_group, held * (level > capacity[ev_group]))
+
+    bucket_peak = np.zeros((n_groups, len(bucket_starts)), np.int64)
+    bucket = np.searchsorted(bucket_starts, ev_day, side="right") - 1
+    np.maximum.at(bucket_peak, (ev_group, bucket), level)
+
+    return {"peak": peak, "peak_day": peak_day, "days_over": days_over, "bucket_peak": bucket_peak}
+
+
+def _bucket_starts(start: date, end: date, bucket: str) -> tuple[list[str], np.ndarray]:
+    """
+    Labels and day offsets of the week (Monday) or month buckets covering
+    start..end; the first bucket always begins at day 0.
+    """
+    import numpy as np
+
+    if bucket == "week":
+        first = start - timedelta(days=start.weekday())
+        starts = [first + timedelta(weeks=i) for i in range((end - first).days // 7 + 1)]
+        labels = [str(day) for day in starts]
+    else:
+        first = start.replace(day=1)
+        starts = []
+        while first <= end:
+            starts.append(first)
+            first = (first + timedelta(days=32)).replace(day=1)
+        labels = [day.strftime("%Y-%m") for day in starts]
+    offsets = np.array([max((day - start).days, 0) for day in starts], dtype=np.int64)
+    return labels, offsets
+
+
+def _demand_ranges(
+    db: Session,
+    start: date,
+    end: date,
+    request_statuses: tuple[str, ...],
+    departments: list,
+):
+    """
+    (department, shift, first_day, stop_day) index columns of every demand
+    range in start..end: assignments by the employee's department, cut
+    short at release, plus desk requests in request_statuses. Recurring
+    assignments contribute one single-day range per booked date. Columns
+    index into departments; ranges outside them are dropped.
+    """
+    import numpy as np
+
+    department_idx = {d.id: i for i, d in enumerate(departments)}
+    # Profiles created before department_id existed only have the name
+    name_idx = {d.name: i for i, d in enumerate(departments)}
+    owner_of = {
+        employee.id: department_idx.get(employee.department_id, name_idx.get(employee.department, -1))
+        for employee in db.execute(select(Employee.id, Employee.department_id, Employee.department))
+    }
+    owners, shifts, starts, stops = [], [], [], []
+
+    for s, shift in enumerate(SHIFTS):
+        employee_ids, first, last, released, masks = _stream_columns(db, (
+            select(
+                DeskAssignment.employee_id,
+                _raw(DeskAssignment.start_date),
+                _raw(DeskAssignment.end_date),
+                _raw(case(
+                    (DeskAssignment.released_date < DeskAssignment.end_date, DeskAssignment.released_date),
+                )),
+                DeskAssignment.weekdays,
+            )
+            .where(DeskAssignment.shift == shift)
+            .where(overlaps_range(start, end))
+        ))
+        first = _day_offsets(first, start).astype(np.int64)
+        released = _day_offsets(released, start)
+        last = np.where(np.isnat(released), _day_offsets(last, start), released).astype(np.int64)
+        owner = np.array([owner_of.get(e, -1) for e in employee_ids], dtype=np.int64)
+
+        # Recurring bookings become one single-day range per booked date
+        recurring = np.array([mask is not None for mask in masks], dtype=bool)
+        every_day = ~recurring
+        extra_owners, extra_days = [], []
+        for i in np.nonzero(recurring)[0]:
+            first_day = start + timedelta(days=max(int(first[i]), 0))
+            last_day = min(start + timedelta(days=int(last[i])), end)
+            for day in iter_booked_dates(first_day, last_day, masks[i]):
+                extra_owners.append(owner[i])
+                extra_days.append((day - start).days)
+        extra_days = np.array(extra_days, dtype=np.int64)
+
+        owners.append(np.concatenate([owner[every_day], np.array(extra_owners, dtype=np.int64)]))
+        starts.append(np.concatenate([first[every_day], extra_days]))
+        stops.append(np.concatenate([last[every_day] + 1, extra_days + 1]))
+        shifts.append(np.full(len(owners[-1]), s, dtype=np.int64))
+
+    if request_statuses:
+        request_departments, request_shifts, first, last = _stream_columns(db, (
+            select(
+                DeskRequest.department_id,
+                _raw(DeskRequest.shift),
+                _raw(DeskRequest.from_date),
+                _raw(DeskRequest.to_date),
+            )
+            .where(DeskRequest.status.in_(request_statuses))
+            .where(DeskRequest.from_date <= end)
+            .where(DeskRequest.to_date >= start)
+        ))
+        owners.append(np.array([department_idx.get(d, -1) for d in request_departments], dtype=np.int64))
+        shifts.append(np.array([SHIFTS.index(shift) for shift in request_shifts], dtype=np.int64))
+        starts.append(_day_offsets(first, start).astype(np.int64))
+        stops.append(_day_offsets(last, start).astype(np.int64) + 1)
+
+    owners, shifts, starts, stops = (np.concatenate(c) for c in (owners, shifts, starts, stops))
+    known = owners >= 0
+    return owners[known], shifts[known], starts[known], stops[known]
+
+
+def capacity_plan(
+    db: Session,
+    start: date,
+    end: date,
+    request_statuses: tuple[str, ...] = ("PENDING",),
+    bucket: str = "month",
+) -> dict:
+    """
+    Peak concurrent desk demand per department and shift over start..end,
+    against the desks on the department's floor, plus the same per floor
+    for all its departments together.
+
+    Demand is assignments (including ones since released, up to their
+    release) and desk requests in request_statuses; approved requests are
+    already counted through the assignment they produced. Desks marked
+    INACTIVE are not counted as capacity.
+    """
+    import numpy as np
+
+    started = time.perf_counter()
+    n_days = (end - start).days + 1
+
+    departments = db.execute(
+        select(Department.id, Department.name, Floor.number)
+        .join(Floor, Floor.id == Department.floor_id)
+        .order_by(Floor.number, Department.name)
+    ).all()
+    floor_desks = dict(db.execute(
+        select(Desk.floor, func.count(Desk.id))
+        .where(Desk.current_status != "INACTIVE")
+        .group_by(Desk.floor)
+    ).all())
+    floors = sorted({d.number for d in departments})
+    floor_idx = {number: i for i, number in enumerate(floors)}
+    department_floor = np.array([floor_idx[d.number] for d in departments], dtype=np.int64)
+
+    dept, shift, starts, stops = _demand_ranges(db, start, end, request_statuses, departments)
+
+    labels, bucket_offsets = _bucket_starts(start, end, bucket)
+    n_shifts = len(SHIFTS)
+
+    def sweep(owner_idx, n_owners, desks_per_owner):
+        # One sweep group per (owner, shift)
+        capacity = np.repeat(desks_per_owner, n_shifts)
+        return peak_concurrency(
+            owner_idx * n_shifts + shift, starts, stops, n_owners * n_shifts, n_days, capacity, bucket_offsets,
+        )
+
+    department_desks = np.array([floor_desks.get(d.number, 0) for d in departments], dtype=np.int64)
+    floor_capacity = np.array([floor_desks.get(number, 0) for number in floors], dtype=np.int64)
+    by_department = sweep(dept, len(departments), department_desks)
+    by_floor = sweep(department_floor[dept], len(floors), floor_capacity)
+
+    def rows(result, keys, desks):
+        out = []
+        for g in range(len(keys) * n_shifts):
+            desk_count, peak = int(desks[g // n_shifts]), int(result["peak"][g])
+            out.append({
+                **keys[g // n_shifts],
+                "shift": SHIFTS[g % n_shifts],
+                "desks": desk_count,
+                "peak": peak,
+                "peak_date": str(start + timedelta(days=int(result["peak_day"][g]))) if peak else None,
+                "peak_utilization": round(peak / desk_count, 4) if desk_count else None,
+                "shortfall": max(peak - desk_count, 0),
+                "days_over_capacity": int(result["days_over"][g]),
+                "peaks": dict(zip(labels, result["bucket_peak"][g].tolist())),
+            })
+        return out
+
+    return {
+        "from_date": str(start),
+        "to_date": str(end),
+        "request_status": list(request_statuses),
+        "bucket": bucket,
+        "demand_ranges": int(len(starts)),
+        "departments": rows(
+            by_department,
+            [{"department_id": d.id, "department": d.name, "floor": d.number} for d in departments],
+            department_desks,
+        ),
+        "floors": rows(by_floor, [{"floor": number} for number in floors], floor_capacity),
+        "computed_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def cached_capacity_plan(
+    db: Session,
+    start: date,
+    end: date,
+    request_statuses: tuple[str, ...] = ("PENDING",),
+    bucket: str = "month",
+    refresh: bool = False,
+) -> tuple[dict, bool]:
+    """
+    capacity_plan through the LRU. Returns (report, served_from_cache).
+    """
+    statuses = tuple(sorted(set(request_statuses)))
+    key = ("capacity", start, end, statuses, bucket)
+    if not refresh:
+        report = report_cache.get(key)
+        if report is not None:
+            return report, True
+    report = capacity_plan(db, start, end, statuses, bucket)
+    report_cache.put(key, report)
+    return report, False
@@ -0,0 +1,122 @@
+import os
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import DateTime, and_, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.desk_assignments import DeskAssignment
+from app.models.desk_assignments_archive import DeskAssignmentArchive
+from app.models.desk_status_history import DeskStatusHistory
+from app.models.desk_status_history_archive import DeskStatusHistoryArchive
+
+# Retention windows: rows closed/changed longer ago than this move to the
+# *_archive tables. Rows inside the window are never archived, so reads
+# bounded to the window only need the hot tables.
+ASSIGNMENT_RETENTION_DAYS = int(os.getenv("ARCHIVE_ASSIGNMENT_RETENTION_DAYS", "180"))
+HISTORY_RETENTION_DAYS = int(os.getenv("ARCHIVE_HISTORY_RETENTION_DAYS", "365"))
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "1000"))
+
+
+def assignment_cutoff(today: date | None = None) -> date:
+    return (today or date.today()) - timedelta(days=ASSIGNMENT_RETENTION_DAYS)
+
+
+def history_cutoff(now: datetime | None = None) -> datetime:
+    return (now or datetime.utcnow()) - timedelta(days=HISTORY_RETENTION_DAYS)
+
+
+def closed_assignment_filter(cutoff: date):
+    """
+    Assignments released, or temporary ones whose booking window ended,
+    before cutoff. Unreleased permanent seats stay however old their
+    end_date, as the scheduler still counts them as open bookings.
+    """
+    return or_(
+        and_(
+            DeskAssignment.released_date.isnot(None),
+            DeskAssignment.released_date < cutoff,
+        ),
+        and_(
+            DeskAssignment.assignment_type == "TEMPORARY",
+            DeskAssignment.end_date < cutoff,
+        ),
+    )
+
+
+def _move_in_chunks(
+    db: Session,
+    hot_model,
+    archive_model,
+    predicate,
+    chunk_size: int,
+    max_rows: int | None,
+) -> int:
+    """
+    Copy matching rows into the archive table and delete them from the
+    hot table, committing after each chunk so locks stay short.
+    """
+    hot = hot_model.__table__
+    archive = archive_model.__table__
+    columns = [c.name for c in hot.columns]
+    moved = 0
+
+    while max_rows is None or moved < max_rows:
+        limit = chunk_size if max_rows is None else min(chunk_size, max_rows - moved)
+        ids = [
+            row[0]
+            for row in db.execute(
+                select(hot.c.id).where(predicate).order_by(hot.c.id).limit(limit)
+            )
+        ]
+        if not ids:
+            break
+
+        archived_at = literal(datetime.utcnow(), DateTime)
+        db.execute(
+            archive.insert().from_select(
+                columns + ["archived_at"],
+                select(*[hot.c[name] for name in columns], archived_at)
+                .where(hot.c.id.in_(ids)),
+            )
+        )
+        db.execute(hot.delete().where(hot.c.id.in_(ids)))
+        db.commit()
+        moved += len(ids)
+
+    return moved
+
+
+def archive_closed_rows(
+    db: Session,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    max_rows: int | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Move closed assignments and old status history into the archive
+    tables. With dry_run, only count what would move.
+    Returns per-table row counts.
+    """
+    assignments_predicate = closed_assignment_filter(assignment_cutoff())
+    history_predicate = DeskStatusHistory.changed_at < history_cutoff()
+
+    if dry_run:
+        return {
+            "desk_assignments": (
+                db.query(DeskAssignment).filter(assignments_predicate).count()
+            ),
+            "desk_status_history": (
+                db.query(DeskStatusHistory).filter(history_predicate).count()
+            ),
+        }
+
+    return {
+        "desk_assignments": _move_in_chunks(
+            db, DeskAssignment, DeskAssignmentArchive,
+            assignments_predicate, chunk_size, max_rows,
+        ),
+        "desk_status_history": _move_in_chunks(
+            db, DeskStatusHistory, DeskStatusHistoryArchive,
+            history_predicate, chunk_size, max_rows,
+        ),
+    }
@@ -1,16 +1,24 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from functools import lru_cache
 
 from app.database.database import SessionLocal
 from app.models.users import User
 from app.utils.jwt import decode_access_token
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto"
-)
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """
+    The bcrypt password context, built (and passlib imported) on first
+    use instead of at app startup.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto"
+    )
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
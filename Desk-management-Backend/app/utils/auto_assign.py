@@ -0,0 +1,381 @@
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.models.departments import Department
+from app.models.desk_assignments import DeskAssignment
+from app.models.desk_requests import DeskRequest
+from app.models.desks import Desk
+from app.models.employees import Employee
+from app.models.system_settings import SystemSettings
+from app.utils.desk_utils import lock_desks, overlaps_range
+from app.utils.ids import new_id
+from app.utils.leases import acquire_lease
+from app.utils.recurrence import bookings_overlap
+
+logger = logging.getLogger(__name__)
+
+# inline: POST /desk-requests/ searches for a desk before it responds.
+# background: the request is committed as PENDING and queued for the worker.
+AUTO_ASSIGN_MODE = os.getenv("AUTO_ASSIGN_MODE", "inline")
+# Most requests one worker pass takes, and how long it waits to fill a pass
+AUTO_ASSIGN_BATCH_SIZE = int(os.getenv("AUTO_ASSIGN_BATCH_SIZE", "200"))
+AUTO_ASSIGN_BATCH_WINDOW_MS = int(os.getenv("AUTO_ASSIGN_BATCH_WINDOW_MS", "50"))
+# On startup, PENDING requests created this recently are queued again
+# (the queue itself does not survive a restart)
+AUTO_ASSIGN_RECOVERY_HOURS = int(os.getenv("AUTO_ASSIGN_RECOVERY_HOURS", "24"))
+# Workers starting within this many seconds of each other share one
+# recovery pass: the first takes the lease and the others skip it
+AUTO_ASSIGN_RECOVERY_LEASE_SECONDS = int(os.getenv("AUTO_ASSIGN_RECOVERY_LEASE_SECONDS", "300"))
+
+RECOVERY_LEASE_NAME = "auto-assign-recovery"
+
+
+def auto_assignment_enabled(db: Session) -> bool:
+    settings = (
+        db.query(SystemSettings)
+        .filter(SystemSettings.id == "GLOBAL")
+        .first()
+    )
+    return bool(settings and settings.auto_assignment_enabled)
+
+
+def candidate_desks(db: Session, department: Department) -> list[Desk]:
+    """
+    Desks a request of the department may get: the department's desks on
+    its configured floor, not INACTIVE (MAINTENANCE is allowed but usually
+    avoided).
+    """
+    return (
+        db.query(Desk)
+        .filter(Desk.department_id == department.id)
+        .filter(Desk.floor_id == department.floor_id)
+        .filter(Desk.current_status != "INACTIVE")
+        .all()
+    )
+
+
+def create_auto_assignment(
+    db: Session,
+    desk_request: DeskRequest,
+    desk: Desk,
+    assigned_by: str,
+) -> DeskAssignment:
+    """
+    Book desk for the request's dates and shift and mark the request
+    APPROVED. The caller commits.
+    """
+    assignment = DeskAssignment(
+        id=new_id(),
+        desk_id=desk.id,
+        employee_id=desk_request.employee_id,
+        assigned_by=assigned_by,
+        assigned_date=desk_request.from_date,
+        # Keep released_date open so dashboards treat this as active;
+        # the booking window is enforced via start_date/end_date + shift.
+        released_date=None,
+        assignment_type="TEMPORARY",
+        shift=desk_request.shift,
+        start_date=desk_request.from_date,
+        end_date=desk_request.to_date,
+        is_auto_assigned=True,
+        notes=desk_request.note,
+    )
+    db.add(assignment)
+
+    # Link request to desk and mark approved
+    desk_request.assigned_desk_id = desk.id
+    desk_request.status = "APPROVED"
+
+    # Mark desk as ASSIGNED at a high level
+    if desk.current_status != "ASSIGNED":
+        desk.current_status = "ASSIGNED"
+    return assignment
+
+
+def _assign_department(
+    db: Session, department: Department, requests: list[tuple[DeskRequest, str]]
+) -> tuple[int, int]:
+    """
+    Assign a batch of one department's requests (oldest first) in one
+    transaction. The candidate desks are locked and their overlapping
+    bookings read once; desks are then picked in memory, in desk_number
+    order like the inline path, counting bookings made earlier in the
+    batch.
+
+    The requests are locked after the desks (the order the waitlist and
+    admin assignment use) and re-read, so ones another transaction has
+    assigned or withdrawn since they were queued are left alone.
+    Returns (assigned, no longer pending).
+    """
+    desks = lock_desks(db, [desk.id for desk in candidate_desks(db, department)])
+    if not desks:
+        return 0, 0
+
+    # populate_existing: the loaded requests take the locked rows' values
+    still_pending = {
+        desk_request.id
+        for desk_request in db.query(DeskRequest)
+        .filter(DeskRequest.id.in_([r.id for r, _ in requests]))
+        .filter(DeskRequest.status == "PENDING")
+        .with_for_update()
+        .populate_existing()
+    }
+    stale = len(requests) - len(still_pending)
+    requests = [(r, user_id) for r, user_id in requests if r.id in still_pending]
+    if not requests:
+        return 0, stale
+
+    shifts = {r.shift for r, _ in requests}
+    first = min(r.from_date for r, _ in requests)
+    last = max(r.to_date for r, _ in requests)
+    booked = defaultdict(list)
+    rows = db.execute(
+        select(
+            DeskAssignment.desk_id,
+            DeskAssignment.shift,
+            DeskAssignment.start_date,
+            DeskAssignment.end_date,
+            DeskAssignment.weekdays,
+        )
+        .where(DeskAssignment.desk_id.in_([desk.id for desk in desks]))
+        .where(DeskAssignment.shift.in_(shifts))
+        .where(DeskAssignment.released_date.is_(None))
+        .where(overlaps_range(first, last))
+        .with_for_update()
+    )
+    for desk_id, shift, start, end, weekdays in rows:
+        booked[desk_id, shift].append((start, end, weekdays))
+
+    assigned = 0
+    for desk_request, assigned_by in requests:
+        start, end = desk_request.from_date, desk_request.to_date
+        for desk in desks:
+            bookings = booked[desk.id, desk_request.shift]
+            if not any(bookings_overlap(start, end, None, s, e, w) for s, e, w in bookings):
+                create_auto_assignment(db, desk_request, desk, assigned_by)
+                bookings.append((start, end, None))
+                assigned += 1
+                break
+    return assigned, stale
+
+
+def assign_queued_requests(db: Session, request_ids: list[str]) -> dict:
+    """
+    Try to auto-assign the given requests, grouped per department. Ones
+    no longer PENDING are skipped; ones with no free desk stay PENDING
+    for an admin. Each department commits on its own, so one failing
+    group does not undo the others.
+    """
+    counts = {"assigned": 0, "unassigned": 0, "skipped": 0, "failed": 0}
+    if not auto_assignment_enabled(db):
+        counts["skipped"] = len(request_ids)
+        return counts
+
+    rows = (
+        db.query(DeskRequest, Employee.user_id)
+        .join(Employee, DeskRequest.employee_id == Employee.id)
+        .filter(DeskRequest.id.in_(request_ids))
+        .filter(DeskRequest.status == "PENDING")
+        .order_by(DeskRequest.created_at, DeskRequest.id)
+        .all()
+    )
+    counts["skipped"] = len(request_ids) - len(rows)
+
+    by_department = defaultdict(list)
+    for desk_request, user_id in rows:
+        by_department[desk_request.department_id].append((desk_request, user_id))
+
+    for department_id, requests in by_department.items():
+        try:
+            department = db.get(Department, department_id)
+            assigned, stale = _assign_department(db, department, requests) if department else (0, 0)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Auto-assignment failed for department %s", department_id)
+            counts["failed"] += len(requests)
+            continue
+        counts["assigned"] += assigned
+        counts["skipped"] += stale
+        counts["unassigned"] += len(requests) - assigned - stale
+    return counts
+
+
+class AutoAssignWorker:
+    """
+    Background auto-assignment. Request handlers enqueue new request ids
+    from their threads; an asyncio task on the app's loop drains the queue
+    in micro-batches and runs each batch in a worker thread, so the
+    database work never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = AUTO_ASSIGN_BATCH_SIZE,
+        batch_window_ms: int = AUTO_ASSIGN_BATCH_WINDOW_MS,
+        lag_samples: int = 1000,
+    ):
+        self.batch_size = batch_size
+        self.batch_window = batch_window_ms / 1000
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        # request id -> monotonic enqueue time, oldest first
+        self._waiting: OrderedDict[str, float] = OrderedDict()
+        self._lags = deque(maxlen=lag_samples)
+        self._lock = threading.Lock()
+        self._token = uuid.uuid4().hex[:8]
+        self.recovered: int | None = None
+        self.enqueued = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.totals = {"assigned": 0, "unassigned": 0, "skipped": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def owner(self) -> str:
+        # Per call, like DeskScheduler.owner: preloaded workers share the token
+        return f"{socket.gethostname()}:{os.getpid()}:{self._token}"
+
+    def start(self):
+        """
+        Start draining on the running event loop (call from app startup).
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def enqueue(self, request_id: str) -> bool:
+        """
+        Queue a committed PENDING request. Safe to call from any thread.
+        Returns False when the worker is not running, so the caller can
+        fall back to assigning inline.
+        """
+        if not self.running:
+            return False
+        with self._lock:
+            self._waiting.setdefault(request_id, time.monotonic())
+            self.enqueued += 1
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, request_id)
+        return True
+
+    async def _run(self):
+        try:
+            await asyncio.to_thread(self._recover)
+        except Exception:
+            logger.exception("Could not re-queue pending desk requests")
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await asyncio.to_thread(self._process, batch)
+            except Exception:
+                logger.exception("Auto-assignment batch of %d failed", len(batch))
+
+    def _recover(self):
+        """
+        Re-queue recent PENDING requests, in one worker only: with several,
+        each would otherwise queue (and lock) the same rows.
+        """
+        db = SessionLocal()
+        try:
+            if not acquire_lease(db, RECOVERY_LEASE_NAME, self.owner, AUTO_ASSIGN_RECOVERY_LEASE_SECONDS):
+                return
+            since = datetime.utcnow() - timedelta(hours=AUTO_ASSIGN_RECOVERY_HOURS)
+            request_ids = db.execute(
+                select(DeskRequest.id)
+                .where(DeskRequest.status == "PENDING")
+                .where(DeskRequest.created_at >= since)
+                .where(DeskRequest.to_date >= date.today())
+                .order_by(DeskRequest.created_at)
+            ).scalars().all()
+        finally:
+            db.close()
+        self.recovered = len(request_ids)
+        for request_id in request_ids:
+            self.enqueue(request_id)
+
+    def _process(self, batch: list[str]):
+        request_ids = list(dict.fromkeys(batch))
+        counts = {"failed": len(request_ids)}
+        db = SessionLocal()
+        try:
+            counts = assign_queued_requests(db, request_ids)
+        finally:
+            db.close()
+            now = time.monotonic()
+            with self._lock:
+                for request_id in request_ids:
+                    queued_at = self._waiting.pop(request_id, None)
+                    if queued_at is not None:
+                        self._lags.append(now - queued_at)
+                for name, value in counts.items():
+                    self.totals[name] += value
+                self.batches += 1
+                self.last_batch_size = len(request_ids)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            lags = sorted(self._lags)
+            oldest = next(iter(self._waiting.values()), None)
+            return {
+                "mode": AUTO_ASSIGN_MODE,
+                "running": self.running,
+                "queue_depth": len(self._waiting),
+                "oldest_wait_ms": round((now - oldest) * 1000, 1) if oldest is not None else 0,
+                "lag_ms": {
+                    "samples": len(lags),
+                    "p50": round(lags[len(lags) // 2] * 1000, 1) if lags else None,
+                    "p95": round(lags[int(len(lags) * 0.95)] * 1000, 1) if lags else None,
+                    "max": round(lags[-1] * 1000, 1) if lags else None,
+                },
+                # None: another worker ran the startup recovery
+                "recovered": self.recovered,
+                "enqueued": self.enqueued,
+                "batches": self.batches,
+                "last_batch_size": self.last_batch_size,
+                **self.totals,
+            }
+
+
+auto_assign_worker = AutoAssignWorker()
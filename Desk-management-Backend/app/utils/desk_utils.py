@@ -1,8 +1,10 @@
 from datetime import date
+from sqlalchemy import and_, select, update
 from sqlalchemy.orm import Session
 
 from app.models.desk_assignments import DeskAssignment
 from app.models.desks import Desk
+from app.utils.recurrence import bookings_overlap
 
 
 def extract_floor_and_index(desk_number: int | str):
@@ -32,28 +34,146 @@ def extract_floor_and_index(desk_number: int | str):
     return floor, desk_index
 
 
+def desk_number_fields(desk_number: int | str) -> dict:
+    """
+    Normalized integer key for a desk number plus its index within the
+    floor, as stored on Desk.desk_key / Desk.desk_index.
+    Non-numeric desk numbers map to NULLs.
+    """
+    try:
+        _, desk_index = extract_floor_and_index(desk_number)
+    except ValueError:
+        return {"desk_key": None, "desk_index": None}
+    return {"desk_key": int(desk_number), "desk_index": desk_index}
+
+
+def get_desk_by_number(db: Session, desk_number: int | str) -> Desk | None:
+    """
+    Look a desk up by its number through the integer desk_key index.
+    Falls back to the string column for rows that have no key yet.
+
+    desk_key is not unique in the schema: "0101" and "101" share a key.
+    create_desk refuses such a second desk, but rows inserted before
+    that check may still collide; the exact desk_number then wins.
+    """
+    desk_key = desk_number_fields(desk_number)["desk_key"]
+    if desk_key is not None:
+        desks = (
+            db.query(Desk)
+            .filter(Desk.desk_key == desk_key)
+            .order_by(Desk.desk_number)
+            .all()
+        )
+        exact = [desk for desk in desks if desk.desk_number == str(desk_number)]
+        if exact or desks:
+            return (exact or desks)[0]
+
+    return (
+        db.query(Desk)
+        .filter(Desk.desk_number == str(desk_number))
+        .first()
+    )
+
+
+def lock_desk(db: Session, desk_id: str) -> Desk | None:
+    """
+    Load a desk with an exclusive row lock (SELECT ... FOR UPDATE) held
+    until the transaction ends, so bookings of the same desk run one at
+    a time while other desks stay bookable in parallel.
+
+    SQLite has no row locks; there a no-op UPDATE takes the database
+    write lock for the rest of the transaction instead.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(
+            update(Desk)
+            .where(Desk.id == desk_id)
+            .values(updated_at=Desk.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    return (
+        db.query(Desk)
+        .filter(Desk.id == desk_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+
+
+def lock_desks(db: Session, desk_ids: list[str]) -> list[Desk]:
+    """
+    lock_desk for several desks in one statement, returned (and locked)
+    in desk_number order like find_available_desk_for_range takes them.
+    """
+    if not desk_ids:
+        return []
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(
+            update(Desk)
+            .where(Desk.id.in_(desk_ids))
+            .values(updated_at=Desk.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    return (
+        db.query(Desk)
+        .filter(Desk.id.in_(desk_ids))
+        .order_by(Desk.desk_number)
+        .with_for_update()
+        .populate_existing()
+        .all()
+    )
+
+
+def overlaps_range(start: date, end: date):
+    """
+    Assignments whose date range overlaps start..end:
+    existing.start_date <= new_end AND existing.end_date >= new_start
+    """
+    return and_(DeskAssignment.start_date <= end, DeskAssignment.end_date >= start)
+
+
 def desk_has_conflict(
     db: Session,
     desk_id: str,
     shift: str,
     start: date,
     end: date,
+    for_update: bool = False,
+    weekdays: int | None = None,
 ) -> bool:
     """
-    Check if a desk already has an assignment for the same shift
-    with an overlapping date range.
+    Check if a desk already has an active (not released) assignment for
+    the same shift with an overlapping date range.
 
-    Overlap rule:
-    existing.start_date <= new_end AND existing.end_date >= new_start
+    Overlap rule: the date ranges overlap (overlaps_range) and, for
+    recurring bookings (weekday masks, None = every day), the two share
+    a weekday inside the common part of their ranges.
+
+    The date rule narrows the rows in SQL; the rows left are compared on
+    their masks in Python, so recurring bookings are never expanded into
+    days. Rows are read lazily and the check stops at the first clash.
+
+    With for_update the check is a locking read, which sees the latest
+    committed assignments even under REPEATABLE READ. Use it once the
+    desk row is locked.
     """
     conflict_query = (
-        db.query(DeskAssignment)
-        .filter(DeskAssignment.desk_id == desk_id)
-        .filter(DeskAssignment.shift == shift)
-        .filter(DeskAssignment.start_date <= end)
-        .filter(DeskAssignment.end_date >= start)
+        select(DeskAssignment.start_date, DeskAssignment.end_date, DeskAssignment.weekdays)
+        .where(DeskAssignment.desk_id == desk_id)
+        .where(DeskAssignment.shift == shift)
+        .where(DeskAssignment.released_date.is_(None))
+        .where(overlaps_range(start, end))
     )
-    return db.query(conflict_query.exists()).scalar()
+    if for_update:
+        conflict_query = conflict_query.with_for_update()
+
+    with db.connection().execute(conflict_query) as rows:
+        return any(
+            bookings_overlap(start, end, weekdays, row_start, row_end, row_weekdays)
+            for row_start, row_end, row_weekdays in rows
+        )
 
 
 def find_available_desk_for_range(
@@ -62,17 +182,31 @@ def find_available_desk_for_range(
     shift: str,
     start: date,
     end: date,
+    lock: bool = False,
+    weekdays: int | None = None,
 ) -> Desk | None:
     """
     Given a list of candidate desks, return the first one that has
     no conflicting assignment for the given shift and date range.
+
+    With lock, desks are first checked without locking; only a desk that
+    looks free is row-locked and checked again with a locking read, and
+    the search moves on if a concurrent booking took it meanwhile. Locks
+    are taken in desk_number order, so concurrent callers cannot deadlock
+    each other, and the returned desk stays locked until the caller commits.
     """
     # Sort for deterministic behaviour (e.g. by desk_number)
     sorted_desks = sorted(candidate_desks, key=lambda d: d.desk_number)
 
     for desk in sorted_desks:
-        if not desk_has_conflict(db, desk.id, shift, start, end):
+        if desk_has_conflict(db, desk.id, shift, start, end, weekdays=weekdays):
+            continue
+        if not lock:
+            return desk
+        desk = lock_desk(db, desk.id)
+        if desk is not None and not desk_has_conflict(
+            db, desk.id, shift, start, end, for_update=True, weekdays=weekdays
+        ):
             return desk
 
     return None
-
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+from app.database.database import SessionLocal
+from app.models.idempotency_keys import IdempotencyKey
+
+# "db" shares keys across workers through the idempotency_keys table;
+# "memory" keeps them in-process (single-node deployments, tests).
+IDEMPOTENCY_STORE = os.getenv("IDEMPOTENCY_STORE", "db").lower()
+IDEMPOTENCY_TTL = timedelta(hours=int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24")))
+MEMORY_STORE_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MEMORY_MAX_KEYS", "10000"))
+# How long a running request holds its key. A retry after that takes the
+# key over, so a worker killed mid-request (where the key is never
+# released) blocks retries for minutes, not the whole TTL. Keep it above
+# the slowest guarded request, i.e. the worker timeout.
+IDEMPOTENCY_LOCK = timedelta(seconds=int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "120")))
+
+# Expired rows are purged in small batches every N reservations
+EVICT_EVERY = 500
+EVICT_BATCH = 500
+
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+class StoredResponse:
+    def __init__(self, request_hash, status_code=None, body=None, locked_until=None):
+        self.request_hash = request_hash
+        self.status_code = status_code
+        self.body = body
+        self.locked_until = locked_until
+
+
+def _can_take_over(stored: StoredResponse, request_hash, now: datetime) -> bool:
+    """
+    An in-progress reservation for the same request whose lock ran out
+    """
+    return (
+        stored.status_code is None
+        and stored.request_hash == request_hash
+        and (stored.locked_until is None or stored.locked_until <= now)
+    )
+
+
+class MemoryIdempotencyStore:
+    """
+    In-process store: LRU-bounded dict with per-entry expiry.
+    """
+
+    def __init__(self, max_keys: int = MEMORY_STORE_MAX_KEYS):
+        self._entries: OrderedDict[str, tuple[datetime, StoredResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+
+    def reserve(self, key_hash, request_hash):
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry and entry[0] > now and not _can_take_over(entry[1], request_hash, now):
+                self._entries.move_to_end(key_hash)
+                return entry[1]
+            self._entries[key_hash] = (
+                now + IDEMPOTENCY_TTL,
+                StoredResponse(request_hash, locked_until=now + IDEMPOTENCY_LOCK),
+            )
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > self._max_keys:
+                self._entries.popitem(last=False)
+        return None
+
+    def complete(self, key_hash, status_code, body):
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry:
+                entry[1].status_code = status_code
+                entry[1].body = body
+                entry[1].locked_until = None
+
+    def release(self, key_hash):
+        with self._lock:
+            self._entries.pop(key_hash, None)
+
+
+class DatabaseIdempotencyStore:
+    """
+    Store backed by the idempotency_keys table. Each call uses its own
+    short session so a reservation is visible to concurrent retries
+    before the guarded request commits.
+    """
+
+    def __init__(self):
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, key_hash, request_hash):
+        self._maybe_evict()
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            row = db.get(IdempotencyKey, key_hash)
+            if row and row.expires_at > now:
+                stored = StoredResponse(
+                    row.request_hash,
+                    row.status_code,
+                    json.loads(row.response_body) if row.response_body else None,
+                    row.locked_until,
+                )
+                if not _can_take_over(stored, request_hash, now):
+                    return stored
+                # Conditional, so only one of several retries takes over
+                taken = db.query(IdempotencyKey).filter(
+                    IdempotencyKey.key_hash == key_hash,
+                    IdempotencyKey.status_code.is_(None),
+                    or_(
+                        IdempotencyKey.locked_until.is_(None),
+                        IdempotencyKey.locked_until <= now,
+                    ),
+                ).update({
+                    "locked_until": now + IDEMPOTENCY_LOCK,
+                    "expires_at": now + IDEMPOTENCY_TTL,
+                }, synchronize_session=False)
+                db.commit()
+                return None if taken else StoredResponse(request_hash)
+            if row:
+                db.delete(row)
+                db.flush()
+            db.add(IdempotencyKey(
+                key_hash=key_hash,
+                request_hash=request_hash,
+                expires_at=now + IDEMPOTENCY_TTL,
+                locked_until=now + IDEMPOTENCY_LOCK,
+            ))
+            try:
+                db.commit()
+            except IntegrityError:
+                # A concurrent retry reserved the key first
+                db.rollback()
+                return StoredResponse(request_hash)
+            return None
+        finally:
+            db.close()
+
+    def complete(self, key_hash, status_code, body):
+        db = SessionLocal()
+        try:
+            db.query(IdempotencyKey).filter(
+                IdempotencyKey.key_hash == key_hash
+            ).update({
+                "status_code": status_code,
+                "response_body": json.dumps(body),
+                "locked_until": None,
+            })
+            db.commit()
+        finally:
+            db.close()
+
+    def release(self, key_hash):
+        db = SessionLocal()
+        try:
+            db.query(IdempotencyKey).filter(
+                IdempotencyKey.key_hash == key_hash
+            ).delete()
+            db.commit()
+        finally:
+            db.close()
+
+    def evict_expired(self, batch: int = EVICT_BATCH) -> int:
+        db = SessionLocal()
+        try:
+            keys = [
+                k for (k,) in db.query(IdempotencyKey.key_hash)
+                .filter(IdempotencyKey.expires_at < datetime.utcnow())
+                .limit(batch)
+            ]
+            if keys:
+                db.query(IdempotencyKey).filter(
+                    IdempotencyKey.key_hash.in_(keys)
+                ).delete(synchronize_session=False)
+                db.commit()
+            return len(keys)
+        finally:
+            db.close()
+
+    def _maybe_evict(self):
+        with self._lock:
+            self._calls += 1
+            due = self._calls % EVICT_EVERY == 0
+        if due:
+            self.evict_expired()
+
+
+store = (
+    MemoryIdempotencyStore()
+    if IDEMPOTENCY_STORE == "memory"
+    else DatabaseIdempotencyStore()
+)
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def run_idempotent(
+    idempotency_key: str | None,
+    scope: str,
+    user_id: str,
+    payload,
+    handler,
+    status_code: int = 200,
+):
+    """
+    Run handler() at most once per (scope, user, Idempotency-Key).
+
+    Without a key the handler just runs. A retry with the same key and
+    body replays the stored response; a retry while the first call is
+    still running gets 409, and reusing a key for a different body 422.
+    Failed calls release the key so the client can retry; a call that
+    never finishes (its worker died) holds it for IDEMPOTENCY_LOCK.
+    """
+    if not idempotency_key:
+        return handler()
+
+    key_hash = _sha256(f"{scope}:{user_id}:{idempotency_key}")
+    request_hash = _sha256(json.dumps(jsonable_encoder(payload), sort_keys=True))
+
+    existing = store.reserve(key_hash, request_hash)
+    if existing is not None:
+        if existing.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request",
+            )
+        if existing.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        return JSONResponse(
+            content=existing.body,
+            status_code=existing.status_code,
+            headers={REPLAY_HEADER: "true"},
+        )
+
+    try:
+        result = handler()
+    except BaseException:
+        store.release(key_hash)
+        raise
+
+    store.complete(key_hash, status_code, jsonable_encoder(result))
+    return result
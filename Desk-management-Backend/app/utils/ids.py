@@ -0,0 +1,50 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_seq = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7 layout).
+
+    48-bit Unix millisecond timestamp, then a 12-bit sequence that keeps
+    ids generated within the same millisecond in order, then 62 random
+    bits. Ids from one process sort by creation time, so inserts land at
+    the right-hand edge of the primary key index instead of scattering.
+    """
+    global _last_ms, _last_seq
+
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _last_seq = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _last_seq += 1
+            if _last_seq > 0xFFF:
+                # Sequence exhausted: borrow the next millisecond
+                _last_ms += 1
+                _last_seq = 0
+        ms, seq = _last_ms, _last_seq
+
+    rand = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (
+        (ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | seq << 64
+        | 0b10 << 62
+        | rand
+    )
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    """
+    New primary key in the canonical 36-char string form used by the models.
+    """
+    return str(uuid7())
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
+
+# python-jose (and the crypto backends it loads) is imported on first use
+# rather than at app startup.
 
 # 🔑 Secret & config
 SECRET_KEY = "desk-management-secret-key"  # TODO: move to env later
@@ -14,6 +16,8 @@ def _encode_token(data: dict, expires_delta: timedelta) -> str:
     """
     Internal helper to encode a JWT with a specific expiry.
     """
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + expires_delta
     to_encode.update({"exp": expire})
@@ -31,6 +35,8 @@ def create_access_token(data: dict) -> str:
 
 
 def decode_access_token(token: str):
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
@@ -57,6 +63,8 @@ def decode_password_reset_token(token: str):
     Decode and validate a password reset token.
     Returns payload dict on success, or None on invalid/expired.
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         if payload.get("type") != "password_reset":
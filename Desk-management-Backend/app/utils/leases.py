@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.scheduler_leases import SchedulerLease
+
+
+def acquire_lease(db: Session, name: str, owner: str, ttl_seconds: int) -> bool:
+    """
+    Take or renew the named lease for ttl_seconds. Succeeds when nobody
+    holds it, the holder's lease expired, or owner already holds it;
+    the conditional UPDATE (or the primary key on INSERT) makes sure
+    only one of several workers wins.
+    """
+    now = datetime.utcnow()
+    values = {"owner": owner, "expires_at": now + timedelta(seconds=ttl_seconds)}
+    taken = db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name)
+        .where(or_(SchedulerLease.owner == owner, SchedulerLease.expires_at < now))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not taken:
+        try:
+            db.execute(insert(SchedulerLease).values(name=name, **values))
+        except IntegrityError:
+            db.rollback()
+            return False
+    db.commit()
+    return True
+
+
+def release_lease(db: Session, name: str, owner: str):
+    db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name)
+        .where(SchedulerLease.owner == owner)
+        .values(expires_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.desk_assignments import DeskAssignment
+from app.utils.desk_utils import overlaps_range
+
+# numpy is imported inside the functions that use it: importing it costs
+# every worker start tens of ms, and only the calendar and analytics
+# endpoints need it
+if TYPE_CHECKING:
+    import numpy as np
+
+SHIFTS = ("MORNING", "NIGHT")
+
+
+def occupancy_grid(
+    db: Session,
+    desk_ids: list[str],
+    shifts: tuple[str, ...],
+    first_day: date,
+    last_day: date,
+) -> dict[str, np.ndarray]:
+    """
+    Per shift, a desks x days boolean matrix (rows follow desk_ids) that
+    is True where the desk has an active booking on that day.
+
+    All overlapping assignments are loaded in one query and painted as
+    ranges with paint_bookings, not looked up day by day.
+    """
+    import numpy as np
+
+    n_days = (last_day - first_day).days + 1
+    row_of = {desk_id: i for i, desk_id in enumerate(desk_ids)}
+    grids = {shift: np.zeros((len(desk_ids), n_days), dtype=bool) for shift in shifts}
+    if not desk_ids:
+        return grids
+
+    rows = db.execute(
+        select(
+            DeskAssignment.desk_id,
+            DeskAssignment.shift,
+            DeskAssignment.start_date,
+            DeskAssignment.end_date,
+            DeskAssignment.weekdays,
+        )
+        .where(DeskAssignment.desk_id.in_(desk_ids))
+        .where(DeskAssignment.shift.in_(shifts))
+        .where(DeskAssignment.released_date.is_(None))
+        .where(overlaps_range(first_day, last_day))
+    ).all()
+    if not rows:
+        return grids
+
+    desk_row = np.array([row_of[r.desk_id] for r in rows], dtype=np.int64)
+    shift_idx = np.array([shifts.index(r.shift) for r in rows], dtype=np.int64)
+    start = np.array([(r.start_date - first_day).days for r in rows], dtype=np.int64)
+    stop = np.array([(r.end_date - first_day).days + 1 for r in rows], dtype=np.int64)
+    mask = np.array([-1 if r.weekdays is None else r.weekdays for r in rows], dtype=np.int64)
+
+    for s, shift in enumerate(shifts):
+        ours = shift_idx == s
+        grids[shift] = paint_bookings(
+            grids[shift].shape, first_day,
+            desk_row[ours], start[ours], stop[ours], mask[ours],
+        ) > 0
+    return grids
+
+
+def paint_ranges(shape: tuple[int, int], rows, starts, stops) -> np.ndarray:
+    """
+    Count, per cell of a rows x days matrix, the [start, stop) day ranges
+    covering it. +1 at each start and -1 at each stop in a difference
+    array, then a cumulative sum along the days; ranges are clipped to
+    the matrix, so empty ones cancel out.
+    """
+    import numpy as np
+
+    n_rows, n_days = shape
+    starts = np.clip(starts, 0, n_days)
+    stops = np.clip(stops, 0, n_days)
+    diff = np.zeros((n_rows, n_days + 1), dtype=np.int32)
+    np.add.at(diff, (rows, starts), 1)
+    np.add.at(diff, (rows, stops), -1)
+    return np.cumsum(diff[:, :n_days], axis=1)
+
+
+def paint_bookings(shape: tuple[int, int], first_day: date, rows, starts, stops, masks) -> np.ndarray:
+    """
+    Like paint_ranges for bookings whose mask is -1 (every day). Recurring
+    bookings (mask >= 0) only cover the days of their weekday bits; they
+    are painted with one broadcast comparison against the day axis.
+    """
+    import numpy as np
+
+    every_day = masks < 0
+    counts = paint_ranges(shape, rows[every_day], starts[every_day], stops[every_day])
+
+    recurring = ~every_day
+    if recurring.any():
+        days = np.arange(shape[1])
+        weekday = (days + first_day.weekday()) % 7
+        covered = (
+            (days >= starts[recurring, None])
+            & (days < stops[recurring, None])
+            & ((masks[recurring, None] >> weekday) & 1).astype(bool)
+        )
+        np.add.at(counts, rows[recurring], covered.astype(counts.dtype))
+    return counts
+
+
+def encode_runs(grid: np.ndarray) -> list[list[list[int]]]:
+    """
+    Run-length encode each row as [[first_day_index, length], ...] of
+    booked days.
+    """
+    import numpy as np
+
+    padded = np.zeros((grid.shape[0], grid.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = grid
+    edges = np.diff(padded, axis=1)
+    # Row-major order pairs each run start with its own end
+    start_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+
+    runs = [[] for _ in range(grid.shape[0])]
+    for row, first, stop in zip(start_rows.tolist(), starts.tolist(), ends.tolist()):
+        runs[row].append([first, stop - first])
+    return runs
+
+
+def encode_bitsets(grid: np.ndarray) -> list[int]:
+    """
+    One integer per row with bit d set when day d is booked.
+    """
+    import numpy as np
+
+    weights = np.left_shift(1, np.arange(grid.shape[1], dtype=np.int64))
+    return (grid.astype(np.int64) @ weights).tolist()
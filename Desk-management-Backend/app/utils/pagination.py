@@ -0,0 +1,77 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+# Header used to hand the next page cursor back to list endpoints that keep
+# returning a plain JSON array (the frontend consumes those as-is).
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value, row_id: str) -> str:
+    """
+    Encode the (sort key, id) of the last row on a page into an opaque,
+    URL-safe cursor string.
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor.
+    Raises 400 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return sort_value, row_id
+
+
+def decode_datetime_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor whose sort key is a timestamp.
+    """
+    sort_value, row_id = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(sort_value), row_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def keyset_after(sort_column, id_column, sort_value, row_id, descending=True):
+    """
+    Keyset predicate selecting rows strictly after (sort_value, row_id)
+    in (sort_column, id_column) order. The id breaks ties between rows
+    sharing the same sort value.
+    """
+    if descending:
+        return or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < row_id),
+        )
+    return or_(
+        sort_column > sort_value,
+        and_(sort_column == sort_value, id_column > row_id),
+    )
+
+
+def paginate_keyset(query, limit: int):
+    """
+    Fetch one page (limit + 1 rows to detect a following page).
+    Returns (rows, has_more).
+    """
+    rows = query.limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
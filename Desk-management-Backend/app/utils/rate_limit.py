@@ -0,0 +1,143 @@
+import ipaddress
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request, status
+
+# Sustained requests per minute (and burst size) allowed per client IP and
+# per email address on each rate-limited /auth endpoint.
+AUTH_RATE_IP_PER_MINUTE = float(os.getenv("AUTH_RATE_IP_PER_MINUTE", "30"))
+AUTH_RATE_EMAIL_PER_MINUTE = float(os.getenv("AUTH_RATE_EMAIL_PER_MINUTE", "5"))
+# Upper bound on tracked buckets per limiter; least recently used go first
+AUTH_RATE_MAX_KEYS = int(os.getenv("AUTH_RATE_MAX_KEYS", "10000"))
+# Addresses / CIDR ranges of reverse proxies (e.g. the bundled nginx) whose
+# X-Real-IP / X-Forwarded-For headers name the client. Anyone else could set
+# those headers to dodge the limits, so by default none are trusted.
+RATE_LIMIT_TRUSTED_PROXIES = [
+    ipaddress.ip_network(value.strip(), strict=False)
+    for value in os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "").split(",")
+    if value.strip()
+]
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by an arbitrary string, held in an LRU-bounded
+    dict so memory stays flat however many keys are seen.
+    """
+
+    def __init__(self, per_minute: float, burst: float | None = None, max_keys: int = AUTH_RATE_MAX_KEYS):
+        if per_minute <= 0:
+            raise ValueError(f"Rate limit must be above 0 per minute, got {per_minute}")
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else per_minute
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def acquire(self, key: str) -> float:
+        """
+        Take one token for key. Returns 0 when allowed, otherwise the
+        number of seconds until a token is available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.capacity, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._buckets.move_to_end(key)
+                tokens, last = bucket
+                bucket[0] = min(self.capacity, tokens + (now - last) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                return 0.0
+
+            self.rejected += 1
+            return (1 - bucket[0]) / self.rate
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+                "evicted": self.evicted,
+                "tracked_keys": len(self._buckets),
+                "per_minute": self.rate * 60,
+                "burst": self.capacity,
+            }
+
+
+ip_limiter = TokenBucketLimiter(AUTH_RATE_IP_PER_MINUTE)
+email_limiter = TokenBucketLimiter(AUTH_RATE_EMAIL_PER_MINUTE)
+
+
+def _is_trusted(address: str, trusted_proxies) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def client_ip(request: Request, trusted_proxies=None) -> str:
+    """
+    The peer address, or when the peer is a trusted proxy, the client it
+    reports: X-Real-IP, else the last X-Forwarded-For hop that is not a
+    trusted proxy (earlier hops are whatever the client sent).
+    """
+    if trusted_proxies is None:
+        trusted_proxies = RATE_LIMIT_TRUSTED_PROXIES
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted(peer, trusted_proxies):
+        return peer
+
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip:
+        return real_ip.strip()
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted(hop, trusted_proxies):
+                return hop
+        if hops:
+            return hops[0]
+    return peer
+
+
+def check_auth_rate_limit(request: Request, endpoint: str, email: str | None = None):
+    """
+    Reject with 429 (before any password hashing or DB work) when the
+    caller's IP or the targeted email has run out of tokens.
+    """
+    retry_after = ip_limiter.acquire(f"{endpoint}:{client_ip(request)}")
+    if not retry_after and email:
+        retry_after = email_limiter.acquire(f"{endpoint}:{email.strip().lower()}")
+
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def rate_limit_stats() -> dict:
+    return {
+        "ip": ip_limiter.stats(),
+        "email": email_limiter.stats(),
+    }
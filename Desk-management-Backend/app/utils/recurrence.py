@@ -0,0 +1,85 @@
+from collections.abc import Iterable, Iterator
+from datetime import date, timedelta
+
+# Bit i of a weekday mask is date.weekday() == i (bit 0 = Monday)
+WEEKDAY_NAMES = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+ALL_DAYS = 0b1111111
+
+
+def parse_weekdays(names: Iterable[str] | None) -> int | None:
+    """
+    Turn ["TUE", "THU"] into a weekday mask. None, or all seven days,
+    means an every-day booking and is stored as NULL.
+    """
+    if names is None:
+        return None
+    mask = 0
+    for name in names:
+        key = str(name).strip().upper()[:3]
+        if key not in WEEKDAY_NAMES:
+            raise ValueError(f"Unknown weekday: {name}")
+        mask |= 1 << WEEKDAY_NAMES.index(key)
+    if not mask:
+        raise ValueError("At least one weekday is required")
+    return None if mask == ALL_DAYS else mask
+
+
+def weekday_names(mask: int | None) -> list[str] | None:
+    if mask is None:
+        return None
+    return [name for i, name in enumerate(WEEKDAY_NAMES) if mask >> i & 1]
+
+
+def window_mask(start: date, end: date) -> int:
+    """
+    Weekdays that occur between start and end (inclusive).
+    """
+    days = (end - start).days + 1
+    if days <= 0:
+        return 0
+    if days >= 7:
+        return ALL_DAYS
+    bits = (1 << days) - 1
+    shift = start.weekday()
+    # Rotate the run of days so it starts on start's weekday
+    return ((bits << shift) | (bits >> (7 - shift))) & ALL_DAYS
+
+
+def bookings_overlap(
+    a_start: date, a_end: date, a_mask: int | None,
+    b_start: date, b_end: date, b_mask: int | None,
+) -> bool:
+    """
+    True when two bookings share at least one day. A None mask books
+    every day of its window. Works on the masks alone: the bookings
+    clash iff they share a weekday that occurs where their windows meet.
+    """
+    start, end = max(a_start, b_start), min(a_end, b_end)
+    if start > end:
+        return False
+    shared = (ALL_DAYS if a_mask is None else a_mask) & (ALL_DAYS if b_mask is None else b_mask)
+    return bool(shared & window_mask(start, end))
+
+
+def iter_booked_dates(start: date, end: date, mask: int | None) -> Iterator[date]:
+    """
+    Lazily expand a booking into the dates it covers.
+    """
+    day = start
+    while day <= end:
+        if mask is None or mask >> day.weekday() & 1:
+            yield day
+        day += timedelta(days=1)
+
+
+def first_shared_date(
+    a_start: date, a_end: date, a_mask: int | None,
+    b_start: date, b_end: date, b_mask: int | None,
+) -> date | None:
+    """
+    Earliest day both bookings cover, or None. At most a week is walked.
+    """
+    if not bookings_overlap(a_start, a_end, a_mask, b_start, b_end, b_mask):
+        return None
+    shared = (ALL_DAYS if a_mask is None else a_mask) & (ALL_DAYS if b_mask is None else b_mask)
+    return next(iter_booked_dates(max(a_start, b_start), min(a_end, b_end), shared))
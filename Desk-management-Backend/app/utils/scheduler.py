@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import and_, exists, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.models.desk_assignments import DeskAssignment
+from app.models.desk_status_history import DeskStatusHistory
+from app.models.desks import Desk
+from app.utils.ids import new_id
+from app.utils.leases import acquire_lease, release_lease
+from app.utils.waitlist import handle_desks_freed
+
+logger = logging.getLogger(__name__)
+
+# Run the desk state jobs inside the API process ("0" leaves them to
+# scripts/run_scheduled_jobs.py, e.g. from cron)
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "1") == "1"
+SCHEDULER_INTERVAL_SECONDS = int(os.getenv("SCHEDULER_INTERVAL_SECONDS", "60"))
+# How long a worker keeps the lease without renewing it; must be longer
+# than the interval so the holder renews before anyone can take over
+SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "180"))
+# Rows per statement and commit
+SCHEDULER_CHUNK_SIZE = int(os.getenv("SCHEDULER_CHUNK_SIZE", "1000"))
+
+LEASE_NAME = "desk-transitions"
+
+
+def _add_history(db: Session, changes: list[tuple[str, str, str, str]], reason: str):
+    """
+    One multi-row INSERT of (desk_id, old_status, new_status, changed_by)
+    status changes.
+    """
+    if not changes:
+        return
+    changed_at = datetime.utcnow()
+    db.execute(
+        insert(DeskStatusHistory),
+        [
+            {
+                "id": new_id(),
+                "desk_id": desk_id,
+                "old_status": old_status,
+                "new_status": new_status,
+                "changed_by": changed_by,
+                "reason": reason,
+                "changed_at": changed_at,
+            }
+            for desk_id, old_status, new_status, changed_by in changes
+        ],
+    )
+
+
+def _set_status(db: Session, desk_ids, status: str):
+    if desk_ids:
+        db.execute(
+            update(Desk)
+            .where(Desk.id.in_(desk_ids))
+            .values(current_status=status)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _has_open_booking(today: date):
+    # Permanent seats stay until an admin releases them, whatever their end_date
+    return (
+        exists()
+        .where(DeskAssignment.desk_id == Desk.id)
+        .where(DeskAssignment.released_date.is_(None))
+        .where(or_(DeskAssignment.assignment_type == "PERMANENT", DeskAssignment.end_date >= today))
+    )
+
+
+def release_expired_assignments(
+    db: Session,
+    today: date | None = None,
+    chunk_size: int = SCHEDULER_CHUNK_SIZE,
+) -> dict:
+    """
+    Close open temporary assignments whose end_date has passed (released
+    on their end_date) and move desks left with no open booking from
+    ASSIGNED to AVAILABLE, with one history row each. Works through the
+    expired rows in chunks, one set-based UPDATE per table and commit per
+    chunk.
+
+    Permanent assignments are left alone: their end_date defaults to the
+    day they were made, so it does not mark the end of the seat.
+    """
+    today = today or date.today()
+    counts = {"released": 0, "desks_available": 0}
+
+    while True:
+        rows = db.execute(
+            select(DeskAssignment.id, DeskAssignment.desk_id, DeskAssignment.assigned_by)
+            .where(DeskAssignment.released_date.is_(None))
+            .where(DeskAssignment.assignment_type == "TEMPORARY")
+            .where(DeskAssignment.end_date < today)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+
+        db.execute(
+            update(DeskAssignment)
+            .where(DeskAssignment.id.in_([row.id for row in rows]))
+            .where(DeskAssignment.released_date.is_(None))
+            .values(released_date=DeskAssignment.end_date)
+            .execution_options(synchronize_session=False)
+        )
+
+        # Whoever made the booking is recorded as making the change
+        released_by = {row.desk_id: row.assigned_by for row in rows}
+        # Locked like lock_desk, so a booking made meanwhile cannot be missed
+        freed = db.execute(
+            select(Desk.id)
+            .where(Desk.id.in_(released_by))
+            .where(Desk.current_status == "ASSIGNED")
+            .where(~_has_open_booking(today))
+            .with_for_update()
+        ).scalars().all()
+        _set_status(db, freed, "AVAILABLE")
+        _add_history(
+            db,
+            [(desk_id, "ASSIGNED", "AVAILABLE", released_by[desk_id]) for desk_id in freed],
+            "Booking ended",
+        )
+        db.commit()
+
+        counts["released"] += len(rows)
+        counts["desks_available"] += len(freed)
+    return counts
+
+
+def restore_finished_maintenance(db: Session, today: date | None = None) -> dict:
+    """
+    Bring MAINTENANCE desks whose expected_resolution_date (from the
+    status change that put them there) has passed back into service:
+    ASSIGNED when they still have open bookings, AVAILABLE otherwise.
+    Desks without a resolution date stay in maintenance.
+    """
+    today = today or date.today()
+
+    latest = (
+        select(DeskStatusHistory.desk_id, func.max(DeskStatusHistory.changed_at).label("changed_at"))
+        .join(Desk, Desk.id == DeskStatusHistory.desk_id)
+        .where(Desk.current_status == "MAINTENANCE")
+        .group_by(DeskStatusHistory.desk_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(DeskStatusHistory.desk_id, DeskStatusHistory.changed_by)
+        .join(
+            latest,
+            and_(
+                DeskStatusHistory.desk_id == latest.c.desk_id,
+                DeskStatusHistory.changed_at == latest.c.changed_at,
+            ),
+        )
+        .where(DeskStatusHistory.new_status == "MAINTENANCE")
+        .where(DeskStatusHistory.expected_resolution_date < today)
+    ).all()
+    changed_by = {row.desk_id: row.changed_by for row in rows}
+    if not changed_by:
+        return {"restored": 0, "available_desk_ids": []}
+
+    desks = db.execute(
+        select(Desk.id, _has_open_booking(today).label("booked"))
+        .where(Desk.id.in_(changed_by))
+        .where(Desk.current_status == "MAINTENANCE")
+        .with_for_update()
+    ).all()
+    assigned = [desk.id for desk in desks if desk.booked]
+    available = [desk.id for desk in desks if not desk.booked]
+    _set_status(db, assigned, "ASSIGNED")
+    _set_status(db, available, "AVAILABLE")
+    _add_history(
+        db,
+        [(desk_id, "MAINTENANCE", "ASSIGNED", changed_by[desk_id]) for desk_id in assigned]
+        + [(desk_id, "MAINTENANCE", "AVAILABLE", changed_by[desk_id]) for desk_id in available],
+        "Maintenance window ended",
+    )
+    db.commit()
+    return {"restored": len(desks), "available_desk_ids": available}
+
+
+class DeskScheduler:
+    """
+    Runs the desk state jobs every SCHEDULER_INTERVAL_SECONDS. Every API
+    worker may run one; the database lease lets only one of them do the
+    work at a time, and the others take over when its lease lapses.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: int = SCHEDULER_INTERVAL_SECONDS,
+        lease_seconds: int = SCHEDULER_LEASE_SECONDS,
+    ):
+        self.interval = interval_seconds
+        self.lease_seconds = lease_seconds
+        self._token = uuid.uuid4().hex[:8]
+        self._task: asyncio.Task | None = None
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_run_at: datetime | None = None
+        self.last_elapsed_ms: float | None = None
+        self.last_results: dict = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def owner(self) -> str:
+        # Read per call: workers forked from a preloading master share the
+        # object (and token) but each has its own pid
+        return f"{socket.gethostname()}:{os.getpid()}:{self._token}"
+
+    def start(self):
+        """
+        Start the periodic loop on the running event loop (call from app startup).
+        """
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            await asyncio.to_thread(self.release)
+        except Exception:
+            logger.exception("Could not release the scheduler lease")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("Scheduled desk jobs failed")
+            await asyncio.sleep(self.interval)
+
+    def run_once(self, today: date | None = None) -> dict | None:
+        """
+        Run every job once if this worker holds (or can take) the lease.
+        Returns the per-job results, or None when another worker holds it.
+        """
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            if not acquire_lease(db, LEASE_NAME, self.owner, self.lease_seconds):
+                with self._lock:
+                    self.skipped += 1
+                return None
+
+            results = {}
+            failed = 0
+            for name, job in (
+                ("release_expired_assignments", release_expired_assignments),
+                ("restore_finished_maintenance", restore_finished_maintenance),
+            ):
+                try:
+                    results[name] = job(db, today)
+                except Exception:
+                    db.rollback()
+                    logger.exception("Scheduled job %s failed", name)
+                    failed += 1
+        finally:
+            db.close()
+
+        # Desks back in service may suit waiting requests
+        restored = results.get("restore_finished_maintenance", {}).pop("available_desk_ids", [])
+        if restored:
+            handle_desks_freed([(desk_id, None, today or date.today(), None) for desk_id in restored])
+
+        with self._lock:
+            self.runs += 1
+            self.failures += failed
+            self.last_run_at = datetime.utcnow()
+            self.last_elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.last_results = results
+        return results
+
+    def release(self):
+        db = SessionLocal()
+        try:
+            release_lease(db, LEASE_NAME, self.owner)
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": SCHEDULER_ENABLED,
+                "running": self.running,
+                "owner": self.owner,
+                "interval_seconds": self.interval,
+                "runs": self.runs,
+                "skipped_lease_held": self.skipped,
+                "failures": self.failures,
+                "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+                "last_elapsed_ms": self.last_elapsed_ms,
+                "last_results": self.last_results,
+            }
+
+
+desk_scheduler = DeskScheduler()
@@ -0,0 +1,300 @@
+import logging
+import os
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.models.departments import Department
+from app.models.desk_assignments import DeskAssignment
+from app.models.desk_requests import DeskRequest
+from app.models.employees import Employee
+from app.utils.auto_assign import auto_assignment_enabled, create_auto_assignment
+from app.utils.desk_utils import lock_desk, overlaps_range
+from app.utils.occupancy import SHIFTS
+from app.utils.recurrence import bookings_overlap
+
+logger = logging.getLogger(__name__)
+
+# A department/shift queue is reloaded from the database when older than
+# this, picking up requests created or resolved by other processes.
+WAITLIST_REFRESH_SECONDS = int(os.getenv("WAITLIST_REFRESH_SECONDS", "300"))
+
+
+class IndexedPriorityQueue:
+    """
+    Binary min-heap of keys ordered by priority, with a key -> heap slot
+    index so any key can be looked up, re-prioritized or removed in
+    O(log n), not just the smallest one.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[tuple, str]] = []
+        self._slot: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot
+
+    def __iter__(self):
+        # Heap order, not priority order; see ordered()
+        return iter([key for _, key in self._heap])
+
+    def push(self, key: str, priority: tuple):
+        """
+        Insert key, or move it if it is already queued.
+        """
+        if key in self._slot:
+            i = self._slot[key]
+            old = self._heap[i][0]
+            self._heap[i] = (priority, key)
+            self._sift_up(i) if priority < old else self._sift_down(i)
+            return
+        self._heap.append((priority, key))
+        self._slot[key] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def remove(self, key: str) -> bool:
+        i = self._slot.pop(key, None)
+        if i is None:
+            return False
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._slot[last[1]] = i
+            self._sift_up(i)
+            self._sift_down(self._slot[last[1]])
+        return True
+
+    def peek(self) -> str | None:
+        return self._heap[0][1] if self._heap else None
+
+    def pop(self) -> str | None:
+        key = self.peek()
+        if key is not None:
+            self.remove(key)
+        return key
+
+    def ordered(self, keys) -> list[str]:
+        """
+        The given queued keys in priority order.
+        """
+        return [key for _, key in sorted(self._heap[self._slot[k]] for k in keys if k in self._slot)]
+
+    def _swap(self, i: int, j: int):
+        self._heap[i], self._heap[j] = self._heap[j], self._heap[i]
+        self._slot[self._heap[i][1]] = i
+        self._slot[self._heap[j][1]] = j
+
+    def _sift_up(self, i: int):
+        while i > 0:
+            parent = (i - 1) // 2
+            if self._heap[i][0] >= self._heap[parent][0]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        n = len(self._heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and self._heap[child][0] < self._heap[smallest][0]:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+
+
+class Waitlist:
+    """
+    PENDING desk requests per (department, shift), oldest first. Each
+    queue keeps the request windows next to it, so a freed desk only
+    looks at requests overlapping the freed dates.
+
+    Queues are loaded from the database on first use and refreshed every
+    WAITLIST_REFRESH_SECONDS; entries resolved elsewhere are dropped when
+    a match finds them no longer PENDING.
+    """
+
+    def __init__(self, refresh_seconds: int = WAITLIST_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._queues: dict[tuple[str, str], IndexedPriorityQueue] = {}
+        self._loaded_at: dict[tuple[str, str], float] = {}
+        self._windows: dict[str, tuple[date, date]] = {}
+        self._lock = threading.Lock()
+        self.events = 0
+        self.matched = 0
+        self.dropped = 0
+
+    def add(self, desk_request: DeskRequest):
+        key = (desk_request.department_id, desk_request.shift)
+        with self._lock:
+            # Unloaded queues pick the request up when they load
+            if key in self._queues:
+                self._push(self._queues[key], desk_request.id, desk_request.created_at,
+                           desk_request.from_date, desk_request.to_date)
+
+    def discard(self, department_id: str, shift: str, request_ids):
+        with self._lock:
+            queue = self._queues.get((department_id, shift))
+            for request_id in request_ids:
+                if queue is not None and queue.remove(request_id):
+                    self._windows.pop(request_id, None)
+
+    def candidates(self, db: Session, department_id: str, shift: str, start: date, end: date | None) -> list[str]:
+        """
+        Ids of queued requests whose dates overlap start..end (open-ended
+        when end is None), oldest first. Requests already over are dropped.
+        """
+        key = (department_id, shift)
+        with self._lock:
+            loaded_at = self._loaded_at.get(key)
+        if loaded_at is None or time.monotonic() - loaded_at > self.refresh_seconds:
+            self._load(db, department_id, shift)
+
+        today = date.today()
+        with self._lock:
+            queue = self._queues[key]
+            over, hits = [], []
+            for request_id in queue:
+                first, last = self._windows[request_id]
+                if last < today:
+                    over.append(request_id)
+                elif last >= start and (end is None or first <= end):
+                    hits.append(request_id)
+            for request_id in over:
+                queue.remove(request_id)
+                self._windows.pop(request_id, None)
+            return queue.ordered(hits)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queues": len(self._queues),
+                "waiting": sum(len(q) for q in self._queues.values()),
+                "events": self.events,
+                "matched": self.matched,
+                "dropped": self.dropped,
+            }
+
+    def _load(self, db: Session, department_id: str, shift: str):
+        rows = db.execute(
+            select(DeskRequest.id, DeskRequest.created_at, DeskRequest.from_date, DeskRequest.to_date)
+            .where(DeskRequest.status == "PENDING")
+            .where(DeskRequest.department_id == department_id)
+            .where(DeskRequest.shift == shift)
+            .where(DeskRequest.to_date >= date.today())
+        ).all()
+        queue = IndexedPriorityQueue()
+        with self._lock:
+            old = self._queues.get((department_id, shift))
+            for request_id in (old or ()):
+                self._windows.pop(request_id, None)
+            for row in rows:
+                self._push(queue, row.id, row.created_at, row.from_date, row.to_date)
+            self._queues[department_id, shift] = queue
+            self._loaded_at[department_id, shift] = time.monotonic()
+
+    def _push(self, queue: IndexedPriorityQueue, request_id: str, created_at, first: date, last: date):
+        queue.push(request_id, (created_at.isoformat() if created_at else "", request_id))
+        self._windows[request_id] = (first, last)
+
+
+waitlist = Waitlist()
+
+
+def fill_freed_desk(db: Session, desk_id: str, shift: str, start: date, end: date | None) -> list[tuple[str, str]]:
+    """
+    Give a desk whose shift just freed up between start and end (None:
+    open-ended) to the oldest waiting requests that now fit on it. Only
+    requests of the desk's department overlapping those dates are
+    considered, and only this desk's bookings are read. The caller
+    commits; returns the (department_id, request_id) pairs assigned.
+    """
+    desk = lock_desk(db, desk_id)
+    if desk is None or desk.current_status in ("MAINTENANCE", "INACTIVE") or not desk.department_id:
+        return []
+    department = db.get(Department, desk.department_id)
+    # Same rule as auto-assignment: the department's desks on its floor
+    if department is None or desk.floor_id != department.floor_id:
+        return []
+    if not auto_assignment_enabled(db):
+        return []
+
+    start = max(start, date.today())
+    request_ids = waitlist.candidates(db, department.id, shift, start, end)
+    if not request_ids:
+        return []
+
+    rows = (
+        db.query(DeskRequest, Employee.user_id)
+        .join(Employee, DeskRequest.employee_id == Employee.id)
+        .filter(DeskRequest.id.in_(request_ids))
+        .filter(DeskRequest.status == "PENDING")
+        .with_for_update()
+        .all()
+    )
+    pending = {desk_request.id: (desk_request, user_id) for desk_request, user_id in rows}
+    stale = [request_id for request_id in request_ids if request_id not in pending]
+    if stale:
+        waitlist.discard(department.id, shift, stale)
+        waitlist.dropped += len(stale)
+    if not pending:
+        return []
+
+    first = min(r.from_date for r, _ in pending.values())
+    last = max(r.to_date for r, _ in pending.values())
+    bookings = db.execute(
+        select(DeskAssignment.start_date, DeskAssignment.end_date, DeskAssignment.weekdays)
+        .where(DeskAssignment.desk_id == desk.id)
+        .where(DeskAssignment.shift == shift)
+        .where(DeskAssignment.released_date.is_(None))
+        .where(overlaps_range(first, last))
+        .with_for_update()
+    ).all()
+    bookings = [tuple(row) for row in bookings]
+
+    assigned = []
+    for request_id in request_ids:
+        if request_id not in pending:
+            continue
+        desk_request, user_id = pending[request_id]
+        window = (desk_request.from_date, desk_request.to_date)
+        if any(bookings_overlap(*window, None, s, e, w) for s, e, w in bookings):
+            continue
+        create_auto_assignment(db, desk_request, desk, user_id)
+        bookings.append((*window, None))
+        assigned.append((department.id, request_id))
+    return assigned
+
+
+def handle_desks_freed(events: list[tuple[str, str | None, date, date | None]]):
+    """
+    Run waitlist matching for (desk_id, shift or None for both, start,
+    end or None) events after the transaction that freed them commits;
+    meant for FastAPI BackgroundTasks. Each desk commits on its own.
+    """
+    db = SessionLocal()
+    try:
+        for desk_id, shift, start, end in events:
+            waitlist.events += 1
+            for one_shift in (shift,) if shift else SHIFTS:
+                try:
+                    assigned = fill_freed_desk(db, desk_id, one_shift, start, end)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    logger.exception("Waitlist matching failed for desk %s", desk_id)
+                    continue
+                for department_id, request_id in assigned:
+                    waitlist.discard(department_id, one_shift, [request_id])
+                waitlist.matched += len(assigned)
+    finally:
+        db.close()
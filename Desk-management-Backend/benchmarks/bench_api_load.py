@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""In-process load and latency benchmark for the main API endpoints.
+
+Seeds a synthetic database (desks, employees and several years of
+assignments and desk requests), then drives the ASGI app in-process with
+concurrent clients against:
+
+  GET  /desks/               paged desk listing
+  GET  /assignments/         paged assignment history, random date windows
+  GET  /desk-requests/       admin request queue
+  POST /desks/assign-desk    admin bookings on future dates
+  POST /auth/login           bcrypt password check + token issue
+
+and reports throughput and p50/p95/p99 latency per endpoint as JSON.
+
+Usage:
+  # from Desk-management-Backend dir
+  python3 benchmarks/bench_api_load.py --output before.json
+  python3 benchmarks/bench_api_load.py --compare before.json
+
+With --compare the run exits non-zero when any endpoint's p95 latency or
+throughput regresses by more than --max-regression (default 20%).
+Uses a temporary SQLite file by default; set BENCH_DATABASE_URL to use
+another database (it is dropped and re-seeded).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from common import (
+    bench_database_url,
+    configure_engine,
+    seed_dataset,
+    summarize,
+    use_database,
+)
+
+BENCH_DATABASE_URL = bench_database_url("api_load")
+use_database(BENCH_DATABASE_URL)
+# Every login comes from one client; keep the auth rate limiter out of the way
+os.environ.setdefault("AUTH_RATE_IP_PER_MINUTE", "100000000")
+os.environ.setdefault("AUTH_RATE_EMAIL_PER_MINUTE", "100000000")
+
+import httpx
+
+from app.main import app
+from app.utils.jwt import create_access_token
+
+SCENARIOS = ["desks", "assignments", "desk_requests", "assign_desk", "login"]
+
+
+def build_request(name, data, admin_token, rng):
+    """
+    (method, path, params, json body, headers) for one call of a scenario.
+    """
+    auth = {"Authorization": f"Bearer {admin_token}"}
+    today = date.today()
+
+    if name == "desks":
+        pages = max(1, len(data["desk_ids"]) // 50)
+        return "GET", "/desks/", {"page": rng.randint(1, pages), "size": 50}, None, auth
+
+    if name == "assignments":
+        start = today - timedelta(days=rng.randint(0, 365 * data["years"]))
+        params = {
+            "from_date": str(start),
+            "to_date": str(start + timedelta(days=30)),
+            "page": rng.randint(1, 5),
+            "size": 50,
+        }
+        return "GET", "/assignments/", params, None, auth
+
+    if name == "desk_requests":
+        params = {"status": rng.choice(["PENDING", "APPROVED"]), "limit": 100}
+        return "GET", "/desk-requests/", params, None, auth
+
+    if name == "assign_desk":
+        start = today + timedelta(days=rng.randint(1, 90))
+        body = {
+            "desk_id": rng.choice(data["desk_ids"]),
+            "employee_id": rng.choice(data["employee_ids"]),
+            "assignment_type": "TEMPORARY",
+            "date": str(start),
+            "end_date": str(start + timedelta(days=rng.randint(0, 3))),
+            "shift": rng.choice(["MORNING", "NIGHT"]),
+        }
+        return "POST", "/desks/assign-desk", None, body, auth
+
+    if name == "login":
+        body = {"email": rng.choice(data["employee_emails"]), "password": data["password"]}
+        return "POST", "/auth/login", None, body, {}
+
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+async def run_scenario(client, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = defaultdict(int)
+
+    async def one(method, path, params, body, headers):
+        async with semaphore:
+            t0 = time.perf_counter()
+            resp = await client.request(method, path, params=params, json=body, headers=headers)
+            latencies.append(time.perf_counter() - t0)
+            statuses[resp.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(*call) for call in calls))
+    return time.perf_counter() - start, latencies, dict(statuses)
+
+
+async def run_all(args, data, admin_token):
+    rng = random.Random(args.seed)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name in args.scenarios:
+            count = args.login_requests if name == "login" else args.requests
+            warmup = [build_request(name, data, admin_token, rng) for _ in range(args.warmup)]
+            await run_scenario(client, warmup, args.concurrency)
+
+            calls = [build_request(name, data, admin_token, rng) for _ in range(count)]
+            elapsed, latencies, statuses = await run_scenario(client, calls, args.concurrency)
+            results[name] = summarize(latencies, elapsed, statuses)
+            print(
+                f"{name:<14} {results[name]['requests_per_s']:>8} req/s  "
+                f"p50 {results[name]['p50_ms']:>8} ms  p95 {results[name]['p95_ms']:>8} ms  "
+                f"p99 {results[name]['p99_ms']:>8} ms",
+                file=sys.stderr,
+            )
+
+    return results
+
+
+def compare(results, baseline, max_regression):
+    """
+    Print per-endpoint deltas against a previous run.
+    Returns the names of endpoints that regressed beyond max_regression.
+    """
+    regressed = []
+    print(f"\n{'endpoint':<14} {'p95 before':>11} {'p95 now':>9} {'delta':>8} "
+          f"{'rps before':>11} {'rps now':>9} {'delta':>8}")
+    for name, now in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before.get("requests"):
+            print(f"{name:<14} (not in baseline)")
+            continue
+        p95_delta = now["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        rps_delta = now["requests_per_s"] / before["requests_per_s"] - 1
+        print(f"{name:<14} {before['p95_ms']:>11} {now['p95_ms']:>9} {p95_delta:>+8.1%} "
+              f"{before['requests_per_s']:>11} {now['requests_per_s']:>9} {rps_delta:>+8.1%}")
+        if p95_delta > max_regression or rps_delta < -max_regression:
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--floors", type=int, default=5)
+    parser.add_argument("--desks-per-floor", type=int, default=100)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--assignments", type=int, default=100000)
+    parser.add_argument("--desk-requests", type=int, default=20000)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint")
+    parser.add_argument("--login-requests", type=int, default=100,
+                        help="Requests for /auth/login (bcrypt bound)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--compare", help="Previous --output file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.20)
+    args = parser.parse_args()
+
+    engine = configure_engine(BENCH_DATABASE_URL)
+    print(f"Database: {BENCH_DATABASE_URL}", file=sys.stderr)
+
+    t0 = time.perf_counter()
+    data = seed_dataset(
+        engine,
+        floors=args.floors,
+        desks_per_floor=args.desks_per_floor,
+        employees=args.employees,
+        assignments=args.assignments,
+        desk_requests=args.desk_requests,
+        years=args.years,
+        seed=args.seed,
+    )
+    data["years"] = args.years
+    print(f"Seeded in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+
+    admin_token = create_access_token(
+        {"user_id": data["admin_id"], "role": "ADMIN", "full_name": "Bench Admin"}
+    )
+    results = asyncio.run(run_all(args, data, admin_token))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "concurrency": args.concurrency,
+            "dataset": {
+                "desks": len(data["desk_ids"]),
+                "employees": args.employees,
+                "assignments": args.assignments,
+                "desk_requests": args.desk_requests,
+                "years": args.years,
+            },
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        regressed = compare(results, baseline, args.max_regression)
+        if regressed:
+            print(f"\nRegressed beyond {args.max_regression:.0%}: {', '.join(regressed)}")
+            sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
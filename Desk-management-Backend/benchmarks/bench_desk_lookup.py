@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark by-number desk lookups on a large desks table.
+
+Compares the legacy lookup (String(50) desk_number compared against an
+int, as update_desk_status_by_number used to do) with the string-typed
+lookup and the integer desk_key index used by get_desk_by_number.
+
+Usage:
+  # from Desk-management-Backend dir
+  python3 benchmarks/bench_desk_lookup.py --desks 50000 --lookups 5000
+
+Set BENCH_DATABASE_URL to run against a scratch MySQL database instead of a
+temporary SQLite file (its desks table is dropped and recreated).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+_TMP_DB = os.path.join(tempfile.gettempdir(), "desk_bench_lookup.db")
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{_TMP_DB}")
+os.environ["DATABASE_URL"] = BENCH_DATABASE_URL
+
+# ensure package import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+
+from app.database import database as dbmod
+from app.models.desks import Desk
+from app.utils.desk_utils import desk_number_fields, get_desk_by_number
+
+BATCH_SIZE = 5000
+
+
+def build_desks(count):
+    engine = dbmod.engine
+    engine.echo = False
+    Desk.__table__.drop(bind=engine, checkfirst=True)
+    Desk.__table__.create(bind=engine)
+
+    numbers = []
+    rows = []
+    with engine.begin() as conn:
+        # Floors of 1000 desks each: 1000..1999 -> floor 1, etc.
+        for i in range(count):
+            floor = i // 1000 + 1
+            number = floor * 1000 + i % 1000
+            numbers.append(number)
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "desk_number": str(number),
+                "floor": floor,
+                "current_status": "AVAILABLE",
+                **desk_number_fields(number),
+            })
+            if len(rows) >= BATCH_SIZE:
+                conn.execute(Desk.__table__.insert(), rows)
+                rows = []
+        if rows:
+            conn.execute(Desk.__table__.insert(), rows)
+        if engine.name == "sqlite":
+            conn.execute(text("ANALYZE"))
+    return numbers
+
+
+def time_lookups(name, lookup, numbers):
+    db = dbmod.SessionLocal()
+    try:
+        # Warm up caches and compiled statements
+        for n in numbers[:50]:
+            lookup(db, n)
+        start = time.perf_counter()
+        found = 0
+        for n in numbers:
+            if lookup(db, n) is not None:
+                found += 1
+            db.expunge_all()
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+    return {
+        "strategy": name,
+        "lookups": len(numbers),
+        "found": found,
+        "total_s": round(elapsed, 4),
+        "avg_us": round(elapsed / len(numbers) * 1e6, 1),
+        "ops_per_s": round(len(numbers) / elapsed, 1),
+    }
+
+
+def legacy_int_compare(db, n):
+    return db.query(Desk).filter(Desk.desk_number == n).first()
+
+
+def string_compare(db, n):
+    return db.query(Desk).filter(Desk.desk_number == str(n)).first()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--desks", type=int, default=50000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    print(f"Database: {BENCH_DATABASE_URL}", file=sys.stderr)
+    print(f"Building {args.desks} desks...", file=sys.stderr)
+    numbers = build_desks(args.desks)
+
+    rng = random.Random(args.seed)
+    sample = [rng.choice(numbers) for _ in range(args.lookups)]
+
+    results = [
+        time_lookups("legacy_int_vs_string", legacy_int_compare, sample),
+        time_lookups("string_desk_number", string_compare, sample),
+        time_lookups("int_desk_key", get_desk_by_number, sample),
+    ]
+
+    if args.json:
+        print(json.dumps({"desks": args.desks, "results": results}, indent=2))
+        return
+
+    for r in results:
+        print(
+            f"{r['strategy']:<24} {r['avg_us']:>10.1f} us/lookup "
+            f"{r['ops_per_s']:>10.1f} ops/s  ({r['found']}/{r['lookups']} found)"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the desk_utils availability helpers.
+
+Times desk_has_conflict, find_available_desk_for_range and
+extract_floor_and_index over a grid of desk counts, booking densities and
+requested date-range lengths, so the cost of auto-assignment can be read
+off as the office fills up.
+
+Density is the share of (desk, shift, day) slots in the booking horizon
+that already hold an assignment.
+
+Usage:
+  # from Desk-management-Backend dir
+  python3 benchmarks/bench_desk_utils.py --desks 100 1000 --density 0.2 0.8
+  python3 benchmarks/bench_desk_utils.py --save-baseline   # after a change you trust
+  python3 benchmarks/bench_desk_utils.py --check           # exits 2 on regression
+
+The baseline lives in benchmarks/baselines/desk_utils.json. Timings only
+compare meaningfully on the same machine, so refresh it with
+--save-baseline when moving hosts. The baseline also records a hash of
+app/utils/desk_utils.py and recurrence.py; --check refuses to compare
+against a baseline taken from other code, so any commit changing them
+must refresh it too. Set BENCH_DATABASE_URL to run against a scratch
+database instead of a temporary SQLite file.
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+from common import bench_database_url, configure_engine, percentile, use_database
+
+BENCH_DATABASE_URL = bench_database_url("desk_utils")
+use_database(BENCH_DATABASE_URL)
+
+from app.database import database as dbmod
+from app.models import Department, Desk, DeskAssignment, Employee, Floor, User
+from app.utils import desk_utils, recurrence
+from app.utils.desk_utils import (
+    desk_has_conflict,
+    desk_number_fields,
+    extract_floor_and_index,
+    find_available_desk_for_range,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "desk_utils.json")
+HORIZON_DAYS = 120
+BATCH_SIZE = 5000
+# Differences smaller than this are timer noise, whatever the percentage
+MIN_DELTA_US = 1.0
+
+
+def code_fingerprint() -> str:
+    """
+    Hash of the source of the benchmarked modules. Stored with the
+    baseline so --check can tell when it was recorded against other code.
+    """
+    digest = hashlib.sha256()
+    for module in (desk_utils, recurrence):
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()[:16]
+
+
+def build_case(engine, desks, density, rng):
+    """
+    Fresh schema with `desks` desks and back-to-back bookings on each
+    (desk, shift) timeline until `density` of the horizon is covered.
+    """
+    dbmod.Base.metadata.drop_all(bind=engine)
+    dbmod.Base.metadata.create_all(bind=engine)
+
+    floor_id, dept_id = str(uuid.uuid4()), str(uuid.uuid4())
+    user_id, employee_id = str(uuid.uuid4()), str(uuid.uuid4())
+    desk_rows, assignment_rows = [], []
+    today = date.today()
+
+    for i in range(desks):
+        number = (i // 1000 + 1) * 1000 + i % 1000
+        desk_id = str(uuid.uuid4())
+        desk_rows.append({
+            "id": desk_id,
+            "desk_number": str(number),
+            "floor": number // 1000,
+            "floor_id": floor_id,
+            "department_id": dept_id,
+            "current_status": "AVAILABLE",
+            **desk_number_fields(number),
+        })
+        for shift in ("MORNING", "NIGHT"):
+            day = 0
+            while day < HORIZON_DAYS:
+                length = rng.randint(1, 7)
+                if rng.random() < density:
+                    start = today + timedelta(days=day)
+                    assignment_rows.append({
+                        "id": str(uuid.uuid4()),
+                        "desk_id": desk_id,
+                        "employee_id": employee_id,
+                        "assigned_by": user_id,
+                        "assigned_date": start,
+                        "assignment_type": "TEMPORARY",
+                        "shift": shift,
+                        "start_date": start,
+                        "end_date": start + timedelta(days=length - 1),
+                        "is_auto_assigned": False,
+                    })
+                day += length
+
+    with engine.begin() as conn:
+        conn.execute(Floor.__table__.insert(), [{"id": floor_id, "name": "Floor 1", "number": 1}])
+        conn.execute(Department.__table__.insert(), [
+            {"id": dept_id, "name": "Bench", "floor_id": floor_id}
+        ])
+        conn.execute(User.__table__.insert(), [{
+            "id": user_id, "email": "bench@example.com", "password_hash": "-",
+            "full_name": "Bench", "role": "ADMIN",
+        }])
+        conn.execute(Employee.__table__.insert(), [{
+            "id": employee_id, "employee_code": "BENCH-0", "name": "Bench",
+            "department": "Bench", "department_id": dept_id, "user_id": user_id,
+        }])
+        for table, rows in ((Desk.__table__, desk_rows), (DeskAssignment.__table__, assignment_rows)):
+            for i in range(0, len(rows), BATCH_SIZE):
+                conn.execute(table.insert(), rows[i:i + BATCH_SIZE])
+
+    return len(assignment_rows)
+
+
+def timed(fn, calls):
+    """
+    Run fn(i) for each call index; returns per-call timings (seconds)
+    and the results.
+    """
+    timings, results = [], []
+    for i in range(calls):
+        t0 = time.perf_counter()
+        results.append(fn(i))
+        timings.append(time.perf_counter() - t0)
+    return timings, results
+
+
+def stats_us(timings) -> dict:
+    return {
+        "mean_us": round(sum(timings) / len(timings) * 1e6, 1),
+        "p50_us": round(percentile(timings, 50) * 1e6, 1),
+        "p95_us": round(percentile(timings, 95) * 1e6, 1),
+    }
+
+
+def bench_case(engine, desks, density, range_days, calls, rng) -> dict:
+    today = date.today()
+    db = dbmod.SessionLocal(bind=engine)
+    try:
+        candidates = db.query(Desk).all()
+        order = {d.id: i for i, d in enumerate(sorted(candidates, key=lambda d: d.desk_number))}
+        queries = []
+        for _ in range(calls):
+            start = today + timedelta(days=rng.randint(0, HORIZON_DAYS - range_days))
+            queries.append((
+                rng.choice(candidates).id,
+                rng.choice(["MORNING", "NIGHT"]),
+                start,
+                start + timedelta(days=range_days - 1),
+            ))
+
+        conflict_t, conflicts = timed(
+            lambda i: desk_has_conflict(db, *queries[i]), calls
+        )
+        find_t, found = timed(
+            lambda i: find_available_desk_for_range(db, candidates, *queries[i][1:]),
+            calls,
+        )
+    finally:
+        db.close()
+
+    # Desks examined per search: position of the hit, or all of them
+    scanned = [order[d.id] + 1 if d else len(candidates) for d in found]
+    return {
+        "desk_has_conflict": {
+            **stats_us(conflict_t),
+            "conflict_rate": round(sum(conflicts) / calls, 3),
+        },
+        "find_available_desk_for_range": {
+            **stats_us(find_t),
+            "mean_desks_scanned": round(sum(scanned) / calls, 1),
+            "miss_rate": round(found.count(None) / calls, 3),
+        },
+    }
+
+
+def bench_extract(calls, rng) -> dict:
+    numbers = [rng.choice([rng.randint(100, 999), rng.randint(1000, 9999)]) for _ in range(calls)]
+    as_str = [str(n) for n in numbers]
+    int_t, _ = timed(lambda i: extract_floor_and_index(numbers[i]), calls)
+    str_t, _ = timed(lambda i: extract_floor_and_index(as_str[i]), calls)
+    return {"int": stats_us(int_t), "str": stats_us(str_t)}
+
+
+def check(results, baseline, max_regression) -> list[str]:
+    """
+    Compare p50 timings case by case; returns the regressed metrics.
+    """
+    regressed = []
+    for case, functions in results.items():
+        for fn, now in functions.items():
+            before = baseline.get("results", {}).get(case, {}).get(fn)
+            if not before:
+                continue
+            delta = now["p50_us"] / before["p50_us"] - 1 if before["p50_us"] else 0.0
+            slower = now["p50_us"] - before["p50_us"] > MIN_DELTA_US
+            flag = "  REGRESSED" if slower and delta > max_regression else ""
+            print(f"{case:<36} {fn:<30} {before['p50_us']:>10} -> {now['p50_us']:>10} us "
+                  f"({delta:+.1%}){flag}")
+            if flag:
+                regressed.append(f"{case} {fn}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--desks", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--density", type=float, nargs="+", default=[0.2, 0.8])
+    parser.add_argument("--range-days", type=int, nargs="+", default=[1, 7, 30])
+    parser.add_argument("--calls", type=int, default=100, help="Timed calls per function and case")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to --baseline")
+    parser.add_argument("--check", action="store_true", help="Compare against --baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    engine = configure_engine(BENCH_DATABASE_URL)
+    print(f"Database: {BENCH_DATABASE_URL}", file=sys.stderr)
+
+    results = {}
+    for desks in args.desks:
+        for density in args.density:
+            assignments = build_case(engine, desks, density, rng)
+            print(f"desks={desks} density={density}: {assignments} assignments", file=sys.stderr)
+            for range_days in args.range_days:
+                case = f"desks={desks},density={density},range={range_days}"
+                results[case] = bench_case(engine, desks, density, range_days, args.calls, rng)
+    results["extract_floor_and_index"] = bench_extract(args.calls * 50, rng)
+
+    report = {
+        "meta": {
+            "database": engine.dialect.name,
+            "calls": args.calls,
+            "horizon_days": HORIZON_DAYS,
+            "code": code_fingerprint(),
+        },
+        "results": results,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for case, functions in results.items():
+            for fn, metrics in functions.items():
+                print(f"{case:<36} {fn:<30} p50 {metrics['p50_us']:>10} us  "
+                      f"p95 {metrics['p95_us']:>10} us")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+
+    if args.check:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        if baseline.get("meta", {}).get("code") != code_fingerprint():
+            print("Baseline was recorded against different desk_utils/recurrence code; "
+                  "refresh it with --save-baseline in the commit that changes them")
+            sys.exit(2)
+        regressed = check(results, baseline, args.max_regression)
+        if regressed:
+            print(f"\n{len(regressed)} metric(s) regressed beyond {args.max_regression:.0%}")
+            sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Insert-throughput benchmark for UUID key layouts.
+
+Appends rows shaped like desk_assignments / desk_status_history to tables
+that differ only in key layout:
+
+  string_uuid4   String(36) keys, random uuid4 (original layout)
+  string_uuid7   String(36) keys, time-ordered uuid7
+  binary_uuid7   BINARY(16) keys, time-ordered uuid7
+
+Usage:
+  # from Desk-management-Backend dir
+  python3 benchmarks/bench_id_layouts.py --rows 200000 --batch 1000
+
+Page-split effects are an InnoDB property; set BENCH_DATABASE_URL to a
+scratch MySQL database to see them (SQLite shows only the smaller keys).
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime
+
+_TMP_DB = os.path.join(tempfile.gettempdir(), "desk_bench_ids.db")
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{_TMP_DB}")
+
+# ensure package import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Index,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    text,
+)
+
+from app.database.types import UUIDBinary
+from app.utils.ids import uuid7
+
+LAYOUTS = {
+    "string_uuid4": (lambda: String(36), lambda: str(uuid.uuid4())),
+    "string_uuid7": (lambda: String(36), lambda: str(uuid7())),
+    "binary_uuid7": (UUIDBinary, lambda: str(uuid7())),
+}
+
+
+def make_table(metadata, name, id_type):
+    return Table(
+        name,
+        metadata,
+        Column("id", id_type(), primary_key=True),
+        Column("desk_id", id_type(), nullable=False),
+        Column("employee_id", id_type(), nullable=False),
+        Column("shift", String(10), nullable=False),
+        Column("start_date", Date, nullable=False),
+        Column("end_date", Date, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Index(f"ix_{name}_desk", "desk_id"),
+    )
+
+
+def table_size(conn, engine, name):
+    if engine.name == "mysql":
+        row = conn.execute(
+            text(
+                "SELECT data_length + index_length FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = :name"
+            ),
+            {"name": name},
+        ).first()
+        return int(row[0]) if row else None
+    if engine.name == "sqlite":
+        try:
+            row = conn.execute(
+                text(
+                    # Table, its indexes and the implicit PK autoindex
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name LIKE :pattern"
+                ),
+                {"pattern": f"%{name}%"},
+            ).first()
+        except Exception:
+            # dbstat is an optional SQLite build flag
+            return None
+        return int(row[0]) if row and row[0] else None
+    return None
+
+
+def run_layout(engine, name, rows, batch):
+    id_type, make_id = LAYOUTS[name]
+    metadata = MetaData()
+    table = make_table(metadata, f"bench_ids_{name}", id_type)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    # A small pool of parent ids, as real FKs repeat heavily
+    desk_ids = [make_id() for _ in range(500)]
+    employee_ids = [make_id() for _ in range(2000)]
+    today = date.today()
+    now = datetime.utcnow()
+
+    start = time.perf_counter()
+    inserted = 0
+    with engine.begin() as conn:
+        while inserted < rows:
+            n = min(batch, rows - inserted)
+            conn.execute(table.insert(), [
+                {
+                    "id": make_id(),
+                    "desk_id": desk_ids[(inserted + i) % len(desk_ids)],
+                    "employee_id": employee_ids[(inserted + i) % len(employee_ids)],
+                    "shift": "MORNING",
+                    "start_date": today,
+                    "end_date": today,
+                    "created_at": now,
+                }
+                for i in range(n)
+            ])
+            inserted += n
+        elapsed = time.perf_counter() - start
+        size = table_size(conn, engine, table.name)
+
+    metadata.drop_all(engine)
+    return {
+        "layout": name,
+        "rows": rows,
+        "total_s": round(elapsed, 3),
+        "rows_per_s": round(rows / elapsed, 1),
+        "table_bytes": size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    engine = create_engine(BENCH_DATABASE_URL)
+    print(f"Database: {BENCH_DATABASE_URL}", file=sys.stderr)
+
+    results = [run_layout(engine, name, args.rows, args.batch) for name in LAYOUTS]
+
+    if args.json:
+        print(json.dumps({"results": results}, indent=2))
+        return
+
+    for r in results:
+        size = f"{r['table_bytes']} bytes" if r["table_bytes"] is not None else "n/a"
+        print(
+            f"{r['layout']:<14} {r['rows_per_s']:>12.1f} rows/s "
+            f"{r['total_s']:>8.3f} s  size: {size}"
+        )
+
+
+if __name__ == '__main__':
+    main()
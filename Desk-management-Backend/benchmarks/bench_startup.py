@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Measure API worker cold start: imports, startup hooks, first request.
+
+Every run is a fresh interpreter, like a worker being (re)spawned. For each
+STARTUP_SCHEMA_MODE it reports the time to import app.main, to run the
+startup hooks, to serve the first request, and the whole process including
+interpreter start, plus whether passlib, jose or numpy got imported before
+any request needed them.
+
+Usage:
+  # from Desk-management-Backend dir
+  python3 benchmarks/bench_startup.py --runs 10
+  python3 benchmarks/bench_startup.py --save-baseline   # after a change you trust
+  python3 benchmarks/bench_startup.py --check           # exits 2 on regression
+
+The baseline lives in benchmarks/baselines/startup.json; refresh it when
+moving hosts. Set BENCH_DATABASE_URL to start against a scratch database
+that is already at `alembic upgrade head` instead of a temporary SQLite file.
+The background scheduler is disabled in the measured workers.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import bench_database_url, percentile, use_database
+
+BENCH_DATABASE_URL = bench_database_url("startup")
+use_database(BENCH_DATABASE_URL)
+
+from sqlalchemy import text
+
+from app.database import database as dbmod
+from app.database.schema import migration_heads, prepare_schema
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "startup.json")
+METRICS = ("import_ms", "startup_ms", "first_request_ms", "process_ms")
+
+# Runs inside each measured worker; prints one JSON line
+WORKER = """
+import json, logging, sys, time
+t0 = time.perf_counter()
+import app.main
+from app.database import database
+t1 = time.perf_counter()
+database.engine.echo = False
+logging.disable(logging.CRITICAL)
+from fastapi.testclient import TestClient
+client = TestClient(app.main.app)
+t2 = time.perf_counter()
+client.__enter__()
+t3 = time.perf_counter()
+client.get("/")
+t4 = time.perf_counter()
+client.__exit__(None, None, None)
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t3 - t2) * 1000,
+    "first_request_ms": (t4 - t3) * 1000,
+    "lazy_loaded": sorted(m for m in ("passlib", "jose", "numpy") if m in sys.modules),
+}))
+"""
+
+
+def prepare_database():
+    """
+    Tables plus an alembic_version stamp at the newest migration, so both
+    create_all and check have a ready database to start against.
+    """
+    engine = dbmod.engine
+    engine.echo = False
+    if not BENCH_DATABASE_URL.startswith("sqlite"):
+        return
+    prepare_schema(engine, "create_all")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        conn.execute(text("DELETE FROM alembic_version"))
+        for head in migration_heads():
+            conn.execute(text("INSERT INTO alembic_version VALUES (:v)"), {"v": head})
+
+
+def run_worker(mode: str) -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": BENCH_DATABASE_URL,
+        "STARTUP_SCHEMA_MODE": mode,
+        "SCHEDULER_ENABLED": "0",
+        "PYTHONPATH": ROOT,
+    }
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", WORKER],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def summarize(runs: list[dict]) -> dict:
+    summary = {}
+    for metric in METRICS:
+        values = [run[metric] for run in runs]
+        summary[metric] = {
+            "p50": round(percentile(values, 50), 1),
+            "min": round(min(values), 1),
+            "max": round(max(values), 1),
+        }
+    summary["lazy_loaded_at_startup"] = sorted({m for run in runs for m in run["lazy_loaded"]})
+    return summary
+
+
+def check(results, baseline, max_regression) -> list[str]:
+    """
+    Compare p50 timings per mode; returns the regressed metrics.
+    """
+    regressed = []
+    for mode, metrics in results.items():
+        for metric in METRICS:
+            before = baseline.get("results", {}).get(mode, {}).get(metric, {}).get("p50")
+            if not before:
+                continue
+            now = metrics[metric]["p50"]
+            delta = now / before - 1
+            flag = "  REGRESSED" if delta > max_regression else ""
+            print(f"{mode:<12} {metric:<18} {before:>8} -> {now:>8} ms ({delta:+.1%}){flag}")
+            if flag:
+                regressed.append(f"{mode} {metric}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh workers per mode")
+    parser.add_argument("--modes", nargs="+", default=["create_all", "check"])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to --baseline")
+    parser.add_argument("--check", action="store_true", help="Compare against --baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    prepare_database()
+    print(f"Database: {BENCH_DATABASE_URL}", file=sys.stderr)
+
+    results = {}
+    for mode in args.modes:
+        run_worker(mode)  # warm the OS file cache and .pyc files
+        results[mode] = summarize([run_worker(mode) for _ in range(args.runs)])
+
+    report = {"meta": {"database": dbmod.engine.dialect.name, "runs": args.runs}, "results": results}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for mode, metrics in results.items():
+            timings = "  ".join(f"{m} {metrics[m]['p50']:>7}" for m in METRICS)
+            print(f"{mode:<12} {timings}  lazy loaded: {', '.join(metrics['lazy_loaded_at_startup']) or 'none'}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+
+    if args.check:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        if check(results, baseline, args.max_regression):
+            sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
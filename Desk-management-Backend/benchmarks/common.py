@@ -0,0 +1,109 @@
+"""Shared helpers for the benchmark scripts.
+
+Import this before anything from `app`: it points DATABASE_URL at the
+benchmark database, since the app builds its engine at import time.
+"""
+import os
+import statistics
+import sys
+import tempfile
+
+# ensure package import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def bench_database_url(name: str) -> str:
+    """
+    BENCH_DATABASE_URL if set, else a per-benchmark temporary SQLite file.
+    """
+    default = f"sqlite:///{os.path.join(tempfile.gettempdir(), f'desk_bench_{name}.db')}"
+    return os.getenv("BENCH_DATABASE_URL", default)
+
+
+def use_database(url: str):
+    os.environ["DATABASE_URL"] = url
+
+
+def configure_engine(url: str, fresh: bool = True):
+    """
+    Engine for the benchmark run, bound into the app's SessionLocal.
+
+    The app's SQLite engine shares one connection (StaticPool); give each
+    session its own connection so requests really run concurrently.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.database import database as dbmod
+
+    if url.startswith("sqlite"):
+        path = url.replace("sqlite:///", "", 1)
+        if fresh and os.path.exists(path):
+            os.remove(path)
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False, "timeout": 60},
+            poolclass=NullPool,
+        )
+        dbmod.SessionLocal.configure(bind=engine)
+        return engine
+
+    dbmod.engine.echo = False
+    return dbmod.engine
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed, statuses=None) -> dict:
+    """
+    Throughput and latency percentiles (ms) for one measured scenario.
+    """
+    if not latencies:
+        return {"requests": 0}
+    return {
+        "requests": len(latencies),
+        "statuses": {str(k): v for k, v in sorted((statuses or {}).items())},
+        "total_s": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+    }
+
+
+def seed_dataset(
+    engine,
+    floors: int = 5,
+    desks_per_floor: int = 100,
+    employees: int = 2000,
+    assignments: int = 100000,
+    desk_requests: int = 20000,
+    years: int = 3,
+    seed: int = 1,
+) -> dict:
+    """
+    Reset the benchmark database and load a generated dataset through
+    scripts/generate_data.py. Returns the ids/emails the benchmarks need
+    to build requests.
+    """
+    from scripts.generate_data import generate
+
+    data = generate(
+        engine,
+        floors=floors,
+        desks=floors * desks_per_floor,
+        employees=employees,
+        assignments=assignments,
+        desk_requests=desk_requests,
+        years=years,
+        seed=seed,
+        log=lambda message: print(message, file=sys.stderr),
+    )
+    data["password"] = data["passwords"]["EMPLOYEE"]
+    return data
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Concurrency stress test for desk booking.
+
+Fires hundreds of simultaneous POST /desks/assign-desk (admin) and
+POST /desk-requests/ (employee auto-assignment) calls at a small pool of
+desks through the in-process ASGI app, then checks that no desk ended up
+with two active assignments for the same shift and overlapping dates.
+
+Usage:
+  # from Desk-management-Backend dir
+  python3 benchmarks/stress_concurrent_booking.py --bookings 400 --concurrency 50
+
+Uses a temporary SQLite file by default (bookings serialize on its single
+write lock). Set BENCH_DATABASE_URL to a scratch MySQL database to exercise
+the SELECT ... FOR UPDATE row locks. Exits non-zero on any double booking.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+
+from common import bench_database_url, configure_engine, summarize, use_database
+
+BENCH_DATABASE_URL = bench_database_url("stress")
+use_database(BENCH_DATABASE_URL)
+
+import httpx
+
+from app.database import database as dbmod
+from app.main import app
+from app.models import (
+    Department,
+    Desk,
+    DeskAssignment,
+    Employee,
+    Floor,
+    SystemSettings,
+    User,
+)
+from app.utils.jwt import create_access_token
+
+
+def seed(engine, desks, employees):
+    dbmod.Base.metadata.drop_all(bind=engine)
+    dbmod.Base.metadata.create_all(bind=engine)
+
+    db = dbmod.SessionLocal()
+    try:
+        floor = Floor(id=str(uuid.uuid4()), name="Floor 1", number=1)
+        dept = Department(id=str(uuid.uuid4()), name="Stress", floor_id=floor.id)
+        admin = User(
+            id=str(uuid.uuid4()), email="stress-admin@example.com",
+            password_hash="-", full_name="Stress Admin", role="ADMIN",
+        )
+        db.add_all([floor, dept, admin])
+        db.add(SystemSettings(id="GLOBAL", auto_assignment_enabled=True))
+        db.flush()
+
+        desk_ids = []
+        for i in range(desks):
+            desk = Desk(
+                id=str(uuid.uuid4()), desk_number=str(1000 + i), floor=1,
+                floor_id=floor.id, department_id=dept.id,
+            )
+            db.add(desk)
+            desk_ids.append(desk.id)
+
+        people = []
+        for i in range(employees):
+            user = User(
+                id=str(uuid.uuid4()), email=f"stress-{i}@example.com",
+                password_hash="-", full_name=f"Stress {i}", role="EMPLOYEE",
+            )
+            emp = Employee(
+                id=str(uuid.uuid4()), employee_code=f"STRESS-{i}",
+                name=user.full_name, department=dept.name,
+                department_id=dept.id, user_id=user.id,
+            )
+            db.add_all([user, emp])
+            people.append((user.id, emp.id))
+        db.commit()
+
+        admin_token = create_access_token(
+            {"user_id": admin.id, "role": "ADMIN", "full_name": admin.full_name}
+        )
+        employee_tokens = [
+            create_access_token({"user_id": uid, "role": "EMPLOYEE"})
+            for uid, _ in people
+        ]
+        return admin_token, desk_ids, [eid for _, eid in people], employee_tokens
+    finally:
+        db.close()
+
+
+def make_jobs(count, desk_ids, employee_ids, employee_tokens, admin_token, rng):
+    base = date.today()
+    jobs = []
+    for i in range(count):
+        start = base + timedelta(days=rng.randint(0, 14))
+        end = start + timedelta(days=rng.randint(0, 4))
+        shift = rng.choice(["MORNING", "NIGHT"])
+        if i % 2 == 0:
+            jobs.append((
+                "/desks/assign-desk",
+                admin_token,
+                {
+                    "desk_id": rng.choice(desk_ids),
+                    "employee_id": employee_ids[i],
+                    "assignment_type": "TEMPORARY",
+                    "date": str(start),
+                    "end_date": str(end),
+                    "shift": shift,
+                },
+            ))
+        else:
+            jobs.append((
+                "/desk-requests/",
+                employee_tokens[i],
+                {"shift": shift, "from_date": str(start), "to_date": str(end)},
+            ))
+    return jobs
+
+
+async def fire(jobs, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = defaultdict(int)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://stress") as client:
+        async def one(path, token, body):
+            async with semaphore:
+                t0 = time.perf_counter()
+                resp = await client.post(
+                    path, json=body, headers={"Authorization": f"Bearer {token}"}
+                )
+                latencies.append(time.perf_counter() - t0)
+                statuses[resp.status_code] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(*job) for job in jobs))
+        elapsed = time.perf_counter() - start
+
+    return elapsed, latencies, dict(statuses)
+
+
+def find_double_bookings():
+    """
+    Sweep each (desk, shift) timeline of active assignments for overlaps.
+    """
+    db = dbmod.SessionLocal()
+    try:
+        rows = (
+            db.query(
+                DeskAssignment.desk_id, DeskAssignment.shift,
+                DeskAssignment.start_date, DeskAssignment.end_date,
+            )
+            .filter(DeskAssignment.released_date == None)
+            .order_by(
+                DeskAssignment.desk_id, DeskAssignment.shift,
+                DeskAssignment.start_date,
+            )
+            .all()
+        )
+    finally:
+        db.close()
+
+    overlaps = 0
+    prev_key, prev_end = None, None
+    for desk_id, shift, start, end in rows:
+        key = (desk_id, shift)
+        if key == prev_key and start <= prev_end:
+            overlaps += 1
+            prev_end = max(prev_end, end)
+        else:
+            prev_key, prev_end = key, end
+    return len(rows), overlaps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--desks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    engine = configure_engine(BENCH_DATABASE_URL)
+    print(f"Database: {BENCH_DATABASE_URL}", file=sys.stderr)
+    admin_token, desk_ids, employee_ids, employee_tokens = seed(
+        engine, args.desks, args.bookings
+    )
+    jobs = make_jobs(
+        args.bookings, desk_ids, employee_ids, employee_tokens, admin_token, rng
+    )
+
+    elapsed, latencies, statuses = asyncio.run(fire(jobs, args.concurrency))
+    active, overlaps = find_double_bookings()
+
+    result = {
+        "bookings": args.bookings,
+        "concurrency": args.concurrency,
+        "desks": args.desks,
+        "active_assignments": active,
+        "double_bookings": overlaps,
+        **summarize(latencies, elapsed, statuses),
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for key, value in result.items():
+            print(f"{key:<20} {value}")
+
+    sys.exit(1 if overlaps else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,5 +15,16 @@ alembic upgrade head
 # You can run this once to setup, then comment it out to keep your data.
 # python seed_db.py
 
-echo "Starting Backend API..."
+# Migrations are applied above, so workers only verify the schema revision
+# instead of running create_all on every start
+export STARTUP_SCHEMA_MODE="${STARTUP_SCHEMA_MODE:-check}"
+
+# dev: one auto-reloading process (default)
+# production: gunicorn with uvicorn workers, see gunicorn.conf.py
+SERVER_MODE="${SERVER_MODE:-dev}"
+
+echo "Starting Backend API ($SERVER_MODE)..."
+if [ "$SERVER_MODE" = "production" ]; then
+    exec gunicorn app.main:app -c gunicorn.conf.py
+fi
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
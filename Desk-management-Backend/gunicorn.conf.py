@@ -0,0 +1,66 @@
+"""Gunicorn settings for SERVER_MODE=production (see entrypoint.sh).
+
+Uvicorn workers under a gunicorn master: the master restarts crashed
+workers, recycles them gracefully and, with preload, imports the app
+once so workers share that memory copy-on-write.
+
+Rate limit buckets, the analytics cache, the auto-assign queue and the
+waitlist live in each worker process, so they are not shared between
+workers (see "Production server" in README_BACKEND.md).
+"""
+import multiprocessing
+import os
+
+
+def _cpu_count() -> int:
+    # Cores this container may actually use, not all of the host's
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+# Async workers: one per core keeps every core busy
+workers = int(os.getenv("WEB_CONCURRENCY", str(_cpu_count())))
+# The app sizes each worker's connection pool from this
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# Seconds a worker may stay silent before it is killed and replaced, and
+# how long it gets to finish in-flight requests on restart / shutdown
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Recycle each worker after this many requests (0 = never), staggered by
+# the jitter so they do not all restart at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    # Prepare (or check) the schema once here rather than in every worker,
+    # where concurrent create_all calls race on a fresh database and a
+    # failed check would only make workers crash-loop.
+    from app.database import schema
+    from app.database.database import engine
+
+    schema.prepare_schema(engine)
+    engine.dispose()
+    # Workers: preloaded ones share this module, the others read the env
+    schema.STARTUP_SCHEMA_MODE = "off"
+    os.environ["STARTUP_SCHEMA_MODE"] = "off"
+
+
+def post_fork(server, worker):
+    # With preload the engine was created in the master; drop the pool's
+    # inherited connections (without closing the master's sockets) so each
+    # worker opens its own.
+    from app.database.database import engine
+
+    engine.dispose(close=False)
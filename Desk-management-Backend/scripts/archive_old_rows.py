@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Move closed desk assignments and old status history to the archive tables.
+
+Retention is configured with ARCHIVE_ASSIGNMENT_RETENTION_DAYS (default 180)
+and ARCHIVE_HISTORY_RETENTION_DAYS (default 365). Rows are moved in chunks of
+ARCHIVE_CHUNK_SIZE (default 1000), one commit per chunk.
+
+Usage:
+  # from Desk-management-Backend dir
+  export PYTHONPATH=$PWD
+  python3 scripts/archive_old_rows.py --dry-run
+  python3 scripts/archive_old_rows.py --max-rows 50000
+"""
+import argparse
+import os
+import sys
+
+# ensure package import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database.database import SessionLocal
+from app.utils import archival
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="Only count rows that would move")
+    parser.add_argument("--chunk-size", type=int, default=archival.ARCHIVE_CHUNK_SIZE)
+    parser.add_argument("--max-rows", type=int, default=None, help="Stop after this many rows per table")
+    args = parser.parse_args()
+
+    print(f"Assignments closed before {archival.assignment_cutoff()}")
+    print(f"Status history changed before {archival.history_cutoff():%Y-%m-%d %H:%M}")
+
+    db = SessionLocal()
+    try:
+        counts = archival.archive_closed_rows(
+            db,
+            chunk_size=args.chunk_size,
+            max_rows=args.max_rows,
+            dry_run=args.dry_run,
+        )
+    finally:
+        db.close()
+
+    verb = "Would archive" if args.dry_run else "Archived"
+    for table, count in counts.items():
+        print(f"{verb} {count} rows from {table}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Report desks and employees double-booked on the same shift.
+
+Streams every active assignment sorted by (desk, shift, start_date) and
+then by (employee, shift, start_date), and finds all overlaps in one
+linear pass over each ordering. Nothing is modified; run
+scripts/repair_data.py to release the stale bookings.
+
+Exits 1 when a conflict is found, so it can gate deploys or cron jobs.
+
+Usage:
+  # from Desk-management-Backend dir
+  export PYTHONPATH=$PWD
+  python3 scripts/check_overlaps.py
+  python3 scripts/check_overlaps.py desk --limit 20
+  python3 scripts/check_overlaps.py --json > overlaps.json
+"""
+import argparse
+import json
+import os
+import sys
+
+# ensure package import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database.database import SessionLocal, engine
+from app.utils.integrity import CHECKS, find_double_bookings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "kinds", nargs="*",
+        help=f"Checks to run: {', '.join(CHECKS)} (default: all)",
+    )
+    parser.add_argument("--limit", type=int, default=50, help="Conflicts to list (all are counted)")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    unknown = set(args.kinds) - set(CHECKS)
+    if unknown:
+        parser.error(f"unknown check: {', '.join(sorted(unknown))}")
+    kinds = tuple(k for k in CHECKS if not args.kinds or k in args.kinds)
+
+    engine.echo = False
+    with SessionLocal() as db:
+        report = find_double_bookings(db, kinds=kinds, max_reported=args.limit)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Scanned {report['scanned']} active assignments in {report['elapsed_ms'] / 1000:.1f}s")
+        for kind in kinds:
+            print(f"  {kind} conflicts: {report[f'{kind}_conflicts']}")
+        for c in report["conflicts"]:
+            print(
+                f"  {c['kind']:<8} {c[c['kind'] + '_id']} {c['shift']}: "
+                f"{c['assignment_id']} ({c['start_date']}..{c['end_date']}) overlaps "
+                f"{c['overlaps_assignment_id']} ({c['overlaps_start_date']}..{c['overlaps_end_date']})"
+            )
+        if report["truncated"]:
+            print(f"  ... showing the first {len(report['conflicts'])}")
+
+    if any(report[f"{kind}_conflicts"] for kind in kinds):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""Generate a synthetic desk-management dataset of any size.
+
+Wipes the target database and fills it with floors, departments, desks,
+users/employees, desk assignments, desk status history and desk requests,
+written with bulk Core inserts. Output is deterministic for a given --seed.
+
+The demo accounts from seed_db.py are always included (admin@123,
+it@123, employee@123); generated employees share the employee password,
+and each distinct password is hashed once.
+
+Distributions:
+- bookings start on weekdays (weekends are rare) across --years of
+  history plus the next 30 days; most last a day, some a week, a few are
+  long PERMANENT ones. Bookings on one desk/shift never overlap, and no
+  employee holds two bookings on the same shift at once.
+- ~70% of employees (and bookings) are on the MORNING shift.
+- desk requests are mostly decided; those from the last weeks are pending.
+
+Usage:
+  # from Desk-management-Backend dir
+  export PYTHONPATH=$PWD
+  python3 scripts/generate_data.py --floors 10 --desks 5000 --employees 20000 \\
+      --assignments 1000000 --history 200000 --desk-requests 100000
+"""
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+# ensure package import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import database as dbmod
+from app.models import (
+    Department,
+    Desk,
+    DeskAssignment,
+    DeskRequest,
+    DeskStatusHistory,
+    Employee,
+    Floor,
+    SystemSettings,
+    User,
+)
+from app.utils.auth import get_pwd_context
+from app.utils.desk_utils import desk_number_fields
+
+BATCH_SIZE = 10000
+SHIFTS = ["MORNING", "NIGHT"]
+SHIFT_WEIGHTS = [0.7, 0.3]
+
+DEMO_DEPARTMENTS = ["Sales", "Development", "HR", "Support"]
+EXTRA_DEPARTMENTS = [
+    "Finance", "Marketing", "Operations", "Legal", "Design", "QA",
+    "Procurement", "Research", "Customer Success", "Security",
+]
+DEMO_ADMINS = [
+    ("Emily Carter", "emily.carter@company.com"),
+    ("Rajesh Mehta", "rajesh.mehta@company.com"),
+    ("Sarah Williams", "sarah.williams@company.com"),
+]
+DEMO_IT_SUPPORT = [
+    ("Daniel Moore", "daniel.moore@company.com"),
+    ("Priya Sharma", "priya.sharma@company.com"),
+    ("Michael Brown", "michael.brown@company.com"),
+]
+DEMO_EMPLOYEES = [
+    ("John Anderson", "john.anderson@company.com", "Sales", "MORNING"),
+    ("Neha Patel", "neha.patel@company.com", "Sales", "MORNING"),
+    ("Rahul Verma", "rahul.verma@company.com", "Development", "NIGHT"),
+    ("Aisha Khan", "aisha.khan@company.com", "Development", "MORNING"),
+    ("Kunal Shah", "kunal.shah@company.com", "Development", "NIGHT"),
+    ("Sofia Martinez", "sofia.martinez@company.com", "HR", "MORNING"),
+    ("Arjun Reddy", "arjun.reddy@company.com", "HR", "MORNING"),
+    ("Vikram Singh", "vikram.singh@company.com", "Support", "NIGHT"),
+    ("Pooja Nair", "pooja.nair@company.com", "Support", "MORNING"),
+    ("Lucas Johnson", "lucas.johnson@company.com", "Sales", "NIGHT"),
+]
+PASSWORDS = {"ADMIN": "admin@123", "IT_SUPPORT": "it@123", "EMPLOYEE": "employee@123"}
+
+FIRST_NAMES = [
+    "Aarav", "Ananya", "Ben", "Chloe", "Diego", "Elena", "Farah", "George",
+    "Hana", "Ishaan", "Julia", "Kenji", "Leila", "Mateo", "Nina", "Omar",
+    "Priya", "Quinn", "Rohan", "Sara", "Tomas", "Uma", "Victor", "Wen",
+]
+LAST_NAMES = [
+    "Agarwal", "Brown", "Chen", "Desai", "Evans", "Fischer", "Garcia",
+    "Hughes", "Iyer", "Jones", "Kim", "Lopez", "Mehta", "Nguyen", "Okafor",
+    "Patel", "Rossi", "Singh", "Tanaka", "Wilson",
+]
+MAINTENANCE_REASONS = [
+    "Monitor replacement", "Chair repair", "Network issue",
+    "Deep cleaning", "Docking station fault", "Power socket repair",
+]
+
+
+def _insert(conn, table, rows, batch_size):
+    """
+    Insert an iterable of row dicts in executemany batches.
+    """
+    batch, total = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            conn.execute(table.insert(), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        conn.execute(table.insert(), batch)
+        total += len(batch)
+    return total
+
+
+def reset_database(engine):
+    """
+    Create missing tables and delete every row, children first.
+    """
+    dbmod.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for table in reversed(dbmod.Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+def _booking_days(rng, first_day, span_days):
+    """
+    Candidate start days: every weekday plus ~1 in 10 weekend days.
+    """
+    days = []
+    for offset in range(span_days):
+        day = first_day + timedelta(days=offset)
+        if day.weekday() < 5 or rng.random() < 0.1:
+            days.append(day)
+    return days
+
+
+def _booking_length(rng):
+    roll = rng.random()
+    if roll < 0.70:
+        return 1, "TEMPORARY"
+    if roll < 0.95:
+        return rng.randint(2, 7), "TEMPORARY"
+    return rng.randint(30, 180), "PERMANENT"
+
+
+def _plan_bookings(rng, desk_ids, employees_by_shift, count, first_day, span_days):
+    """
+    Spread `count` bookings over the (desk, shift) timelines without
+    overlaps, then hand each one to an employee of that shift who is free
+    on its start date. Returns (desk_id, employee_id, shift, start, end, type)
+    tuples sorted by start date.
+    """
+    days = _booking_days(rng, first_day, span_days)
+    bookings = []
+    for shift, weight in zip(SHIFTS, SHIFT_WEIGHTS):
+        if not employees_by_shift[shift]:
+            continue
+        per_timeline = count * weight / len(desk_ids)
+        for desk_id in desk_ids:
+            # Fractional targets round up or down at random so totals match
+            k = int(per_timeline) + (rng.random() < per_timeline % 1)
+            starts = sorted(rng.sample(days, min(k, len(days))))
+            for i, start in enumerate(starts):
+                length, kind = _booking_length(rng)
+                end = start + timedelta(days=length - 1)
+                if i + 1 < len(starts):
+                    end = min(end, starts[i + 1] - timedelta(days=1))
+                bookings.append((start, end, desk_id, shift, kind))
+
+    bookings.sort()
+    # Min-heap of (free_from, employee_id) per shift
+    free = {
+        shift: [(first_day, emp_id) for emp_id in employees_by_shift[shift]]
+        for shift in SHIFTS
+    }
+    for heap in free.values():
+        heapq.heapify(heap)
+
+    planned = []
+    for start, end, desk_id, shift, kind in bookings:
+        heap = free[shift]
+        if not heap or heap[0][0] > start:
+            continue  # everyone on this shift is already booked
+        _, emp_id = heapq.heappop(heap)
+        heapq.heappush(heap, (end + timedelta(days=1), emp_id))
+        planned.append((desk_id, emp_id, shift, start, end, kind))
+    return planned
+
+
+def generate(
+    engine,
+    floors: int = 3,
+    desks: int = 12,
+    employees: int = 10,
+    assignments: int = 0,
+    history: int = 0,
+    desk_requests: int = 0,
+    years: int = 2,
+    seed: int = 42,
+    as_of: date | None = None,
+    batch_size: int = BATCH_SIZE,
+    log=print,
+) -> dict:
+    """
+    Reset the database behind engine and load a generated dataset, with
+    dates relative to as_of (default today).
+    Returns row counts per table plus the ids/emails callers (e.g. the
+    benchmarks) need to build requests against it.
+    """
+    rng = random.Random(seed)
+
+    # Ids come from the seeded rng so reruns produce identical data:
+    # uuid4 for reference tables, and for time-series tables the UUIDv7
+    # layout the app uses, stamped with the row's own time.
+    def rand_id():
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def time_id(at: datetime):
+        ms = int(at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+        value = ms << 80 | 0x7 << 76 | rng.getrandbits(12) << 64 | 0b10 << 62 | rng.getrandbits(62)
+        return str(uuid.UUID(int=value))
+
+    today = as_of or date.today()
+    now = datetime.combine(today, datetime.min.time()) + timedelta(hours=12)
+    first_day = today - timedelta(days=365 * years)
+    span_days = (today + timedelta(days=30) - first_day).days
+    # Reference rows all "exist" from the start of the generated history
+    opened = datetime.combine(first_day, datetime.min.time())
+
+    log("Resetting database...")
+    reset_database(engine)
+
+    # One hash per distinct password
+    hashes = {role: get_pwd_context().hash(pw) for role, pw in PASSWORDS.items()}
+
+    # Floors and departments (spread round-robin over floors)
+    floor_rows = [
+        {"id": rand_id(), "name": f"Floor {n}", "number": n, "created_at": opened}
+        for n in range(1, floors + 1)
+    ]
+    dept_names = DEMO_DEPARTMENTS + EXTRA_DEPARTMENTS
+    dept_names += [f"Department {i}" for i in range(len(dept_names) + 1, floors * 2 + 1)]
+    dept_names = dept_names[:max(len(DEMO_DEPARTMENTS), floors * 2)]
+    dept_rows = [
+        {
+            "id": rand_id(),
+            "name": name,
+            "floor_id": floor_rows[i % floors]["id"],
+            "created_at": opened,
+        }
+        for i, name in enumerate(dept_names)
+    ]
+    depts_by_floor = {f["id"]: [] for f in floor_rows}
+    for dept in dept_rows:
+        depts_by_floor[dept["floor_id"]].append(dept)
+
+    # Desks: 3-digit numbers while a floor holds < 100 desks, else 4-digit
+    per_floor = -(-desks // floors)
+    desk_rows = []
+    for i in range(desks):
+        floor = floor_rows[i // per_floor]
+        index = i % per_floor + 1
+        number = floor["number"] * (100 if per_floor < 100 else 1000) + index
+        floor_depts = depts_by_floor[floor["id"]]
+        # ~10% of desks form an unassigned overflow pool
+        dept = rng.choice(floor_depts) if floor_depts and rng.random() < 0.9 else None
+        roll = rng.random()
+        desk_rows.append({
+            "id": rand_id(),
+            "desk_number": str(number),
+            "floor": floor["number"],
+            "floor_id": floor["id"],
+            "department_id": dept["id"] if dept else None,
+            "current_status": (
+                "MAINTENANCE" if roll < 0.03 else "INACTIVE" if roll < 0.04 else "AVAILABLE"
+            ),
+            "created_at": opened,
+            "updated_at": opened,
+            **desk_number_fields(number),
+        })
+
+    # Users and employees
+    user_rows, employee_rows = [], []
+
+    def add_user(full_name, email, role):
+        user = {
+            "id": rand_id(),
+            "email": email,
+            "password_hash": hashes[role],
+            "full_name": full_name,
+            "role": role,
+            "is_active": True,
+            "created_at": opened,
+        }
+        user_rows.append(user)
+        return user
+
+    staff_ids = [add_user(n, e, "ADMIN")["id"] for n, e in DEMO_ADMINS]
+    staff_ids += [add_user(n, e, "IT_SUPPORT")["id"] for n, e in DEMO_IT_SUPPORT]
+
+    depts_by_name = {d["name"]: d for d in dept_rows}
+    # Skewed department sizes: earlier departments are bigger
+    dept_weights = [1 / (i + 1) for i in range(len(dept_rows))]
+    for i in range(employees):
+        if i < len(DEMO_EMPLOYEES):
+            full_name, email, dept_name, shift = DEMO_EMPLOYEES[i]
+            dept = depts_by_name[dept_name]
+        else:
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            full_name = f"{first} {last}"
+            email = f"{first.lower()}.{last.lower()}.{i}@company.com"
+            dept = rng.choices(dept_rows, weights=dept_weights)[0]
+            shift = rng.choices(SHIFTS, weights=SHIFT_WEIGHTS)[0]
+        user = add_user(full_name, email, "EMPLOYEE")
+        employee_rows.append({
+            "id": rand_id(),
+            "employee_code": f"EMP-{i + 1:06d}",
+            "name": full_name,
+            "department": dept["name"],
+            "department_id": dept["id"],
+            "user_id": user["id"],
+            "shift": shift,
+            "created_at": opened,
+        })
+
+    employees_by_shift = {shift: [] for shift in SHIFTS}
+    for emp in employee_rows:
+        employees_by_shift[emp["shift"]].append(emp["id"])
+
+    plan = (
+        _plan_bookings(
+            rng, [d["id"] for d in desk_rows], employees_by_shift,
+            assignments, first_day, span_days,
+        )
+        if assignments and desk_rows else []
+    )
+
+    def assignment_rows():
+        for desk_id, emp_id, shift, start, end, kind in plan:
+            created = datetime.combine(start, datetime.min.time())
+            yield {
+                "id": time_id(created),
+                "desk_id": desk_id,
+                "employee_id": emp_id,
+                "assigned_by": rng.choice(staff_ids),
+                "assigned_date": start,
+                "released_date": end if end < today else None,
+                "assignment_type": kind,
+                "shift": shift,
+                "start_date": start,
+                "end_date": end,
+                "is_auto_assigned": rng.random() < 0.4,
+                "created_at": created,
+            }
+
+    def history_rows():
+        # Maintenance round trips: out of service, then back a few days later
+        produced = 0
+        while produced < history:
+            desk = rng.choice(desk_rows)
+            went_down = now - timedelta(days=rng.uniform(0, 365 * years))
+            came_back = went_down + timedelta(days=rng.uniform(0.5, 10))
+            reason = rng.choice(MAINTENANCE_REASONS)
+            yield {
+                "id": time_id(went_down),
+                "desk_id": desk["id"],
+                "old_status": "AVAILABLE",
+                "new_status": "MAINTENANCE",
+                "changed_by": rng.choice(staff_ids),
+                "reason": reason,
+                "expected_resolution_date": came_back.date(),
+                "changed_at": went_down,
+            }
+            produced += 1
+            if came_back < now and produced < history:
+                produced += 1
+                yield {
+                    "id": time_id(came_back),
+                    "desk_id": desk["id"],
+                    "old_status": "MAINTENANCE",
+                    "new_status": "AVAILABLE",
+                    "changed_by": rng.choice(staff_ids),
+                    "reason": f"{reason} completed",
+                    "expected_resolution_date": None,
+                    "changed_at": came_back,
+                }
+
+    def request_rows():
+        for _ in range(desk_requests):
+            emp = rng.choice(employee_rows)
+            created = now - timedelta(days=rng.uniform(0, 365 * years))
+            start = created.date() + timedelta(days=rng.randint(1, 14))
+            age_days = (now - created).days
+            status = (
+                "PENDING" if age_days < 21 and rng.random() < 0.6
+                else rng.choices(["APPROVED", "REJECTED"], weights=[0.85, 0.15])[0]
+            )
+            yield {
+                "id": time_id(created),
+                "employee_id": emp["id"],
+                "department_id": emp["department_id"],
+                "shift": emp["shift"],
+                "from_date": start,
+                "to_date": start + timedelta(days=rng.choice([0, 0, 0, 1, 4])),
+                "status": status,
+                "created_at": created,
+            }
+
+    counts = {}
+    tables = [
+        (Floor, floor_rows),
+        (Department, dept_rows),
+        (Desk, desk_rows),
+        (User, user_rows),
+        (Employee, employee_rows),
+        (SystemSettings, [{
+            "id": "GLOBAL",
+            "auto_assignment_enabled": True,
+            "created_at": opened,
+            "updated_at": opened,
+        }]),
+        (DeskAssignment, assignment_rows()),
+        (DeskStatusHistory, history_rows()),
+        (DeskRequest, request_rows()),
+    ]
+    for model, rows in tables:
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            counts[model.__tablename__] = _insert(conn, model.__table__, rows, batch_size)
+        log(f"  {model.__tablename__:<22} {counts[model.__tablename__]:>9} rows "
+            f"in {time.perf_counter() - started:.1f}s")
+
+    return {
+        "counts": counts,
+        "passwords": dict(PASSWORDS),
+        "admin_id": staff_ids[0],
+        "admin_email": DEMO_ADMINS[0][1],
+        "desk_ids": [d["id"] for d in desk_rows],
+        "employee_ids": [e["id"] for e in employee_rows],
+        "employee_emails": [u["email"] for u in user_rows if u["role"] == "EMPLOYEE"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--floors", type=int, default=3)
+    parser.add_argument("--desks", type=int, default=12, help="Total desks")
+    parser.add_argument("--employees", type=int, default=10)
+    parser.add_argument("--assignments", type=int, default=0)
+    parser.add_argument("--history", type=int, default=0, help="Desk status history rows")
+    parser.add_argument("--desk-requests", type=int, default=0)
+    parser.add_argument("--years", type=int, default=2, help="Years of past bookings")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None,
+                        help="Reference date YYYY-MM-DD (default today)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    dbmod.engine.echo = False
+    print(f"Generating into {dbmod.engine.url.render_as_string(hide_password=True)}")
+    started = time.perf_counter()
+    result = generate(
+        dbmod.engine,
+        floors=args.floors,
+        desks=args.desks,
+        employees=args.employees,
+        assignments=args.assignments,
+        history=args.history,
+        desk_requests=args.desk_requests,
+        years=args.years,
+        seed=args.seed,
+        as_of=args.as_of,
+        batch_size=args.batch_size,
+    )
+    total = sum(result["counts"].values())
+    print(f"Done: {total} rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
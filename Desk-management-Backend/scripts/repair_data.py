@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Repair inconsistent desk/assignment data with set-based statements.
+
+Replaces cleanup_data.py, cleanup_floor_data.py, cleanup_desk_numbers.py
+and fix_departments.py. Each fix is a handful of UPDATE/DELETE statements
+over the whole table (window functions pick the rows to change), so a run
+takes seconds and locks are held briefly, whatever the data volume.
+
+Fixes (run in this order; the default set is marked *):
+  assignments *     release active bookings that overlap a newer active
+                    booking of the same employee or desk on the same shift
+                    (recurring bookings are skipped; check_overlaps.py
+                    reports their clashes)
+  desk-status *     ASSIGNED desks without an active booking become
+                    AVAILABLE, AVAILABLE desks with one become ASSIGNED
+                    (MAINTENANCE / INACTIVE desks are left alone)
+  floors *          desks.floor follows the desk's floor row, or its desk
+                    number when it has no floor_id
+  split-floors      move every department beyond the first on a floor to
+                    a new floor of its own and renumber its desks
+  four-digit-desks  delete desks numbered 1000+ with their assignments and
+                    status history
+
+Usage:
+  # from Desk-management-Backend dir
+  export PYTHONPATH=$PWD
+  python3 scripts/repair_data.py --dry-run          # default fixes, counts only
+  python3 scripts/repair_data.py
+  python3 scripts/repair_data.py split-floors --dry-run
+
+The old scripts map to these fixes (the last two are opt-in, so name them):
+  cleanup_data.py           assignments desk-status
+  cleanup_floor_data.py     floors
+  cleanup_desk_numbers.py   four-digit-desks
+  fix_departments.py        split-floors
+
+--dry-run runs the same statements inside a transaction and rolls it
+back, so the reported counts are exactly what a real run would change.
+"""
+import argparse
+import os
+import sys
+import uuid
+from datetime import date
+
+from sqlalchemy import bindparam, case, func, select
+
+# ensure package import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database.database import engine
+from app.models import (
+    Department,
+    Desk,
+    DeskAssignment,
+    DeskRequest,
+    DeskStatusHistory,
+    Floor,
+)
+from app.utils.desk_utils import desk_number_fields
+
+assignments = DeskAssignment.__table__
+desks = Desk.__table__
+
+
+def _overlapping_older_bookings(owner_col):
+    """
+    Ids of active bookings that overlap a newer active booking with the
+    same owner (employee or desk) and shift.
+
+    Ordered newest first, a booking overlaps one of the newer bookings
+    exactly when the earliest start among them is on or before its end.
+    """
+    earliest_newer_start = func.min(assignments.c.start_date).over(
+        partition_by=(owner_col, assignments.c.shift),
+        order_by=(
+            assignments.c.start_date.desc(),
+            assignments.c.created_at.desc(),
+            assignments.c.id.desc(),
+        ),
+        rows=(None, -1),
+    )
+    ranked = (
+        select(
+            assignments.c.id,
+            assignments.c.end_date,
+            earliest_newer_start.label("earliest_newer_start"),
+        )
+        # Weekday masks cannot be compared by the window; only bookings
+        # covering every day of their range are ranked
+        .where(assignments.c.released_date.is_(None), assignments.c.weekdays.is_(None))
+        .subquery("ranked")
+    )
+    # Extra derived table: MySQL refuses to read the table it is updating
+    # unless the subquery is materialized.
+    stale = (
+        select(ranked.c.id)
+        .where(ranked.c.earliest_newer_start <= ranked.c.end_date)
+        .subquery("stale")
+    )
+    return select(stale.c.id)
+
+
+def fix_assignments(conn, today):
+    counts = {}
+    for label, owner_col in (
+        ("released (employee overlap)", assignments.c.employee_id),
+        ("released (desk overlap)", assignments.c.desk_id),
+    ):
+        result = conn.execute(
+            assignments.update()
+            .where(assignments.c.id.in_(_overlapping_older_bookings(owner_col)))
+            .values(released_date=today)
+        )
+        counts[label] = result.rowcount
+    return counts
+
+
+def fix_desk_status(conn, today):
+    # One uncorrelated set of booked desks rather than a lookup per desk
+    booked = (
+        select(assignments.c.desk_id)
+        .where(assignments.c.released_date.is_(None))
+        .distinct()
+    )
+    freed = conn.execute(
+        desks.update()
+        .where(desks.c.current_status == "ASSIGNED", desks.c.id.not_in(booked))
+        .values(current_status="AVAILABLE")
+    )
+    taken = conn.execute(
+        desks.update()
+        .where(desks.c.current_status == "AVAILABLE", desks.c.id.in_(booked))
+        .values(current_status="ASSIGNED")
+    )
+    return {"ASSIGNED -> AVAILABLE": freed.rowcount, "AVAILABLE -> ASSIGNED": taken.rowcount}
+
+
+def fix_floors(conn, today):
+    floors = Floor.__table__
+    floor_number = (
+        select(floors.c.number)
+        .where(floors.c.id == desks.c.floor_id)
+        .scalar_subquery()
+    )
+    from_floor_row = conn.execute(
+        desks.update()
+        .where(desks.c.floor_id.isnot(None), desks.c.floor != floor_number)
+        .values(floor=floor_number)
+    )
+
+    # Same rule as extract_floor_and_index: 4-digit -> /1000, 3-digit -> /100
+    from_number = case(
+        (desks.c.desk_key >= 1000, desks.c.desk_key // 1000),
+        else_=desks.c.desk_key // 100,
+    )
+    from_desk_key = conn.execute(
+        desks.update()
+        .where(
+            desks.c.floor_id.is_(None),
+            desks.c.desk_key >= 100,
+            desks.c.floor != from_number,
+        )
+        .values(floor=from_number)
+    )
+    return {
+        "floor from floor row": from_floor_row.rowcount,
+        "floor from desk number": from_desk_key.rowcount,
+    }
+
+
+def fix_split_floors(conn, today):
+    floors = Floor.__table__
+    departments = Department.__table__
+
+    ranked = select(
+        departments.c.id,
+        departments.c.floor_id,
+        func.row_number().over(
+            partition_by=departments.c.floor_id,
+            order_by=(departments.c.created_at, departments.c.id),
+        ).label("rn"),
+    ).subquery("ranked")
+    movers = conn.execute(
+        select(ranked.c.id).where(ranked.c.rn > 1).order_by(ranked.c.floor_id, ranked.c.rn)
+    ).scalars().all()
+    if not movers:
+        return {"departments moved": 0, "floors created": 0, "desks renumbered": 0}
+
+    next_number = conn.execute(select(func.coalesce(func.max(floors.c.number), 0))).scalar() + 1
+    new_floors = {
+        dept_id: {"id": str(uuid.uuid4()), "name": f"Floor {n}", "number": n}
+        for n, dept_id in enumerate(movers, start=next_number)
+    }
+    conn.execute(floors.insert(), list(new_floors.values()))
+    conn.execute(
+        departments.update()
+        .where(departments.c.id == bindparam("dept_id"))
+        .values(floor_id=bindparam("new_floor_id")),
+        [{"dept_id": d, "new_floor_id": f["id"]} for d, f in new_floors.items()],
+    )
+
+    # Renumber the moved departments' desks onto their new floors
+    desk_rank = func.row_number().over(
+        partition_by=desks.c.department_id,
+        order_by=(desks.c.desk_key, desks.c.desk_number),
+    )
+    moved_desks = conn.execute(
+        select(desks.c.id, desks.c.department_id, desk_rank.label("rn"))
+        .where(desks.c.department_id.in_(movers))
+    ).all()
+    per_dept = {}
+    for _, dept_id, _ in moved_desks:
+        per_dept[dept_id] = per_dept.get(dept_id, 0) + 1
+
+    moved_ids = {desk_id for desk_id, _, _ in moved_desks}
+    taken = {
+        number for desk_id, number in conn.execute(select(desks.c.id, desks.c.desk_number))
+        if desk_id not in moved_ids
+    }
+    updates = []
+    for desk_id, dept_id, rn in moved_desks:
+        floor = new_floors[dept_id]
+        scale = 100 if per_dept[dept_id] < 100 else 1000
+        number = floor["number"] * scale + rn
+        while str(number) in taken:
+            number += 1
+        taken.add(str(number))
+        updates.append({
+            "desk_id": desk_id,
+            "new_floor_id": floor["id"],
+            "new_floor": floor["number"],
+            "new_number": str(number),
+            "new_key": desk_number_fields(number)["desk_key"],
+            "new_index": desk_number_fields(number)["desk_index"],
+        })
+    if updates:
+        conn.execute(
+            desks.update()
+            .where(desks.c.id == bindparam("desk_id"))
+            .values(
+                floor_id=bindparam("new_floor_id"),
+                floor=bindparam("new_floor"),
+                desk_number=bindparam("new_number"),
+                desk_key=bindparam("new_key"),
+                desk_index=bindparam("new_index"),
+            ),
+            updates,
+        )
+
+    return {
+        "departments moved": len(movers),
+        "floors created": len(new_floors),
+        "desks renumbered": len(updates),
+    }
+
+
+def fix_four_digit_desks(conn, today):
+    doomed = select(desks.c.id).where(func.length(desks.c.desk_number) >= 4)
+    requests = DeskRequest.__table__
+    history = DeskStatusHistory.__table__
+    return {
+        "assignments deleted": conn.execute(
+            assignments.delete().where(assignments.c.desk_id.in_(doomed))
+        ).rowcount,
+        "history deleted": conn.execute(
+            history.delete().where(history.c.desk_id.in_(doomed))
+        ).rowcount,
+        "requests unlinked": conn.execute(
+            requests.update()
+            .where(requests.c.assigned_desk_id.in_(doomed))
+            .values(assigned_desk_id=None)
+        ).rowcount,
+        "desks deleted": conn.execute(
+            desks.delete().where(func.length(desks.c.desk_number) >= 4)
+        ).rowcount,
+    }
+
+
+# name -> (fix, part of the default set)
+FIXES = {
+    "assignments": (fix_assignments, True),
+    "desk-status": (fix_desk_status, True),
+    "floors": (fix_floors, True),
+    "split-floors": (fix_split_floors, False),
+    "four-digit-desks": (fix_four_digit_desks, False),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "fixes", nargs="*",
+        help=f"Fixes to run: {', '.join(FIXES)} (default: the starred ones)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report counts and roll back")
+    args = parser.parse_args()
+
+    unknown = set(args.fixes) - set(FIXES)
+    if unknown:
+        parser.error(f"unknown fix: {', '.join(sorted(unknown))}")
+    # Keep the documented order whatever order they were given in
+    selected = args.fixes or [name for name, (_, default) in FIXES.items() if default]
+    selected = [name for name in FIXES if name in selected]
+
+    engine.echo = False
+    today = date.today()
+    with engine.connect() as conn:
+        # Each fix commits on its own; a dry run keeps one transaction so
+        # later fixes see the earlier ones, then rolls everything back.
+        dry_run_tx = conn.begin() if args.dry_run else None
+        for name in selected:
+            fix, _ = FIXES[name]
+            if dry_run_tx:
+                counts = fix(conn, today)
+            else:
+                with conn.begin():
+                    counts = fix(conn, today)
+            print(f"{name}{' (dry run)' if args.dry_run else ''}:")
+            for label, count in counts.items():
+                print(f"  {label:<28} {count}")
+        if dry_run_tx:
+            dry_run_tx.rollback()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Run the desk state jobs once: release expired bookings, end maintenance.
+
+Takes the same database lease as the in-process scheduler, so it is safe
+to run from cron next to API workers (set SCHEDULER_ENABLED=0 there to
+leave the jobs to cron only).
+
+Usage:
+  # from Desk-management-Backend dir
+  export PYTHONPATH=$PWD
+  python3 scripts/run_scheduled_jobs.py
+"""
+import argparse
+import os
+import sys
+
+# ensure package import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.scheduler import desk_scheduler
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+
+    results = desk_scheduler.run_once()
+    if results is None:
+        print("Lease held by another worker; nothing done")
+        return
+    for job, counts in results.items():
+        print(job, ", ".join(f"{name}={value}" for name, value in counts.items()))
+    # Jobs are held under the lease until it lapses; hand it back now
+    desk_scheduler.release()
+
+
+if __name__ == '__main__':
+    main()
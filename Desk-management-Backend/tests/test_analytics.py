@@ -0,0 +1,39 @@
+import numpy as np
+
+from app.utils.analytics import peak_concurrency
+
+
+def test_sweep_finds_peak_and_days_over_capacity():
+    # Group 0: [0, 5), [2, 4), [3, 8) -> three overlap on days 3; group 1: [6, 9)
+    result = peak_concurrency(
+        group=np.array([0, 0, 0, 1]),
+        starts=np.array([0, 2, 3, 6]),
+        stops=np.array([5, 4, 8, 9]),
+        n_groups=2,
+        n_days=10,
+        capacity=np.array([2, 1]),
+        bucket_starts=np.array([0, 5]),
+    )
+
+    assert result["peak"].tolist() == [3, 1]
+    assert result["peak_day"].tolist() == [3, 6]
+    # Group 0 has more than 2 on day 3 only
+    assert result["days_over"].tolist() == [1, 0]
+    # A range running across a bucket start counts in both buckets
+    assert result["bucket_peak"].tolist() == [[3, 1], [0, 1]]
+
+
+def test_sweep_clips_ranges_to_the_period():
+    result = peak_concurrency(
+        group=np.array([0, 0]),
+        starts=np.array([-30, 12]),
+        stops=np.array([2, 20]),
+        n_groups=1,
+        n_days=10,
+        capacity=np.array([0]),
+        bucket_starts=np.array([0]),
+    )
+
+    assert result["peak"].tolist() == [1]
+    assert result["peak_day"].tolist() == [0]
+    assert result["days_over"].tolist() == [2]
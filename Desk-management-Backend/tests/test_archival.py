@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import models  # noqa: F401  (registers every table)
+from app.database.database import Base
+from app.models.desk_assignments import DeskAssignment
+from app.models.desk_assignments_archive import DeskAssignmentArchive
+from app.utils.archival import archive_closed_rows
+from app.utils.ids import new_id
+
+
+@pytest.fixture
+def Session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'archive.db'}", poolclass=NullPool)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _booking(db, end, assignment_type, released=None) -> str:
+    assignment = DeskAssignment(
+        id=new_id(), desk_id=new_id(), employee_id=new_id(), assigned_by=new_id(),
+        assigned_date=end, assignment_type=assignment_type, released_date=released,
+        shift="MORNING", start_date=end, end_date=end,
+    )
+    db.add(assignment)
+    return assignment.id
+
+
+def test_unreleased_permanent_seats_stay_in_the_hot_table(Session):
+    long_ago = date.today() - timedelta(days=400)
+    with Session() as db:
+        seat = _booking(db, long_ago, "PERMANENT")
+        expired = _booking(db, long_ago, "TEMPORARY")
+        released_seat = _booking(db, long_ago, "PERMANENT", released=long_ago)
+        recent = _booking(db, date.today() - timedelta(days=10), "TEMPORARY")
+        db.commit()
+
+        assert archive_closed_rows(db, dry_run=True)["desk_assignments"] == 2
+        assert archive_closed_rows(db)["desk_assignments"] == 2
+
+        assert {a.id for a in db.query(DeskAssignment)} == {seat, recent}
+        assert {a.id for a in db.query(DeskAssignmentArchive)} == {expired, released_seat}
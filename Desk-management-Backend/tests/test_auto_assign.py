@@ -0,0 +1,144 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import models  # noqa: F401  (registers every table)
+from app.database.database import Base
+from app.models.departments import Department
+from app.models.desk_requests import DeskRequest
+from app.models.desks import Desk
+from app.models.employees import Employee
+from app.models.floors import Floor
+from app.models.system_settings import SystemSettings
+from app.routers import desk_requests
+from app.utils import auto_assign
+from app.utils.auto_assign import assign_queued_requests
+from app.utils.ids import new_id
+
+DAY = date.today() + timedelta(days=7)
+
+
+@pytest.fixture
+def office(tmp_path):
+    """
+    A department with desks 101 and 102 and three employees, on a file
+    database so separate sessions run separate transactions.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'office.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        poolclass=NullPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        floor = Floor(id=new_id(), name="Floor 1", number=1)
+        department = Department(id=new_id(), name="Sales", floor_id=floor.id)
+        db.add_all([floor, department, SystemSettings(id="GLOBAL", auto_assignment_enabled=True)])
+        db.add_all(
+            Desk(id=new_id(), desk_number=number, floor=1, floor_id=floor.id, department_id=department.id)
+            for number in ("101", "102")
+        )
+        employees = [
+            Employee(
+                id=new_id(), employee_code=f"EMP-{i}", name=f"E{i}", department="Sales",
+                department_id=department.id, user_id=new_id(),
+            )
+            for i in range(3)
+        ]
+        db.add_all(employees)
+        db.commit()
+        yield SimpleNamespace(
+            Session=Session,
+            department_id=department.id,
+            employees=[(e.id, e.user_id) for e in employees],
+        )
+    engine.dispose()
+
+
+def _pending_requests(office) -> list[str]:
+    with office.Session() as db:
+        requests = [
+            DeskRequest(
+                id=new_id(), employee_id=employee_id, department_id=office.department_id,
+                shift="MORNING", from_date=DAY, to_date=DAY, status="PENDING",
+            )
+            for employee_id, _ in office.employees
+        ]
+        db.add_all(requests)
+        db.commit()
+        return [r.id for r in requests]
+
+
+def _assigned_desks(office, request_ids) -> list[str | None]:
+    with office.Session() as db:
+        numbers = dict(
+            db.query(DeskRequest.id, Desk.desk_number)
+            .join(Desk, DeskRequest.assigned_desk_id == Desk.id)
+            .filter(DeskRequest.id.in_(request_ids))
+        )
+    return [numbers.get(request_id) for request_id in request_ids]
+
+
+def test_batch_assigns_oldest_first_until_desks_run_out(office):
+    request_ids = _pending_requests(office)
+
+    with office.Session() as db:
+        counts = assign_queued_requests(db, request_ids)
+
+    assert counts == {"assigned": 2, "unassigned": 1, "skipped": 0, "failed": 0}
+    assert _assigned_desks(office, request_ids) == ["101", "102", None]
+
+
+def test_batch_skips_requests_assigned_meanwhile(office, monkeypatch):
+    request_ids = _pending_requests(office)
+    first, taken, last = request_ids
+
+    # An admin approves one request between the worker's read and its locks
+    lock_desks = auto_assign.lock_desks
+
+    def approve_then_lock(db, desk_ids):
+        with office.Session() as admin_db:
+            admin_db.get(DeskRequest, taken).status = "APPROVED"
+            admin_db.commit()
+        return lock_desks(db, desk_ids)
+
+    monkeypatch.setattr(auto_assign, "lock_desks", approve_then_lock)
+    with office.Session() as db:
+        counts = assign_queued_requests(db, request_ids)
+
+    assert counts == {"assigned": 2, "unassigned": 0, "skipped": 1, "failed": 0}
+    assert _assigned_desks(office, [first, taken, last]) == ["101", None, "102"]
+
+
+def test_background_mode_assigns_inline_when_the_worker_is_not_running(office, monkeypatch):
+    monkeypatch.setattr(desk_requests, "AUTO_ASSIGN_MODE", "background")
+    assert not auto_assign.auto_assign_worker.running
+    _, user_id = office.employees[0]
+
+    with office.Session() as db:
+        response = desk_requests._create_desk_request(
+            desk_requests.DeskRequestCreate(shift="MORNING", from_date=DAY, to_date=DAY),
+            db,
+            SimpleNamespace(id=user_id),
+        )
+
+    assert response["status"] == "APPROVED"
+    assert response["assigned_desk"]["desk_number"] == "101"
+    assert "auto_assignment" not in response
+
+
+def test_only_one_worker_requeues_pending_requests_on_startup(office, monkeypatch):
+    monkeypatch.setattr(auto_assign, "SessionLocal", office.Session)
+    request_ids = _pending_requests(office)
+    first, second = auto_assign.AutoAssignWorker(), auto_assign.AutoAssignWorker()
+
+    first._recover()
+    second._recover()
+
+    assert first.recovered == len(request_ids)
+    assert second.recovered is None
@@ -0,0 +1,68 @@
+import threading
+from datetime import date
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import models  # noqa: F401  (registers every table)
+from app.database.database import Base
+from app.models.desk_assignments import DeskAssignment
+from app.models.desks import Desk
+from app.utils.desk_utils import find_available_desk_for_range
+from app.utils.ids import new_id
+
+
+def test_concurrent_bookings_never_share_a_desk(tmp_path):
+    # A file database with a connection per session, so the bookers
+    # really run in separate transactions
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'desks.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        poolclass=NullPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all(Desk(id=new_id(), desk_number=str(101 + i), floor=1) for i in range(3))
+        db.commit()
+
+    day = date(2026, 3, 2)
+    bookers = 8
+    start = threading.Barrier(bookers)
+    booked, errors = [], []
+
+    def book():
+        db = Session()
+        try:
+            candidates = db.query(Desk).all()
+            start.wait()
+            desk = find_available_desk_for_range(db, candidates, "MORNING", day, day, lock=True)
+            if desk is not None:
+                db.add(DeskAssignment(
+                    id=new_id(), desk_id=desk.id, employee_id=new_id(), assigned_by=new_id(),
+                    assigned_date=day, assignment_type="TEMPORARY",
+                    shift="MORNING", start_date=day, end_date=day,
+                ))
+                booked.append(desk.desk_number)
+            db.commit()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=book) for _ in range(bookers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    # Every desk booked exactly once, the other bookers found nothing
+    assert sorted(booked) == ["101", "102", "103"]
+    with Session() as db:
+        per_desk = db.execute(
+            select(func.count()).select_from(DeskAssignment).group_by(DeskAssignment.desk_id)
+        ).scalars().all()
+    assert per_desk == [1, 1, 1]
+    engine.dispose()
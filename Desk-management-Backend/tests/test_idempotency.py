@@ -0,0 +1,88 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app import models  # noqa: F401  (registers every table)
+from app.database.database import Base, engine
+from app.utils import idempotency
+from app.utils.idempotency import REPLAY_HEADER, run_idempotent
+
+
+@pytest.fixture(params=["memory", "db"])
+def store(request, monkeypatch):
+    if request.param == "db":
+        Base.metadata.create_all(bind=engine)
+        store = idempotency.DatabaseIdempotencyStore()
+    else:
+        store = idempotency.MemoryIdempotencyStore()
+    monkeypatch.setattr(idempotency, "store", store)
+    return store
+
+
+def _key():
+    return uuid.uuid4().hex
+
+
+def test_retry_replays_the_stored_response(store):
+    key, calls = _key(), []
+
+    def handler():
+        calls.append(1)
+        return {"id": len(calls)}
+
+    assert run_idempotent(key, "test", "u1", {"a": 1}, handler, 201) == {"id": 1}
+    replay = run_idempotent(key, "test", "u1", {"a": 1}, handler, 201)
+
+    assert calls == [1]
+    assert replay.status_code == 201
+    assert replay.body == b'{"id":1}'
+    assert replay.headers[REPLAY_HEADER] == "true"
+    # Keys are per user
+    assert run_idempotent(key, "test", "u2", {"a": 1}, handler) == {"id": 2}
+
+
+def test_key_reused_for_another_body_is_rejected(store):
+    key = _key()
+    run_idempotent(key, "test", "u1", {"a": 1}, lambda: {})
+
+    with pytest.raises(HTTPException) as exc:
+        run_idempotent(key, "test", "u1", {"a": 2}, lambda: {})
+    assert exc.value.status_code == 422
+
+
+def test_retry_while_running_conflicts_until_the_lock_expires(store, monkeypatch):
+    key = _key()
+    retries = []
+
+    def slow_handler():
+        # The retry arrives while the first call is still running
+        with pytest.raises(HTTPException) as exc:
+            run_idempotent(key, "test", "u1", {"a": 1}, lambda: {"retried": True})
+        retries.append(exc.value.status_code)
+        return {"first": True}
+
+    assert run_idempotent(key, "test", "u1", {"a": 1}, slow_handler) == {"first": True}
+    assert retries == [409]
+
+    # A reservation whose worker died is taken over once its lock ran out
+    dead = _key()
+    monkeypatch.setattr(idempotency, "IDEMPOTENCY_LOCK", timedelta(0))
+    key_hash = idempotency._sha256(f"test:u1:{dead}")
+    request_hash = idempotency._sha256('{"a": 1}')
+    assert store.reserve(key_hash, request_hash) is None
+
+    assert run_idempotent(dead, "test", "u1", {"a": 1}, lambda: {"retried": True}) == {"retried": True}
+
+
+def test_failed_call_releases_the_key(store):
+    key = _key()
+
+    def failing():
+        raise HTTPException(status_code=400, detail="Desk is not available")
+
+    with pytest.raises(HTTPException):
+        run_idempotent(key, "test", "u1", {"a": 1}, failing)
+
+    assert run_idempotent(key, "test", "u1", {"a": 1}, lambda: {"ok": True}) == {"ok": True}
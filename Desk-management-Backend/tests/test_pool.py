@@ -0,0 +1,8 @@
+from app.database.database import pool_settings
+
+
+def test_connection_budget_is_split_across_workers():
+    # 4 workers share 100 connections: 25 each, half kept open
+    assert pool_settings(workers=4, max_connections=100) == {"pool_size": 12, "max_overflow": 13}
+    # Never below one connection per worker
+    assert pool_settings(workers=8, max_connections=4) == {"pool_size": 1, "max_overflow": 0}
@@ -0,0 +1,66 @@
+import ipaddress
+
+import pytest
+from starlette.requests import Request
+
+from app.utils.rate_limit import TokenBucketLimiter, client_ip
+
+
+def test_bucket_allows_burst_then_rejects():
+    limiter = TokenBucketLimiter(per_minute=60, burst=3)
+
+    assert [limiter.acquire("1.2.3.4") for _ in range(3)] == [0, 0, 0]
+    retry_after = limiter.acquire("1.2.3.4")
+    assert 0 < retry_after <= 1
+
+    # Other keys have their own bucket
+    assert limiter.acquire("5.6.7.8") == 0
+
+    stats = limiter.stats()
+    assert stats["allowed"] == 4
+    assert stats["rejected"] == 1
+
+
+def test_bucket_memory_is_bounded_by_lru_eviction():
+    limiter = TokenBucketLimiter(per_minute=60, burst=1, max_keys=2)
+
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("a")  # touch "a" so "b" is least recently used
+    limiter.acquire("c")
+
+    stats = limiter.stats()
+    assert stats["tracked_keys"] == 2
+    assert stats["evicted"] == 1
+    # "a" kept its (empty) bucket, "b" was evicted and starts fresh
+    assert limiter.acquire("a") > 0
+    assert limiter.acquire("b") == 0
+
+
+def test_zero_rate_is_rejected_up_front():
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(per_minute=0)
+
+
+def _request(peer, **headers):
+    return Request({
+        "type": "http",
+        "client": (peer, 40000),
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_forwarded_headers_count_only_from_trusted_proxies():
+    proxies = [ipaddress.ip_network("10.0.0.0/24")]
+
+    # A client cannot pick its own address
+    assert client_ip(_request("203.0.113.9", x_forwarded_for="1.1.1.1"), proxies) == "203.0.113.9"
+    assert client_ip(_request("203.0.113.9", x_real_ip="1.1.1.1"), proxies) == "203.0.113.9"
+
+    # Behind the proxy the client is the last hop it did not add itself
+    assert client_ip(_request("10.0.0.5", x_real_ip="198.51.100.7"), proxies) == "198.51.100.7"
+    forwarded = _request("10.0.0.5", x_forwarded_for="1.1.1.1, 198.51.100.7, 10.0.0.4")
+    assert client_ip(forwarded, proxies) == "198.51.100.7"
+
+    # Nothing trusted by default
+    assert client_ip(_request("10.0.0.5", x_real_ip="198.51.100.7"), []) == "10.0.0.5"
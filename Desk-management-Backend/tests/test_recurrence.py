@@ -0,0 +1,35 @@
+from datetime import date
+
+from app.utils.recurrence import (
+    ALL_DAYS,
+    bookings_overlap,
+    first_shared_date,
+    iter_booked_dates,
+    parse_weekdays,
+    window_mask,
+)
+
+TUE_THU = parse_weekdays(["TUE", "THU"])
+MON_WED = parse_weekdays(["MON", "WED"])
+
+
+def test_window_mask_wraps_around_the_week():
+    # 2026-01-10 is a Saturday: Sat, Sun, Mon
+    assert window_mask(date(2026, 1, 10), date(2026, 1, 12)) == 0b1100001
+    assert window_mask(date(2026, 1, 5), date(2026, 1, 11)) == ALL_DAYS
+    assert parse_weekdays(["mon", "tue", "wed", "thu", "fri", "sat", "sun"]) is None
+
+
+def test_recurring_bookings_only_clash_on_shared_weekdays():
+    quarter = (date(2026, 1, 5), date(2026, 3, 31))
+
+    assert not bookings_overlap(*quarter, TUE_THU, *quarter, MON_WED)
+    assert bookings_overlap(*quarter, TUE_THU, date(2026, 2, 5), date(2026, 2, 5), None)
+    # A one-day booking on a Friday misses Tue/Thu
+    assert not bookings_overlap(*quarter, TUE_THU, date(2026, 2, 6), date(2026, 2, 6), None)
+    assert first_shared_date(*quarter, TUE_THU, date(2026, 2, 1), date(2026, 2, 28), None) == date(2026, 2, 3)
+
+
+def test_booked_dates_expand_lazily():
+    days = list(iter_booked_dates(date(2026, 1, 5), date(2026, 1, 18), TUE_THU))
+    assert days == [date(2026, 1, 6), date(2026, 1, 8), date(2026, 1, 13), date(2026, 1, 15)]
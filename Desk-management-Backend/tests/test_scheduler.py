@@ -0,0 +1,116 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import models  # noqa: F401  (registers every table)
+from app.database.database import Base
+from app.models.desk_assignments import DeskAssignment
+from app.models.desk_status_history import DeskStatusHistory
+from app.models.desks import Desk
+from app.utils.ids import new_id
+from app.utils.leases import acquire_lease, release_lease
+from app.utils.scheduler import release_expired_assignments, restore_finished_maintenance
+
+TODAY = date(2026, 3, 10)
+ADMIN = new_id()
+
+
+@pytest.fixture
+def Session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", poolclass=NullPool)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _desk(db, number, status="ASSIGNED") -> str:
+    desk = Desk(id=new_id(), desk_number=number, floor=1, current_status=status)
+    db.add(desk)
+    return desk.id
+
+
+def _booking(db, desk_id, end, assignment_type="TEMPORARY", start=None) -> str:
+    assignment = DeskAssignment(
+        id=new_id(), desk_id=desk_id, employee_id=new_id(), assigned_by=ADMIN,
+        assigned_date=start or end, assignment_type=assignment_type,
+        shift="MORNING", start_date=start or end, end_date=end,
+    )
+    db.add(assignment)
+    return assignment.id
+
+
+def test_expired_temporary_bookings_are_released_and_permanent_ones_kept(Session):
+    yesterday = TODAY - timedelta(days=1)
+    with Session() as db:
+        freed = _desk(db, "101")
+        still_booked = _desk(db, "102")
+        permanent = _desk(db, "103")
+        expired = [_booking(db, freed, yesterday), _booking(db, still_booked, yesterday)]
+        _booking(db, still_booked, TODAY)
+        # Made through the assign form: end_date defaults to the day it was made
+        seat = _booking(db, permanent, TODAY - timedelta(days=30), "PERMANENT")
+        _booking(db, permanent, yesterday)
+        db.commit()
+
+        counts = release_expired_assignments(db, TODAY, chunk_size=1)
+
+        assert counts == {"released": 3, "desks_available": 1}
+        assert all(db.get(DeskAssignment, a).released_date == yesterday for a in expired)
+        assert db.get(DeskAssignment, seat).released_date is None
+        assert [db.get(Desk, d).current_status for d in (freed, still_booked, permanent)] == [
+            "AVAILABLE", "ASSIGNED", "ASSIGNED",
+        ]
+        history = db.query(DeskStatusHistory).one()
+        assert (history.desk_id, history.new_status, history.reason) == (freed, "AVAILABLE", "Booking ended")
+
+        # Nothing left to do on the next run
+        assert release_expired_assignments(db, TODAY) == {"released": 0, "desks_available": 0}
+
+
+def test_finished_maintenance_returns_desks_to_service(Session):
+    with Session() as db:
+        booked = _desk(db, "101", "MAINTENANCE")
+        permanent = _desk(db, "102", "MAINTENANCE")
+        free = _desk(db, "103", "MAINTENANCE")
+        not_done = _desk(db, "104", "MAINTENANCE")
+        _booking(db, booked, TODAY + timedelta(days=2), start=TODAY)
+        _booking(db, permanent, TODAY - timedelta(days=30), "PERMANENT")
+        for desk_id, resolution in [
+            (booked, TODAY - timedelta(days=1)),
+            (permanent, TODAY - timedelta(days=1)),
+            (free, TODAY - timedelta(days=1)),
+            (not_done, TODAY + timedelta(days=1)),
+        ]:
+            db.add(DeskStatusHistory(
+                id=new_id(), desk_id=desk_id, old_status="AVAILABLE", new_status="MAINTENANCE",
+                changed_by=ADMIN, reason="Broken chair", expected_resolution_date=resolution,
+                changed_at=datetime(2026, 3, 1),
+            ))
+        db.commit()
+
+        result = restore_finished_maintenance(db, TODAY)
+
+        assert result == {"restored": 3, "available_desk_ids": [free]}
+        assert [db.get(Desk, d).current_status for d in (booked, permanent, free, not_done)] == [
+            "ASSIGNED", "ASSIGNED", "AVAILABLE", "MAINTENANCE",
+        ]
+
+
+def test_lease_has_one_holder_until_it_expires(Session):
+    with Session() as db:
+        assert acquire_lease(db, "jobs", "a", 60)
+        assert not acquire_lease(db, "jobs", "b", 60)
+        # The holder renews
+        assert acquire_lease(db, "jobs", "a", 60)
+
+        # Lapsed (the holder stopped renewing): someone else takes over
+        assert acquire_lease(db, "jobs", "a", -1)
+        assert acquire_lease(db, "jobs", "b", 60)
+        assert not acquire_lease(db, "jobs", "a", 60)
+
+        # Released on shutdown: free straight away
+        release_lease(db, "jobs", "b")
+        assert acquire_lease(db, "jobs", "a", 60)
@@ -0,0 +1,10 @@
+from app.database.schema import VERSIONS_DIR, migration_heads
+
+
+def test_migrations_have_a_single_head():
+    heads = migration_heads()
+
+    assert len(heads) == 1
+    # The head is the newest migration file
+    newest = max(path.stem for path in VERSIONS_DIR.glob("0*.py"))
+    assert heads == {newest}
@@ -0,0 +1,17 @@
+from app.utils.waitlist import IndexedPriorityQueue
+
+
+def test_queue_pops_in_priority_order_after_updates_and_removals():
+    queue = IndexedPriorityQueue()
+    for key, priority in [("c", (3,)), ("a", (1,)), ("e", (5,)), ("b", (2,)), ("d", (4,))]:
+        queue.push(key, priority)
+
+    # Re-prioritize and remove from the middle of the heap
+    queue.push("e", (0,))
+    assert queue.remove("b")
+    assert not queue.remove("b")
+
+    assert "b" not in queue
+    assert queue.ordered(["d", "a", "x"]) == ["a", "d"]
+    assert [queue.pop() for _ in range(len(queue))] == ["e", "a", "c", "d"]
+    assert queue.pop() is None